@@ -0,0 +1,313 @@
+"""Compare the accuracy and cost of step sizes and integrators against reference trajectories.
+
+Usage: python benchmarks/accuracy_report.py [--step-sizes MS [MS ...]] [--engine NAME [NAME ...]]
+    [--vehicle NAME [NAME ...]] [--repeat N] [--metric CHANNEL] [--statistic {max,rms}]
+    [--output report.json]
+
+Every combination of base step size, engine integrator and vehicle integrator simulates the
+throttle trace of tests/autotrans/test_data.h5, interpolated linearly onto its own step grid. Its
+outputs are compared at the times shared with the 40 ms reference grid against two references:
+
+- trace: the Simulink outputs stored next to the throttle trace
+- converged: the model itself at the finest common step size with a tight adaptive engine
+  integrator and an RK4 vehicle, which isolates the error caused by the discretization
+
+For each reference the script prints the max and RMS error of every output channel, the share of
+mismatched gears, the wall time (best of N runs) and the right-hand side evaluations per simulated
+second, followed by the combinations on the Pareto front of wall time against the error of the
+chosen channel. Combinations that overflow are reported as diverged.
+"""
+
+import argparse
+import json
+import math
+import os.path as path
+import time
+from dataclasses import asdict, dataclass, replace
+from functools import partial
+
+import h5py
+import numpy as np
+
+from autotrans.autotrans import (
+    Autotrans,
+    AutotransParameters,
+    DEFAULT_PARAMETERS,
+    Trajectory,
+    simulate,
+)
+from autotrans.integration import (
+    AdaptiveDp5Integrator,
+    BogackiShampineIntegrator,
+    Dp5Integrator,
+    EulerIntegrator,
+    IntegratorFactory,
+    Rk4Integrator,
+    ZeroOrderHoldIntegrator,
+)
+from autotrans.signals import PiecewiseLinear
+
+TEST_DATA = path.join(path.dirname(__file__), "..", "tests", "autotrans", "test_data.h5")
+REFERENCE_STEP_MS = 40
+# The reference waits two steps of 40 ms before shifting, which is kept in time at other step sizes
+REFERENCE_WAIT_MS = 80
+ENGINE_INTEGRATORS: dict[str, IntegratorFactory] = {
+    "euler": EulerIntegrator,
+    "bogacki-shampine": BogackiShampineIntegrator,
+    "rk4": Rk4Integrator,
+    "dp5": Dp5Integrator,
+    "adaptive-dp5": AdaptiveDp5Integrator,
+}
+VEHICLE_INTEGRATORS: dict[str, IntegratorFactory] = {
+    "zoh": ZeroOrderHoldIntegrator,
+    "euler": EulerIntegrator,
+    "rk4": Rk4Integrator,
+}
+CONVERGED_ENGINE_INTEGRATOR = partial(AdaptiveDp5Integrator, rtol=1e-10, atol=1e-10)
+CONVERGED_VEHICLE_INTEGRATOR = Rk4Integrator
+CHANNELS = ("engine_rpm", "vehicle_speed", "transmission_rpm", "impeller_torque", "output_torque")
+
+
+@dataclass(frozen=True)
+class Reference:
+    """Outputs to compare against at increasing times of the 40 ms grid."""
+
+    time_ms: np.ndarray
+    outputs: dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class Errors:
+    max_error: dict[str, float]
+    rms_error: dict[str, float]
+    gear_mismatch: float
+
+    def of(self, metric: str, statistic: str) -> float:
+        return (self.max_error if statistic == "max" else self.rms_error)[metric]
+
+
+@dataclass(frozen=True)
+class Result:
+    step_size_ms: int
+    engine: str
+    vehicle: str
+    seconds: float = math.nan
+    rhs_evaluations: dict[str, float] = None
+    errors: dict[str, Errors] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.step_size_ms} ms / {self.engine} / {self.vehicle}"
+
+    @property
+    def diverged(self) -> bool:
+        return self.errors is None
+
+
+def load_trace() -> tuple[Reference, PiecewiseLinear]:
+    """The Simulink outputs and the throttle signal, which ends one reference step after the last sample."""
+
+    with h5py.File(TEST_DATA) as test_data:
+        time_ms = np.rint(np.asarray(test_data["time"]) * 1000).astype(np.int64)
+        throttle = PiecewiseLinear(
+            time_ms.tolist(), np.asarray(test_data["throttle"]).tolist(), end_ms=int(time_ms[-1]) + REFERENCE_STEP_MS
+        )
+        outputs = {name: np.asarray(test_data[name]) for name in (*CHANNELS, "gear")}
+
+    return Reference(time_ms, outputs), throttle
+
+
+def parameters_for(step_size_ms: int) -> AutotransParameters:
+    wait_ticks = max(-(-REFERENCE_WAIT_MS // step_size_ms), 1)
+
+    return replace(
+        DEFAULT_PARAMETERS,
+        step_size_ms=step_size_ms,
+        shift_logic=replace(DEFAULT_PARAMETERS.shift_logic, wait_ticks=wait_ticks),
+    )
+
+
+def run_model(model: Autotrans, throttle: PiecewiseLinear) -> Trajectory:
+    steps = math.ceil(throttle.duration_ms / model.parameters.step_size_ms)
+
+    return simulate(throttle, [0.0] * steps, model, columnar=True)
+
+
+def converged_reference(trace: Reference, throttle: PiecewiseLinear, step_size_ms: int) -> Reference:
+    model = Autotrans(parameters_for(step_size_ms), CONVERGED_VEHICLE_INTEGRATOR, CONVERGED_ENGINE_INTEGRATOR)
+    trajectory = run_model(model, throttle)
+    time_ms, _, index = np.intersect1d(trace.time_ms, trajectory.time_ms, return_indices=True)
+
+    return Reference(time_ms, {name: getattr(trajectory, name)[index] for name in (*CHANNELS, "gear")})
+
+
+def compare(reference: Reference, trajectory: Trajectory) -> Errors:
+    _, reference_index, index = np.intersect1d(reference.time_ms, trajectory.time_ms, return_indices=True)
+    max_error = {}
+    rms_error = {}
+
+    for name in CHANNELS:
+        error = getattr(trajectory, name)[index] - reference.outputs[name][reference_index]
+        max_error[name] = float(np.max(np.abs(error)))
+        rms_error[name] = float(np.sqrt(np.mean(error ** 2)))
+
+    gear_mismatch = float(np.mean(trajectory.gear[index] != reference.outputs["gear"][reference_index]))
+
+    return Errors(max_error, rms_error, gear_mismatch)
+
+
+def run(
+    references: dict[str, Reference],
+    throttle: PiecewiseLinear,
+    step_size_ms: int,
+    engine: str,
+    vehicle: str,
+    repeat: int,
+) -> Result:
+    def model() -> Autotrans:
+        return Autotrans(parameters_for(step_size_ms), VEHICLE_INTEGRATORS[vehicle], ENGINE_INTEGRATORS[engine])
+
+    seconds = math.inf
+
+    for _ in range(repeat):
+        instance = model()
+        start = time.perf_counter()
+
+        try:
+            trajectory = run_model(instance, throttle)
+        except (OverflowError, RuntimeError):
+            return Result(step_size_ms, engine, vehicle)
+
+        seconds = min(seconds, time.perf_counter() - start)
+
+    # The counters slow the simulation down, so they are collected by a separate run
+    instance = model()
+    stats = instance.enable_instrumentation()
+    run_model(instance, throttle)
+    simulated_seconds = stats.steps * step_size_ms / 1000
+
+    return Result(
+        step_size_ms=step_size_ms,
+        engine=engine,
+        vehicle=vehicle,
+        seconds=seconds,
+        rhs_evaluations={name: count / simulated_seconds for name, count in stats.rhs_evaluations.items()},
+        errors={name: compare(reference, trajectory) for name, reference in references.items()},
+    )
+
+
+def pareto_front(results: list[Result], reference: str, metric: str, statistic: str) -> list[Result]:
+    """The results that no other result beats on both wall time and error, ordered by wall time.
+
+    Diverged results and results whose error is not finite are never on the front.
+    """
+
+    def error(result: Result) -> float:
+        return result.errors[reference].of(metric, statistic)
+
+    converged = [result for result in results if not result.diverged and math.isfinite(error(result))]
+    front: list[Result] = []
+
+    for result in sorted(converged, key=lambda result: (result.seconds, error(result))):
+        if not front or error(result) < error(front[-1]):
+            front.append(result)
+
+    return front
+
+
+def print_table(results: list[Result], reference: str, front: list[Result]):
+    cells = ["configuration".ljust(36), "pareto", "time (ms)", "engine rhs/s", "vehicle rhs/s"]
+    cells += [f"{name} max / rms" for name in CHANNELS] + ["gear mismatch"]
+    print("| " + " | ".join(cells) + " |")
+    print("|" + "|".join("-" * (len(cell) + 2) for cell in cells) + "|")
+
+    for result in results:
+        if result.diverged:
+            print(f"| {result.name:<36} | {'':6} | diverged |")
+            continue
+
+        errors = result.errors[reference]
+        error_cells = " | ".join(
+            f"{errors.max_error[name]:>9.3g} / {errors.rms_error[name]:<9.3g}".center(len(f"{name} max / rms"))
+            for name in CHANNELS
+        )
+        print(
+            f"| {result.name:<36} | {'*' if result in front else '':^6} | {result.seconds * 1e3:9.1f} "
+            f"| {result.rhs_evaluations['engine']:12.0f} | {result.rhs_evaluations['vehicle']:13.0f} "
+            f"| {error_cells} | {errors.gear_mismatch:13.2%} |"
+        )
+
+
+def print_front(front: list[Result], reference: str, metric: str, statistic: str):
+    label = f"{statistic} {metric} error"
+    print(f"| {'configuration':<36} | time (ms) | {label} |")
+    print(f"|{'-' * 38}|-----------|{'-' * (len(label) + 2)}|")
+
+    for result in front:
+        print(f"| {result.name:<36} | {result.seconds * 1e3:9.1f} | {result.errors[reference].of(metric, statistic):{len(label)}.4g} |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--step-sizes", type=int, nargs="+", default=[10, 20, 40, 80, 120], help="base step sizes in ms")
+    parser.add_argument("--engine", nargs="+", choices=ENGINE_INTEGRATORS, default=list(ENGINE_INTEGRATORS))
+    parser.add_argument("--vehicle", nargs="+", choices=VEHICLE_INTEGRATORS, default=list(VEHICLE_INTEGRATORS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per combination, the fastest is reported")
+    parser.add_argument("--metric", choices=CHANNELS, default="engine_rpm", help="channel of the Pareto fronts")
+    parser.add_argument("--statistic", choices=("max", "rms"), default="max", help="error of the Pareto fronts")
+    parser.add_argument("--output", default=None, help="also save the results as JSON")
+    args = parser.parse_args()
+
+    trace, throttle = load_trace()
+    # The finest common step size contains the times compared for every step size
+    converged_step_ms = math.gcd(*args.step_sizes, 5)
+    references = {"trace": trace, "converged": converged_reference(trace, throttle, converged_step_ms)}
+    results = [
+        run(references, throttle, step_size_ms, engine, vehicle, args.repeat)
+        for step_size_ms in args.step_sizes
+        for engine in args.engine
+        for vehicle in args.vehicle
+    ]
+    fronts = {name: pareto_front(results, name, args.metric, args.statistic) for name in references}
+
+    for name, front in fronts.items():
+        title = "Simulink trace" if name == "trace" else f"converged model ({converged_step_ms} ms)"
+        print(f"Errors against the {title}:")
+        print()
+        print_table(results, name, front)
+        print()
+        print(f"Pareto front of wall time against the {args.statistic} {args.metric} error:")
+        print()
+        print_front(front, name, args.metric, args.statistic)
+        print()
+
+    if args.output is not None:
+        with open(args.output, "w") as output:
+            json.dump(
+                {
+                    "metric": args.metric,
+                    "statistic": args.statistic,
+                    "converged_step_size_ms": converged_step_ms,
+                    "results": [
+                        {
+                            "step_size_ms": result.step_size_ms,
+                            "engine": result.engine,
+                            "vehicle": result.vehicle,
+                            "diverged": result.diverged,
+                            "seconds": result.seconds,
+                            "rhs_evaluations_per_second": result.rhs_evaluations,
+                            "errors": None if result.diverged else {
+                                name: asdict(errors) for name, errors in result.errors.items()
+                            },
+                            "pareto": [name for name, front in fronts.items() if result in front],
+                        }
+                        for result in results
+                    ],
+                },
+                output,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
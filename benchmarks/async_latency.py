@@ -0,0 +1,92 @@
+"""Measure the event loop latency while many simulations run through simulate_async.
+
+Usage: python benchmarks/async_latency.py [--simulations N] [--steps STEPS] [--chunk-size TICKS]
+    [--concurrency LIMIT] [--executor {thread,process}]
+
+A ticker coroutine sleeps for 1 ms in a loop and records how late it wakes up while the
+simulations are in flight. The script reports the percentiles of that lag next to the lag of the
+same simulations run with the blocking simulate inside the event loop.
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+
+from autotrans.aio import simulate_async
+from autotrans.autotrans import (
+    Autotrans,
+    DEFAULT_PARAMETERS,
+    simulate,
+)
+
+
+async def measure(workload: Callable[[], Awaitable[object]]) -> tuple[float, list[float]]:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    ticks = asyncio.create_task(ticker())
+    # Let the ticker start sleeping, otherwise a blocking workload finishes before it records anything
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await workload()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticks
+
+    return elapsed, lags
+
+
+def report(name: str, elapsed: float, lags: list[float]):
+    p50, p99, worst = (np.percentile(lags, q) * 1000 for q in (50, 99, 100))
+    print(f"{name:<10} {elapsed:8.2f} s  lag p50 {p50:8.2f} ms  p99 {p99:8.2f} ms  max {worst:8.2f} ms")
+
+
+async def run(args: argparse.Namespace, executor: Optional[Executor]):
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(30, 100, size=(args.simulations, args.steps)).tolist()
+    brake = np.zeros(args.steps).tolist()
+
+    async def blocking():
+        for scenario in throttle:
+            simulate(scenario, brake, Autotrans(DEFAULT_PARAMETERS))
+
+    async def concurrent():
+        semaphore = asyncio.Semaphore(args.concurrency)
+        await asyncio.gather(*(
+            simulate_async(
+                scenario, brake, Autotrans(DEFAULT_PARAMETERS), executor, args.chunk_size, semaphore=semaphore
+            )
+            for scenario in throttle
+        ))
+
+    report("blocking", *await measure(blocking))
+    report("async", *await measure(concurrent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--simulations", type=int, default=300)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    executor_type = ThreadPoolExecutor if args.executor == "thread" else ProcessPoolExecutor
+
+    with executor_type() as executor:
+        asyncio.run(run(args, executor))
+
+
+if __name__ == "__main__":
+    main()
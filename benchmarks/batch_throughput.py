@@ -0,0 +1,45 @@
+"""Measure the throughput of simulate_batch as the number of scenarios grows.
+
+Usage: python benchmarks/batch_throughput.py [--steps STEPS] [--sizes N [N ...]]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from autotrans.autotrans import (
+    Autotrans,
+    DEFAULT_PARAMETERS,
+    simulate,
+)
+from autotrans.batch import simulate_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=250)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(0, 100, size=(1, args.steps))
+    brake = np.zeros((1, args.steps))
+
+    start = time.perf_counter()
+    simulate(list(throttle[0]), list(brake[0]), Autotrans(DEFAULT_PARAMETERS))
+    scalar_elapsed = time.perf_counter() - start
+    print(f"{'scalar':>8}  {scalar_elapsed:10.4f} s  {args.steps / scalar_elapsed:14.0f} steps/s")
+
+    for n in args.sizes:
+        throttle = rng.uniform(0, 100, size=(n, args.steps))
+        brake = np.zeros((n, args.steps))
+
+        start = time.perf_counter()
+        simulate_batch(throttle, brake, DEFAULT_PARAMETERS)
+        elapsed = time.perf_counter() - start
+        print(f"{n:>8}  {elapsed:10.4f} s  {n * args.steps / elapsed:14.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
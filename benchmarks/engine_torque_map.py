@@ -0,0 +1,54 @@
+"""Compare the per-call cost of the prebuilt engine torque map with a per-call spline.
+
+Usage: python benchmarks/engine_torque_map.py [--number NUMBER]
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import scipy.interpolate as interpolate
+
+from autotrans.engine import (
+    ENGINE_TORQUE_MAP,
+    ENGINE_TORQUE_TABLE_VALUES,
+    RPM_BREAKPOINTS,
+    THROTTLE_BREAKPOINTS,
+)
+
+
+def spline_per_call(throttle: float, rpm: float) -> float:
+    interpolator = interpolate.RectBivariateSpline(
+        THROTTLE_BREAKPOINTS,
+        RPM_BREAKPOINTS,
+        ENGINE_TORQUE_TABLE_VALUES,
+        kx=1,
+        ky=1
+    )
+    return interpolator(throttle, rpm).item()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(0, 100, size=10000)
+    rpm = rng.uniform(800, 4800, size=10000)
+
+    spline = min(timeit.repeat(lambda: spline_per_call(55.0, 2100.0), number=args.number, repeat=3))
+    scalar = min(timeit.repeat(lambda: ENGINE_TORQUE_MAP(55.0, 2100.0), number=args.number, repeat=3))
+    vector = min(timeit.repeat(lambda: ENGINE_TORQUE_MAP(throttle, rpm), number=100, repeat=3))
+
+    spline_us = spline / args.number * 1e6
+    scalar_us = scalar / args.number * 1e6
+    vector_us = vector / 100 / throttle.size * 1e6
+
+    print(f"per-call spline:    {spline_us:8.3f} us/lookup")
+    print(f"torque map scalar:  {scalar_us:8.3f} us/lookup  ({spline_us / scalar_us:6.1f}x)")
+    print(f"torque map array:   {vector_us:8.3f} us/lookup  ({spline_us / vector_us:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure the cold-start cost of the package in fresh interpreter processes.
+
+Usage: python benchmarks/import_time.py [--repeat N] [--max-import-ms MS] [--max-first-simulate-ms MS]
+
+Every measurement starts a new interpreter, and the programs are run in turns so that a change in
+the load of the machine affects all of them alike. NumPy is a hard dependency and its import time
+varies with the installation and the machine, so the reported times are the cost of
+`import autotrans` and of the import plus the first call to `simulate` above a program that only
+imports NumPy. The script exits with a non-zero status if a median exceeds its target.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+PROGRAMS = {
+    "interpreter": "pass",
+    "import numpy": "import numpy",
+    "import autotrans": "import autotrans",
+    "first simulate": """
+import autotrans
+from autotrans.autotrans import Autotrans, DEFAULT_PARAMETERS
+
+autotrans.simulate([50.0] * 100, [0.0] * 100, Autotrans(DEFAULT_PARAMETERS))
+""",
+}
+
+
+def measure(programs: dict[str, str], repeat: int) -> dict[str, list[float]]:
+    timings = {name: [] for name in programs}
+
+    for _ in range(repeat):
+        for name, program in programs.items():
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", program], check=True)
+            timings[name].append(time.perf_counter() - start)
+
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    # The package adds about 55 ms and the first simulation about 60 ms to the NumPy import, the
+    # targets leave room for the noise between runs
+    parser.add_argument("--max-import-ms", type=float, default=120.0)
+    parser.add_argument("--max-first-simulate-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    medians = {name: statistics.median(timings) for name, timings in measure(PROGRAMS, args.repeat).items()}
+    startup = medians.pop("interpreter")
+    numpy = medians.pop("import numpy")
+    targets = {"import autotrans": args.max_import_ms, "first simulate": args.max_first_simulate_ms}
+    failures = 0
+
+    print(f"{'interpreter start-up':>20}: {startup * 1e3:8.1f} ms")
+    print(f"{'import numpy':>20}: {(numpy - startup) * 1e3:8.1f} ms")
+
+    for name, median in medians.items():
+        elapsed_ms = (median - numpy) * 1e3
+        status = "ok" if elapsed_ms <= targets[name] else "OVER TARGET"
+        failures += status != "ok"
+        print(f"{name:>20}: {elapsed_ms:8.1f} ms  above NumPy (target {targets[name]:.0f} ms, {status})")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Generate concurrent simulation requests against the autotrans server on localhost.
+
+Usage: python benchmarks/load_generator.py [--url URL] [--clients N] [--duration SECONDS]
+    [--steps STEPS] [--binary] [--workers N] [--window-ms MS]
+
+Without --url the script starts `python -m autotrans.serve` on a free port with the given workers
+and batching window, and stops it afterwards. Every client thread sends requests back to back and
+the script reports the achieved throughput, the client-side latency percentiles and the /stats
+endpoint of the server.
+"""
+
+import argparse
+import io
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from dataclasses import asdict
+
+import numpy as np
+
+from autotrans.autotrans import DEFAULT_PARAMETERS
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_healthy(url: str, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+
+    while True:
+        try:
+            with urllib.request.urlopen(f"{url}/health"):
+                return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+
+            time.sleep(0.1)
+
+
+def request_body(rng: np.random.Generator, steps: int, binary: bool) -> tuple[bytes, str]:
+    throttle = rng.uniform(30, 100, size=steps)
+    brake = np.zeros(steps)
+    parameters = asdict(DEFAULT_PARAMETERS)
+
+    if binary:
+        output = io.BytesIO()
+        np.savez(output, throttle=throttle, brake=brake, parameters=json.dumps(parameters))
+        return output.getvalue(), "application/x-npz"
+
+    body = {"throttle": throttle.tolist(), "brake": brake.tolist(), "parameters": parameters}
+    return json.dumps(body).encode(), "application/json"
+
+
+def client(url: str, seed: int, args: argparse.Namespace, deadline: float, latencies: list[float]):
+    rng = np.random.default_rng(seed)
+
+    while time.perf_counter() < deadline:
+        body, content_type = request_body(rng, args.steps, args.binary)
+        request = urllib.request.Request(f"{url}/simulate", data=body, headers={"Content-Type": content_type})
+        start = time.perf_counter()
+
+        with urllib.request.urlopen(request) as response:
+            response.read()
+
+        latencies.append(time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None, help="an already running server, such as http://127.0.0.1:8765")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--binary", action="store_true", help="send .npz payloads instead of JSON")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+
+    if url is None:
+        port = free_port()
+        command = [sys.executable, "-m", "autotrans.serve", "--port", str(port), "--window-ms", str(args.window_ms)]
+
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+        url = f"http://127.0.0.1:{port}"
+
+    try:
+        wait_until_healthy(url)
+        latencies: list[float] = []
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=client, args=(url, seed, args, deadline, latencies)) for seed in range(args.clients)
+        ]
+        start = time.perf_counter()
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - start
+        p50, p90, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 90, 99])
+        print(f"{len(latencies)} requests in {elapsed:.1f} s: {len(latencies) / elapsed:.1f} requests/s")
+        print(f"latency p50 {p50:.1f} ms  p90 {p90:.1f} ms  p99 {p99:.1f} ms")
+
+        with urllib.request.urlopen(f"{url}/stats") as response:
+            print(json.dumps(json.loads(response.read()), indent=2))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
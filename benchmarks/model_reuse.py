@@ -0,0 +1,62 @@
+"""Compare constructing a model for every short run with resetting and pooling models.
+
+Usage: python benchmarks/model_reuse.py [--runs RUNS] [--steps STEPS] [--repeat N]
+
+Every strategy simulates the same number of short runs, and the script reports the time spent
+creating or resetting models next to the total time of each strategy, best of N repetitions.
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from autotrans.autotrans import (
+    Autotrans,
+    DEFAULT_PARAMETERS,
+    simulate,
+)
+from autotrans.pool import ModelPool
+
+
+def measure(runs: int, steps: int, model: Callable[[], Autotrans], done: Callable[[Autotrans], None]) -> tuple[float, float]:
+    throttle = [60.0] * steps
+    brake = [0.0] * steps
+    setup = 0.0
+    start = time.perf_counter()
+
+    for _ in range(runs):
+        before = time.perf_counter()
+        instance = model()
+        setup += time.perf_counter() - before
+        simulate(throttle, brake, instance, columnar=True)
+        done(instance)
+
+    return setup, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    shared = Autotrans(DEFAULT_PARAMETERS)
+    pool = ModelPool()
+    strategies = {
+        "construct": (lambda: Autotrans(DEFAULT_PARAMETERS), lambda model: None),
+        "reset": (lambda: (shared.reset(DEFAULT_PARAMETERS), shared)[1], lambda model: None),
+        "pool": (lambda: pool.acquire(DEFAULT_PARAMETERS), pool.release),
+    }
+
+    print(f"{args.runs} runs of {args.steps} steps")
+    print(f"{'strategy':>10} {'setup (ms)':>12} {'setup/run (us)':>15} {'total (ms)':>12}")
+
+    for name, (model, done) in strategies.items():
+        results = [measure(args.runs, args.steps, model, done) for _ in range(args.repeat)]
+        setup, total = min(result[0] for result in results), min(result[1] for result in results)
+        print(f"{name:>10} {setup * 1e3:12.2f} {setup / args.runs * 1e6:15.2f} {total * 1e3:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare the accuracy and cost of multi-rate configurations against the single-rate model.
+
+Usage: python benchmarks/multirate_accuracy.py [--steps STEPS] [--step-size MS] [--every EVERY]
+
+The first table compares every configuration with the single-rate model on a synthetic scenario.
+The second one simulates the throttle trace of tests/autotrans/test_data.h5 and compares the
+outputs at the 40 ms reference times with the Simulink outputs stored next to it, and with the
+single-rate model on the same trace.
+"""
+
+import argparse
+import math
+import os.path as path
+import time
+from dataclasses import replace
+
+import h5py
+import numpy as np
+
+from autotrans.autotrans import (
+    Autotrans,
+    DEFAULT_PARAMETERS,
+    RateParameters,
+    simulate,
+)
+from autotrans.signals import PiecewiseLinear
+
+TEST_DATA = path.join(path.dirname(__file__), "..", "tests", "autotrans", "test_data.h5")
+# The reference traces are sampled every 40 ms and wait two of those steps before shifting
+TRACE_STEP_MS = 40
+TRACE_WAIT_MS = 80
+TRACE_COLUMNS = ("engine_rpm", "vehicle_speed", "gear")
+
+PARAMETERS = replace(
+    DEFAULT_PARAMETERS, step_size_ms=10, shift_logic=replace(DEFAULT_PARAMETERS.shift_logic, wait_ticks=8)
+)
+CONFIGURATIONS = {
+    "single rate": RateParameters(),
+    "vehicle x2": RateParameters(vehicle=2),
+    "vehicle x4": RateParameters(vehicle=4),
+    "shift logic + vehicle x4": RateParameters(shift_logic=4, vehicle=4),
+    "shift logic + vehicle x10": RateParameters(shift_logic=10, vehicle=10),
+    "shift logic + transmission + vehicle x4": RateParameters(shift_logic=4, transmission=4, vehicle=4),
+    "all x2": RateParameters(engine=2, shift_logic=2, transmission=2, vehicle=2),
+    "all x4": RateParameters(engine=4, shift_logic=4, transmission=4, vehicle=4),
+}
+
+
+def scenario(steps: int) -> tuple[list[float], list[float]]:
+    """Accelerate and cruise with throttle steps held for several seconds and short brake pulses."""
+
+    rng = np.random.default_rng(0)
+    throttle = np.repeat(rng.uniform(30, 100, size=steps // 300 + 1), 300)[:steps]
+    brake = np.where(np.arange(steps) % 1500 < 100, 50.0, 0.0)
+
+    return throttle.tolist(), brake.tolist()
+
+
+def trace_outputs(step_size_ms: int) -> list[tuple[str, dict[str, np.ndarray]]]:
+    """Simulate every configuration on the reference throttle trace and return the outputs at the trace times."""
+
+    with h5py.File(TEST_DATA) as test_data:
+        time_ms = np.rint(np.asarray(test_data["time"]) * 1000).astype(np.int64)
+        throttle = PiecewiseLinear(
+            time_ms.tolist(), np.asarray(test_data["throttle"]).tolist(), end_ms=int(time_ms[-1]) + TRACE_STEP_MS
+        )
+
+    steps = math.ceil(throttle.duration_ms / step_size_ms)
+    shift_logic = replace(PARAMETERS.shift_logic, wait_ticks=-(-TRACE_WAIT_MS // step_size_ms))
+    rows = []
+
+    for name, rates in CONFIGURATIONS.items():
+        parameters = replace(PARAMETERS, step_size_ms=step_size_ms, shift_logic=shift_logic, rates=rates)
+        trajectory = simulate(throttle, [0.0] * steps, Autotrans(parameters), columnar=True)
+        _, _, index = np.intersect1d(time_ms, trajectory.time_ms, return_indices=True)
+        rows.append((name, {column: getattr(trajectory, column)[index] for column in TRACE_COLUMNS}))
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=10000)
+    parser.add_argument("--step-size", type=int, default=PARAMETERS.step_size_ms, help="base step size in ms")
+    parser.add_argument("--every", type=int, default=4, help="number of base steps between reported states")
+    args = parser.parse_args()
+
+    throttle, brake = scenario(args.steps)
+    rows = []
+
+    for name, rates in CONFIGURATIONS.items():
+        parameters = replace(PARAMETERS, step_size_ms=args.step_size, rates=rates)
+        start = time.perf_counter()
+        trajectory = simulate(throttle, brake, Autotrans(parameters), columnar=True, every=args.every)
+        rows.append((name, time.perf_counter() - start, trajectory))
+
+    _, reference_seconds, reference = rows[0]
+
+    print("Against the single-rate model on the synthetic scenario:")
+    print()
+    print(f"| {'configuration':<39} | speedup | max rpm error | max speed error (mph) | gear mismatch |")
+    print(f"|{'-' * 41}|---------|---------------|-----------------------|---------------|")
+
+    for name, seconds, trajectory in rows[1:]:
+        rpm_error = np.max(np.abs(trajectory.engine_rpm - reference.engine_rpm))
+        speed_error = np.max(np.abs(trajectory.vehicle_speed - reference.vehicle_speed))
+        gear_mismatch = np.mean(trajectory.gear != reference.gear)
+        print(
+            f"| {name:<39} | {reference_seconds / seconds:6.2f}x | {rpm_error:13.2f} | {speed_error:21.3f} "
+            f"| {gear_mismatch:13.2%} |"
+        )
+
+    with h5py.File(TEST_DATA) as test_data:
+        trace = {column: np.asarray(test_data[column]) for column in TRACE_COLUMNS}
+
+    trace_rows = trace_outputs(args.step_size)
+    _, single_rate = trace_rows[0]
+
+    print()
+    print(f"Against the {path.basename(TEST_DATA)} traces and the single-rate model on the same throttle trace:")
+    print()
+    print(
+        f"| {'configuration':<39} | max rpm error (trace) | max speed error (trace) | gear mismatch (trace) "
+        f"| max rpm error (single rate) |"
+    )
+    print(f"|{'-' * 41}|-----------------------|-------------------------|-----------------------|{'-' * 29}|")
+
+    for name, outputs in trace_rows:
+        print(
+            f"| {name:<39} | {np.max(np.abs(outputs['engine_rpm'] - trace['engine_rpm'])):21.2f} "
+            f"| {np.max(np.abs(outputs['vehicle_speed'] - trace['vehicle_speed'])):23.3f} "
+            f"| {np.mean(outputs['gear'] != trace['gear']):21.2%} "
+            f"| {np.max(np.abs(outputs['engine_rpm'] - single_rate['engine_rpm'])):27.2f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure the construction and per-step cost of the shift logic state machines.
+
+Usage: python benchmarks/shift_logic.py [--scenarios N]
+"""
+
+import argparse
+import os.path as path
+import timeit
+
+import h5py
+import numpy as np
+
+from autotrans.shift_logic import BatchShiftLogic, Gear, ShiftLogic
+
+TEST_DATA = path.join(path.dirname(__file__), "..", "tests", "autotrans", "test_data.h5")
+
+
+def run_scalar(throttle: list[float], vehicle_speed: list[float]):
+    model = ShiftLogic(wait_ticks=2, initial_gear=Gear.FIRST)
+
+    for throttle_value, speed_value in zip(throttle, vehicle_speed):
+        model.step(throttle_value, speed_value)
+
+
+def run_batch(throttle: np.ndarray, vehicle_speed: np.ndarray):
+    model = BatchShiftLogic(np.full(throttle.shape[0], 2), np.full(throttle.shape[0], Gear.FIRST))
+
+    for tick in range(throttle.shape[1]):
+        model.step(throttle[:, tick], vehicle_speed[:, tick])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=1000)
+    args = parser.parse_args()
+
+    with h5py.File(TEST_DATA) as test_data:
+        throttle = np.asarray(test_data["throttle"])
+        vehicle_speed = np.asarray(test_data["vehicle_speed"])
+
+    steps = throttle.size
+    construction = min(timeit.repeat(lambda: ShiftLogic(2, Gear.FIRST), number=1000, repeat=5)) / 1000
+    # The scalar model is fed Python floats, and the lists are built once so that only the steps are timed
+    scalar_throttle = throttle.tolist()
+    scalar_speed = vehicle_speed.tolist()
+    scalar = min(timeit.repeat(lambda: run_scalar(scalar_throttle, scalar_speed), number=5, repeat=3)) / 5
+    batch_throttle = np.tile(throttle, (args.scenarios, 1))
+    batch_speed = np.tile(vehicle_speed, (args.scenarios, 1))
+    batch = min(timeit.repeat(lambda: run_batch(batch_throttle, batch_speed), number=1, repeat=3))
+
+    print(f"construction:  {construction * 1e6:8.3f} us")
+    print(f"scalar step:   {scalar / steps * 1e6:8.3f} us/step")
+    print(f"batch step:    {batch / steps / args.scenarios * 1e6:8.3f} us/step/scenario (N={args.scenarios})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Measure how simulate_many scales from one worker process to all available CPUs.
+
+Usage: python benchmarks/simulate_many_scaling.py [--scenarios N] [--steps STEPS] [--workers W [W ...]]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from autotrans.autotrans import DEFAULT_PARAMETERS
+from autotrans.parallel import simulate_many
+
+
+def default_workers() -> list[int]:
+    cpus = os.cpu_count() or 1
+    counts = [2**exponent for exponent in range(cpus.bit_length()) if 2**exponent < cpus]
+
+    return counts + [cpus]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=750)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(0, 100, size=(args.scenarios, args.steps))
+    brake = np.zeros((args.scenarios, args.steps))
+    baseline = None
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        simulate_many(throttle, brake, DEFAULT_PARAMETERS, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>4} workers  {elapsed:9.3f} s  speedup {baseline / elapsed:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Benchmark suite for the autotrans components and end-to-end simulation.
+
+Usage:
+    python benchmarks/suite.py run [--output results.json] [--quick] [--filter SUBSTRING]
+    python benchmarks/suite.py compare BASELINE CURRENT [--threshold 0.10]
+
+The run command times every component in isolation, end-to-end simulate at several horizons, model
+construction and the peak memory of a simulation, and writes the results as JSON. The compare
+command reports the relative change of every benchmark shared by two result files and exits with a
+non-zero status if any of them slowed down by more than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+import numpy as np
+
+from autotrans.autotrans import (
+    Autotrans,
+    DEFAULT_PARAMETERS,
+    simulate,
+)
+from autotrans.engine import Engine, RPM_BREAKPOINTS, THROTTLE_BREAKPOINTS, ENGINE_TORQUE_TABLE_VALUES
+from autotrans.integration import Dp5Integrator
+from autotrans.modeling.lookup_table import LookupTable1D, LookupTable2D
+from autotrans.shift_logic import Gear, ShiftLogic
+from autotrans.transmission import K_FACTOR_VALUES, SPEED_RATIO, Transmission
+from autotrans.vehicle import Vehicle
+
+HORIZONS = (100, 1000, 10000)
+
+Benchmark = Callable[[], Callable[[], object]]
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    """Register a benchmark. The decorated function performs the setup and returns the timed callable."""
+
+    def register(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _inputs(steps: int) -> tuple[list[float], list[float]]:
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(0, 100, size=steps).tolist()
+    brake = np.where(rng.uniform(size=steps) > 0.9, 100.0, 0.0).tolist()
+
+    return throttle, brake
+
+
+@benchmark("engine.step")
+def engine_step():
+    model = Engine(40, DEFAULT_PARAMETERS.engine.engine_propeller_inertia, 1000.0, 0.0, 0.0)
+    return lambda: model.step(60.0, 150.0)
+
+
+@benchmark("engine.engine_impeller_inertia")
+def engine_impeller_inertia():
+    model = Engine(40, DEFAULT_PARAMETERS.engine.engine_propeller_inertia, 1000.0, 0.0, 0.0)
+    return lambda: model.engine_impeller_inertia(60.0, 150.0, 2100.0)
+
+
+@benchmark("transmission.step")
+def transmission_step():
+    model = Transmission()
+    return lambda: model.step(2100.0, Gear.SECOND, 900.0)
+
+
+@benchmark("shift_logic.step")
+def shift_logic_step():
+    model = ShiftLogic(2, Gear.SECOND)
+    return lambda: model.step(60.0, 40.0)
+
+
+@benchmark("vehicle.step")
+def vehicle_step():
+    model = Vehicle(40, 3.23, 40.0, 0.02, 1.0, 12.0941, 0.0)
+    return lambda: model.step(500.0, 0.0)
+
+
+@benchmark("lookup_table_1d.lookup")
+def lookup_table_1d():
+    table = LookupTable1D(SPEED_RATIO, K_FACTOR_VALUES)
+    return lambda: table.lookup(0.55)
+
+
+@benchmark("lookup_table_2d.lookup")
+def lookup_table_2d():
+    table = LookupTable2D(THROTTLE_BREAKPOINTS, RPM_BREAKPOINTS, ENGINE_TORQUE_TABLE_VALUES)
+    return lambda: table.lookup(55.0, 2100.0)
+
+
+@benchmark("dp5_integrator.integrate")
+def dp5_integrate():
+    integrator = Dp5Integrator(0.04)
+    return lambda: integrator.integrate(t0=0.0, y0=1000.0, func=lambda t, y: 0.5 * y + t)
+
+
+@benchmark("autotrans.construction")
+def construction():
+    return lambda: Autotrans(DEFAULT_PARAMETERS)
+
+
+def _simulate_benchmark(steps: int) -> Benchmark:
+    def setup():
+        throttle, brake = _inputs(steps)
+        return lambda: simulate(throttle, brake, Autotrans(DEFAULT_PARAMETERS))
+
+    return setup
+
+
+for _horizon in HORIZONS:
+    benchmark(f"simulate.{_horizon}")(_simulate_benchmark(_horizon))
+
+
+@benchmark("simulate.1000.instrumented")
+def simulate_instrumented():
+    throttle, brake = _inputs(1000)
+
+    def instrumented():
+        model = Autotrans(DEFAULT_PARAMETERS)
+        model.enable_instrumentation()
+        return simulate(throttle, brake, model)
+
+    return instrumented
+
+
+def time_benchmark(setup: Benchmark, quick: bool) -> dict[str, float]:
+    function = setup()
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    repeats = timer.repeat(repeat=3 if quick else 7, number=number)
+    per_call = [elapsed / number for elapsed in repeats]
+
+    return {"seconds": min(per_call), "median_seconds": float(np.median(per_call)), "number": number}
+
+
+def peak_memory(steps: int) -> int:
+    throttle, brake = _inputs(steps)
+    tracemalloc.start()
+
+    try:
+        simulate(throttle, brake, Autotrans(DEFAULT_PARAMETERS))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def run(args: argparse.Namespace):
+    results = {}
+
+    for name, setup in BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+
+        if args.quick and name == f"simulate.{HORIZONS[-1]}":
+            continue
+
+        start = time.perf_counter()
+        results[name] = time_benchmark(setup, args.quick)
+        print(f"{name:<36} {results[name]['seconds'] * 1e6:14.3f} us  ({time.perf_counter() - start:5.1f} s)")
+
+    memory = {}
+
+    for steps in HORIZONS[:-1] if args.quick else HORIZONS:
+        if args.filter and args.filter not in f"memory.simulate.{steps}":
+            continue
+
+        memory[f"memory.simulate.{steps}"] = peak_memory(steps)
+        print(f"{'memory.simulate.' + str(steps):<36} {memory['memory.simulate.' + str(steps)] / 1024:14.1f} KiB")
+
+    report = {
+        "metadata": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "timings": results,
+        "memory": memory,
+    }
+
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+
+    print(f"results written to {args.output}")
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        baseline = json.load(baseline_file)
+        current = json.load(current_file)
+
+    rows = []
+
+    for name, result in current["timings"].items():
+        if name in baseline["timings"]:
+            rows.append((name, baseline["timings"][name]["seconds"], result["seconds"]))
+
+    for name, peak in current["memory"].items():
+        if name in baseline["memory"]:
+            rows.append((name, baseline["memory"][name], peak))
+
+    regressions = 0
+
+    for name, before, after in rows:
+        change = after / before - 1
+        flag = ""
+
+        if change > args.threshold:
+            flag = "  SLOWER" if name in current["timings"] else "  LARGER"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "  faster" if name in current["timings"] else "  smaller"
+
+        print(f"{name:<36} {before:14.6g} -> {after:14.6g}  {change:+8.1%}{flag}")
+
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite for the autotrans model")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks and save the results as JSON")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--quick", action="store_true", help="fewer repeats and skip the longest horizon")
+    run_parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this text")
+
+    compare_parser = subparsers.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown to flag")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args)
+        return 0
+
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
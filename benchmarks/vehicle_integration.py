@@ -0,0 +1,56 @@
+"""Compare the per-step cost of the vehicle integration strategies.
+
+Usage: python benchmarks/vehicle_integration.py [--steps STEPS]
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from autotrans.integration import Dp5Integrator, IntegratorFactory, SolveIvpIntegrator, ZeroOrderHoldIntegrator
+from autotrans.vehicle import Vehicle
+
+STRATEGIES: dict[str, IntegratorFactory] = {
+    "closed form": ZeroOrderHoldIntegrator,
+    "dp5": Dp5Integrator,
+    "solve_ivp": SolveIvpIntegrator,
+}
+
+
+def run(integrator: IntegratorFactory, output_torque: list[float], brake: list[float]):
+    model = Vehicle(
+        t_step_ms=40,
+        final_drive_ratio=3.23,
+        wheel_friction=40,
+        co_drag=0.02,
+        wheel_radius=1,
+        inertia=12.0941,
+        initial_speed=0,
+        integrator=integrator,
+    )
+
+    for output_torque_value, brake_value in zip(output_torque, brake):
+        model.step(output_torque_value, brake_value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    output_torque = rng.uniform(0, 1000, size=args.steps).tolist()
+    brake = [0.0] * args.steps
+    results = {}
+
+    for name, integrator in STRATEGIES.items():
+        elapsed = min(timeit.repeat(lambda: run(integrator, output_torque, brake), number=1, repeat=3))
+        results[name] = elapsed / args.steps * 1e6
+
+    for name, per_step in results.items():
+        print(f"{name:>12}:  {per_step:9.3f} us/step  ({results['solve_ivp'] / per_step:6.1f}x vs solve_ivp)")
+
+
+if __name__ == "__main__":
+    main()
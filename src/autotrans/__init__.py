@@ -1,3 +1,36 @@
-from .autotrans import Autotrans, simulate
+from importlib import import_module
 
-__all__ = ["Autotrans", "simulate"]
+from .autotrans import Autotrans, Trajectory, simulate, simulate_chunks, simulate_iter
+
+__all__ = [
+    "Autotrans",
+    "BatchAutotrans",
+    "Trajectory",
+    "simulate",
+    "simulate_batch",
+    "simulate_chunks",
+    "simulate_iter",
+    "simulate_many",
+    "sweep",
+]
+
+# Modules that are only imported once one of their names is used: the vectorized model and the
+# sweeps are not needed by a single simulation, and the process pool and shared memory modules are
+# only needed by parallel simulation
+_LAZY_MODULES = {
+    "BatchAutotrans": ".batch",
+    "simulate_batch": ".batch",
+    "simulate_many": ".parallel",
+    "sweep": ".sweep",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_MODULES:
+        value = getattr(import_module(_LAZY_MODULES[name], __name__), name)
+        # Importing autotrans.sweep binds the submodule to the name of its function, which is replaced
+        globals()[name] = value
+
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,111 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Optional
+
+from .autotrans import Autotrans, AutotransSnapshot, Trajectory, simulate
+from .signals import InputSignal, input_steps, sample_inputs
+
+
+def _simulate_chunk(model: Autotrans, throttle: list[float], brake: list[float], every: int) -> Trajectory:
+    return simulate(throttle, brake, model, columnar=True, every=every)
+
+
+def _simulate_remote_chunk(
+    model: Autotrans, throttle: list[float], brake: list[float], every: int
+) -> tuple[Trajectory, AutotransSnapshot]:
+    """Simulate a pickled copy of the model in a worker process and return its final state."""
+
+    trajectory = simulate(throttle, brake, model, columnar=True, every=every)
+
+    return trajectory, model.snapshot()
+
+
+async def _simulate_chunks(
+    throttle: InputSignal,
+    brake: InputSignal,
+    model: Autotrans,
+    executor: Optional[Executor],
+    chunk_size: int,
+    every: int,
+) -> Trajectory:
+    loop = asyncio.get_running_loop()
+    remote = isinstance(executor, ProcessPoolExecutor)
+    steps = input_steps(throttle, brake, model._step_size)
+    inputs = sample_inputs(throttle, brake, model._step_size)
+    # Every chunk starts at a recorded step, so the chunks record the same states as a single run
+    chunk_size = -(-chunk_size // every) * every
+    chunks = []
+
+    for _ in range(0, steps, chunk_size):
+        throttle_chunk, brake_chunk = (list(values) for values in zip(*islice(inputs, chunk_size)))
+
+        if remote:
+            chunk, snapshot = await loop.run_in_executor(
+                executor, _simulate_remote_chunk, model, throttle_chunk, brake_chunk, every
+            )
+            model.restore(snapshot)
+        else:
+            future = loop.run_in_executor(executor, _simulate_chunk, model, throttle_chunk, brake_chunk, every)
+
+            try:
+                chunk = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The running chunk cannot be interrupted and keeps stepping the model, so it is awaited
+                await asyncio.wait([future])
+                raise
+
+        chunks.append(chunk)
+
+    return Trajectory.concatenate(chunks) if chunks else Trajectory.empty(0)
+
+
+async def simulate_async(
+    throttle: InputSignal,
+    brake: InputSignal,
+    model: Autotrans,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 1000,
+    every: int = 1,
+    timeout: Optional[float] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Trajectory:
+    """Simulate the model on an executor without blocking the event loop.
+
+    The inputs are simulated in chunks of ticks, and the coroutine returns to the event loop while
+    every chunk runs on the executor. Cancelling the coroutine, or reaching the timeout, stops the
+    simulation at a chunk boundary.
+
+    With a `ProcessPoolExecutor` a copy of the model is sent to a worker for every chunk and its
+    final state is restored into `model`, so the model must be picklable. A cancelled simulation
+    discards the running chunk and leaves the model in the state at the start of that chunk. Any
+    other executor runs the chunks on `model` directly, and None uses the default executor of the
+    event loop. The running chunk cannot be interrupted, so the cancellation or timeout is only
+    raised once it has finished, leaving the model in the state at the end of that chunk.
+
+    Args:
+        throttle: The throttle value for each step, or a `Signal` evaluated at every step
+        brake: The brake value for each step, or a `Signal` evaluated at every step
+        model: The model to simulate
+        executor: The executor that runs the chunks
+        chunk_size: The number of ticks simulated by each chunk
+        every: The number of steps between recorded states
+        timeout: The maximum number of seconds for the whole simulation, including the time spent
+            waiting for the semaphore
+        semaphore: A semaphore shared by the simulations that limits how many run at once
+
+    Returns:
+        The time and state of the model before every `every`-th step
+    """
+
+    assert chunk_size > 0
+    assert every > 0
+
+    async def run() -> Trajectory:
+        if semaphore is None:
+            return await _simulate_chunks(throttle, brake, model, executor, chunk_size, every)
+
+        async with semaphore:
+            return await _simulate_chunks(throttle, brake, model, executor, chunk_size, every)
+
+    return await asyncio.wait_for(run(), timeout)
@@ -1,23 +1,46 @@
-from collections.abc import Sequence as Seq
+import copy
+from collections.abc import Iterable, Iterator, Sequence as Seq
 from dataclasses import dataclass
+from functools import cached_property
+from itertools import islice
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Literal, Optional, Protocol, Union, overload
+
+import numpy as np
+from numpy.typing import NDArray
 
 from .engine import Engine
-from .shift_logic import ShiftLogic, Gear
+from .instrumentation import AutotransStats, CountingIntegrator, CountingLookup, Instrumentation, StatsCallback
+from .integration import Dp5Integrator, IntegratorFactory, ZeroOrderHoldIntegrator
+from .shift_logic import ShiftLogic, Gear, SelectionState
+from .signals import InputSignal, input_steps, sample_inputs
 from .transmission import Transmission
 from .vehicle import Vehicle
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from .monitors import Monitor, MonitorResult
+    from .sinks import TrajectorySink
+
 
 @dataclass(frozen=True)
 class EngineParameters:
     engine_propeller_inertia: float
     initial_rpm: float
 
+    def __post_init__(self):
+        assert self.engine_propeller_inertia > 0
+
 
 @dataclass(frozen=True)
 class ShiftLogicParameters:
     initial_gear: Gear
     wait_ticks: int
 
+    def __post_init__(self):
+        assert self.wait_ticks >= 0
+
 
 @dataclass(frozen=True)
 class VehicleParameters:
@@ -28,6 +51,37 @@ class VehicleParameters:
     wheel_friction: float
     wheel_radius: float
 
+    def __post_init__(self):
+        assert self.drag_coefficient >= 0
+        assert self.final_drive_ratio > 0
+        assert self.inertia > 0
+        assert self.wheel_friction >= 0
+        assert self.wheel_radius > 0
+
+
+@dataclass(frozen=True)
+class RateParameters:
+    """Update period of each subsystem as a multiple of the base step size.
+
+    A subsystem with the rate r is updated once every r base steps, at the end of the r-th step,
+    and integrates over the whole elapsed period using the inputs sampled at the update. Between
+    updates its outputs are held constant for the other subsystems and in the reported states.
+    """
+
+    engine: int = 1
+    shift_logic: int = 1
+    transmission: int = 1
+    vehicle: int = 1
+
+    def __post_init__(self):
+        for rate in (self.engine, self.shift_logic, self.transmission, self.vehicle):
+            assert isinstance(rate, int)
+            assert rate > 0
+
+    @property
+    def single_rate(self) -> bool:
+        return self.engine == self.shift_logic == self.transmission == self.vehicle == 1
+
 
 @dataclass(frozen=True)
 class AutotransParameters:
@@ -35,12 +89,29 @@ class AutotransParameters:
     engine: EngineParameters
     shift_logic: ShiftLogicParameters
     vehicle: VehicleParameters
+    rates: RateParameters = RateParameters()
 
     def __post_init__(self):
         assert isinstance(self.step_size_ms, int)
         assert self.step_size_ms > 0
 
 
+# The parameters of the reference Simulink model, shared by the benchmarks and the server warm-up
+DEFAULT_PARAMETERS = AutotransParameters(
+    step_size_ms=40,
+    engine=EngineParameters(engine_propeller_inertia=0.021991488283555904, initial_rpm=1000.0),
+    shift_logic=ShiftLogicParameters(initial_gear=Gear.FIRST, wait_ticks=2),
+    vehicle=VehicleParameters(
+        drag_coefficient=0.02,
+        final_drive_ratio=3.23,
+        inertia=12.0941,
+        initial_speed=0.0,
+        wheel_friction=40.0,
+        wheel_radius=1.0,
+    ),
+)
+
+
 @dataclass(frozen=True)
 class AutotransState:
     impeller_torque: float
@@ -51,34 +122,225 @@ class AutotransState:
     gear: Gear
 
 
+@dataclass(frozen=True)
+class AutotransSnapshot:
+    """Complete internal state of an `Autotrans` model at a point in time.
+
+    The integrator states hold whatever the integrators keep from previous steps, such as the last
+    stage of a first-same-as-last tableau or the substep size of an adaptive integrator, so that a
+    restored model continues exactly like the model the snapshot was taken from.
+    """
+
+    time_ms: int
+    engine_rpm: float
+    last_throttle: float
+    last_impeller_torque: float
+    engine_integrator: Any
+    gear: Gear
+    selection_state: SelectionState
+    counter: int
+    impeller_torque: float
+    output_torque: float
+    wheel_speed: float
+    vehicle_integrator: Any
+
+
+TimedState = tuple[int, AutotransState]
+
+TRAJECTORY_DTYPE = np.dtype([
+    ("time_ms", np.int64),
+    ("impeller_torque", np.float64),
+    ("output_torque", np.float64),
+    ("vehicle_speed", np.float64),
+    ("transmission_rpm", np.float64),
+    ("engine_rpm", np.float64),
+    ("gear", np.int8),
+])
+STATE_COLUMNS = TRAJECTORY_DTYPE.names[1:]
+
+
+@dataclass(frozen=True, eq=False)
+class Trajectory(Seq[TimedState]):
+    """Trajectory of the model stored as one array per state variable.
+
+    Indexing or iterating over the trajectory produces the same `(time_ms, AutotransState)` tuples
+    as the list returned by `simulate`, which are only created when they are accessed.
+    """
+
+    time_ms: NDArray[np.int64]
+    impeller_torque: NDArray[np.float64]
+    output_torque: NDArray[np.float64]
+    vehicle_speed: NDArray[np.float64]
+    transmission_rpm: NDArray[np.float64]
+    engine_rpm: NDArray[np.float64]
+    gear: NDArray[np.int8]
+
+    @classmethod
+    def empty(cls, length: int) -> "Trajectory":
+        """Preallocate a trajectory with the given number of samples."""
+
+        return cls(**{name: np.empty(length, dtype=TRAJECTORY_DTYPE[name]) for name in TRAJECTORY_DTYPE.names})
+
+    @classmethod
+    def concatenate(cls, trajectories: Iterable["Trajectory"]) -> "Trajectory":
+        """Join trajectories end to end into a single trajectory."""
+
+        trajectories = list(trajectories)
+
+        if not trajectories:
+            return cls.empty(0)
+
+        return cls(**{
+            name: np.concatenate([getattr(trajectory, name) for trajectory in trajectories])
+            for name in TRAJECTORY_DTYPE.names
+        })
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in TRAJECTORY_DTYPE.names)
+
+    def __len__(self) -> int:
+        return self.time_ms.shape[0]
+
+    def _timed_state(self, index: int) -> TimedState:
+        state = AutotransState(
+            self.impeller_torque[index].item(),
+            self.output_torque[index].item(),
+            self.vehicle_speed[index].item(),
+            self.transmission_rpm[index].item(),
+            self.engine_rpm[index].item(),
+            Gear(self.gear[index]),
+        )
+
+        return self.time_ms[index].item(), state
+
+    @overload
+    def __getitem__(self, index: int) -> TimedState:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "Trajectory":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TimedState, "Trajectory"]:
+        if isinstance(index, slice):
+            return Trajectory(**{name: getattr(self, name)[index] for name in TRAJECTORY_DTYPE.names})
+
+        return self._timed_state(index)
+
+    @cached_property
+    def states(self) -> list[TimedState]:
+        """The trajectory as the list of timed states returned by `simulate`."""
+
+        return [self._timed_state(index) for index in range(len(self))]
+
+    def to_records(self) -> NDArray:
+        """Copy the trajectory into a structured array with one field per column."""
+
+        records = np.empty(len(self), dtype=TRAJECTORY_DTYPE)
+
+        for name in TRAJECTORY_DTYPE.names:
+            records[name] = getattr(self, name)
+
+        return records
+
+
 class Autotrans:
-    def __init__(self, parameters: AutotransParameters):
+    def __init__(
+        self,
+        parameters: AutotransParameters,
+        vehicle_integrator: IntegratorFactory = ZeroOrderHoldIntegrator,
+        engine_integrator: IntegratorFactory = Dp5Integrator,
+    ):
+        self._vehicle_integrator = vehicle_integrator
+        self._engine_integrator = engine_integrator
+        self._build(parameters)
+
+    def _build(self, parameters: AutotransParameters):
+        rates = parameters.rates
+        self._parameters = parameters
         self._time = 0
         self._step_size = parameters.step_size_ms
+        self._rates = None if rates.single_rate else rates
+        self._transmission = Transmission()
         self._engine = Engine(
-            parameters.step_size_ms,
-            parameters.engine.engine_propeller_inertia,
-            parameters.engine.initial_rpm,
+            time_step_ms=parameters.step_size_ms * rates.engine,
+            engine_propeller_inertia=parameters.engine.engine_propeller_inertia,
+            initial_rpm=parameters.engine.initial_rpm,
+            initial_throttle=0.0,
+            initial_impeller_torque=self._transmission.impeller_torque,
+            integrator=self._engine_integrator,
         )
+        # The wait is specified in base steps, so it is rounded up to a whole number of shift logic updates
         self._shift_logic = ShiftLogic(
-            parameters.shift_logic.wait_ticks, parameters.shift_logic.initial_gear
+            -(-parameters.shift_logic.wait_ticks // rates.shift_logic), parameters.shift_logic.initial_gear
         )
-        self._transmission = Transmission()
         self._vehicle = Vehicle(
-            parameters.step_size_ms,
-            parameters.vehicle.drag_coefficient,
-            parameters.vehicle.final_drive_ratio,
-            parameters.vehicle.inertia,
-            parameters.vehicle.initial_speed,
-            parameters.vehicle.wheel_friction,
-            parameters.vehicle.wheel_radius,
+            t_step_ms=parameters.step_size_ms * rates.vehicle,
+            final_drive_ratio=parameters.vehicle.final_drive_ratio,
+            wheel_friction=parameters.vehicle.wheel_friction,
+            co_drag=parameters.vehicle.drag_coefficient,
+            wheel_radius=parameters.vehicle.wheel_radius,
+            inertia=parameters.vehicle.inertia,
+            initial_speed=parameters.vehicle.initial_speed,
+            integrator=self._vehicle_integrator,
         )
+        self._instrumentation: Optional[Instrumentation] = None
+
+    def reset(self, parameters: Optional[AutotransParameters] = None):
+        """Reinitialize the model in place to the initial state of the parameters.
+
+        The subsystems, their integrators and the instrumentation are reused, so resetting is cheaper
+        than constructing a new model and gives the same results. The step sizes of the integrators
+        are fixed, so parameters with another step size or other rates rebuild the subsystems like
+        the constructor does, which also disables the instrumentation.
+
+        Args:
+            parameters: The new parameters, or None to keep the current ones
+        """
+
+        parameters = self._parameters if parameters is None else parameters
+
+        if parameters.step_size_ms != self._parameters.step_size_ms or parameters.rates != self._parameters.rates:
+            self._build(parameters)
+            return
+
+        self._parameters = parameters
+        self._time = 0
+        self._transmission.restore(0.0, 0.0)
+        self._engine.reset(
+            engine_propeller_inertia=parameters.engine.engine_propeller_inertia,
+            initial_rpm=parameters.engine.initial_rpm,
+            initial_throttle=0.0,
+            initial_impeller_torque=self._transmission.impeller_torque,
+        )
+        self._shift_logic.reset(
+            -(-parameters.shift_logic.wait_ticks // parameters.rates.shift_logic), parameters.shift_logic.initial_gear
+        )
+        self._vehicle.reset(
+            final_drive_ratio=parameters.vehicle.final_drive_ratio,
+            wheel_friction=parameters.vehicle.wheel_friction,
+            co_drag=parameters.vehicle.drag_coefficient,
+            wheel_radius=parameters.vehicle.wheel_radius,
+            inertia=parameters.vehicle.inertia,
+            initial_speed=parameters.vehicle.initial_speed,
+        )
+
+    @property
+    def parameters(self) -> AutotransParameters:
+        return self._parameters
 
     def step(self, throttle: float, brake: float):
-        assert 0.0 <= throttle <= 1.0
+        assert 0.0 <= throttle <= 100.0
         assert brake >= 0.0
 
-        self._engine.step(self._transmission.impeller_torque, throttle)
+        if self._instrumentation is not None:
+            return self._instrumented_step(throttle, brake)
+
+        if self._rates is not None:
+            return self._multirate_step(throttle, brake)
+
+        self._engine.step(throttle, self._transmission.impeller_torque)
         self._shift_logic.step(throttle, self._vehicle.speed)
         self._transmission.step(
             self._engine.rpm,
@@ -88,6 +350,219 @@ class Autotrans:
         self._vehicle.step(self._transmission.output_torque, brake)
         self._time = self._time + self._step_size
 
+    def _due(self) -> tuple[bool, bool, bool, bool]:
+        """Whether the engine, shift logic, transmission and vehicle are updated in the current step."""
+
+        if self._rates is None:
+            return True, True, True, True
+
+        ticks = self._time // self._step_size + 1
+
+        return (
+            ticks % self._rates.engine == 0,
+            ticks % self._rates.shift_logic == 0,
+            ticks % self._rates.transmission == 0,
+            ticks % self._rates.vehicle == 0,
+        )
+
+    def _multirate_step(self, throttle: float, brake: float):
+        engine_due, shift_logic_due, transmission_due, vehicle_due = self._due()
+
+        if engine_due:
+            self._engine.step(throttle, self._transmission.impeller_torque)
+
+        if shift_logic_due:
+            self._shift_logic.step(throttle, self._vehicle.speed)
+
+        if transmission_due:
+            self._transmission.step(
+                self._engine.rpm,
+                self._shift_logic.current_gear,
+                self._vehicle.transmission_rpm
+            )
+
+        if vehicle_due:
+            self._vehicle.step(self._transmission.output_torque, brake)
+
+        self._time = self._time + self._step_size
+
+    def _instrumented_step(self, throttle: float, brake: float):
+        stats = self._instrumentation.stats
+        gear = self._shift_logic.current_gear
+        engine_due, shift_logic_due, transmission_due, vehicle_due = self._due()
+
+        start = perf_counter()
+        if engine_due:
+            self._engine.step(throttle, self._transmission.impeller_torque)
+        engine_done = perf_counter()
+        if shift_logic_due:
+            self._shift_logic.step(throttle, self._vehicle.speed)
+        shift_logic_done = perf_counter()
+        if transmission_due:
+            self._transmission.step(
+                self._engine.rpm,
+                self._shift_logic.current_gear,
+                self._vehicle.transmission_rpm
+            )
+        transmission_done = perf_counter()
+        if vehicle_due:
+            self._vehicle.step(self._transmission.output_torque, brake)
+        vehicle_done = perf_counter()
+        self._time = self._time + self._step_size
+
+        stats.seconds["engine"] += engine_done - start
+        stats.seconds["shift_logic"] += shift_logic_done - engine_done
+        stats.seconds["transmission"] += transmission_done - shift_logic_done
+        stats.seconds["vehicle"] += vehicle_done - transmission_done
+
+        if self._shift_logic.current_gear > gear:
+            stats.up_shifts += 1
+        elif self._shift_logic.current_gear < gear:
+            stats.down_shifts += 1
+
+        self._instrumentation.step_finished()
+
+    def enable_instrumentation(self, callback: Optional[StatsCallback] = None, callback_every: int = 0) -> AutotransStats:
+        """Start collecting per-subsystem timings and call counters.
+
+        Instrumentation is disabled by default and costs a single attribute check per step while
+        disabled. Once enabled, the wall time of every subsystem, the right-hand side evaluations of
+        the integrators, the lookup table calls and the gear changes are accumulated into the
+        returned statistics, which are also available from the `stats` property.
+
+        Args:
+            callback: Function called with the statistics every `callback_every` steps
+            callback_every: The number of steps between calls to the callback
+
+        Returns:
+            The statistics that will be updated by each step
+        """
+
+        if self._instrumentation is not None:
+            self.disable_instrumentation()
+
+        stats = AutotransStats()
+        engine = self._engine
+        shift_logic = self._shift_logic
+        transmission = self._transmission
+        vehicle = self._vehicle
+
+        engine._integrator = CountingIntegrator(engine._integrator, stats, "engine")
+        engine._torque_map = CountingLookup(engine._torque_map, stats, "engine_torque")
+        vehicle._integrator = CountingIntegrator(vehicle._integrator, stats, "vehicle")
+        transmission.K_FACTOR_TABLE = CountingLookup(transmission.K_FACTOR_TABLE, stats, "k_factor")
+        transmission.TORQUE_RATIO_TABLE = CountingLookup(transmission.TORQUE_RATIO_TABLE, stats, "torque_ratio")
+        shift_logic._up_shift_tables = [
+            table and CountingLookup(table, stats, "up_shift") for table in shift_logic._up_shift_tables
+        ]
+        shift_logic._down_shift_tables = [
+            table and CountingLookup(table, stats, "down_shift") for table in shift_logic._down_shift_tables
+        ]
+        self._instrumentation = Instrumentation(stats, callback, callback_every)
+
+        return stats
+
+    def disable_instrumentation(self):
+        """Stop collecting statistics and remove the counting wrappers."""
+
+        if self._instrumentation is None:
+            return
+
+        engine = self._engine
+        shift_logic = self._shift_logic
+
+        engine._integrator = engine._integrator.integrator
+        engine._torque_map = engine._torque_map.table
+        self._vehicle._integrator = self._vehicle._integrator.integrator
+        del self._transmission.K_FACTOR_TABLE
+        del self._transmission.TORQUE_RATIO_TABLE
+        shift_logic._up_shift_tables = [table and table.table for table in shift_logic._up_shift_tables]
+        shift_logic._down_shift_tables = [table and table.table for table in shift_logic._down_shift_tables]
+        self._instrumentation = None
+
+    @property
+    def stats(self) -> Optional[AutotransStats]:
+        """The statistics collected while instrumentation is enabled."""
+
+        return None if self._instrumentation is None else self._instrumentation.stats
+
+    def snapshot(self) -> AutotransSnapshot:
+        """Capture the state of the model so that it can be restored later."""
+
+        return AutotransSnapshot(
+            self._time,
+            *self._engine.snapshot(),
+            *self._shift_logic.snapshot(),
+            *self._transmission.snapshot(),
+            *self._vehicle.snapshot(),
+        )
+
+    def restore(self, snapshot: AutotransSnapshot):
+        """Reset the state of the model to a snapshot taken from a model with the same parameters."""
+
+        self._time = snapshot.time_ms
+        self._engine.restore(
+            snapshot.engine_rpm, snapshot.last_throttle, snapshot.last_impeller_torque, snapshot.engine_integrator
+        )
+        self._shift_logic.restore(snapshot.gear, snapshot.selection_state, snapshot.counter)
+        self._transmission.restore(snapshot.impeller_torque, snapshot.output_torque)
+        self._vehicle.restore(snapshot.wheel_speed, snapshot.vehicle_integrator)
+
+    def fork(self) -> "Autotrans":
+        """Create an independent copy of the model in its current state.
+
+        The copy shares the parameters and lookup tables of this model, so forking only copies the
+        handful of state variables of each subsystem and the integrators, which may carry state such
+        as the substep size of an adaptive integrator. The copy of an instrumented model collects new
+        statistics of its own and reports them to the same callback.
+        """
+
+        instrumentation = self._instrumentation
+        model = copy.copy(self)
+        model._engine = copy.copy(self._engine)
+        model._shift_logic = copy.copy(self._shift_logic)
+        model._transmission = copy.copy(self._transmission)
+        model._vehicle = copy.copy(self._vehicle)
+
+        # Unwrap the copied subsystems so that the counting wrappers of this model are not shared
+        if instrumentation is not None:
+            model.disable_instrumentation()
+
+        model._engine._integrator = copy.copy(model._engine._integrator)
+        model._vehicle._integrator = copy.copy(model._vehicle._integrator)
+
+        if instrumentation is not None:
+            model.enable_instrumentation(instrumentation.callback, instrumentation.callback_every)
+
+        return model
+
+    async def astep_many(
+        self,
+        throttle: InputSignal,
+        brake: InputSignal,
+        executor: Optional["Executor"] = None,
+        chunk_size: int = 1000,
+        every: int = 1,
+    ) -> "Trajectory":
+        """Step the model through the inputs on an executor, yielding to the event loop between chunks.
+
+        See `autotrans.aio.simulate_async` for the executors, timeouts and concurrency limits.
+
+        Args:
+            throttle: The throttle value for each step, or a `Signal` evaluated at every step
+            brake: The brake value for each step, or a `Signal` evaluated at every step
+            executor: The executor that runs the chunks, the default executor of the loop if None
+            chunk_size: The number of ticks simulated by each chunk
+            every: The number of steps between recorded states
+
+        Returns:
+            The time and state of the model before every `every`-th step
+        """
+
+        from .aio import simulate_async
+
+        return await simulate_async(throttle, brake, self, executor, chunk_size, every)
+
     @property
     def time_ms(self) -> int:
         return self._time
@@ -103,18 +578,284 @@ class Autotrans:
             self._shift_logic.current_gear
         )
 
+    def _record(self, trajectory: Trajectory, index: int):
+        trajectory.time_ms[index] = self._time
+        trajectory.impeller_torque[index] = self._transmission.impeller_torque
+        trajectory.output_torque[index] = self._transmission.output_torque
+        trajectory.vehicle_speed[index] = self._vehicle.speed
+        trajectory.transmission_rpm[index] = self._vehicle.transmission_rpm
+        trajectory.engine_rpm[index] = self._engine.rpm
+        trajectory.gear[index] = self._shift_logic.current_gear
 
-TimedState = tuple[int, AutotransState]
 
+@overload
+def simulate(
+    throttle_signal: InputSignal,
+    brake_signal: InputSignal,
+    model: Autotrans,
+    columnar: Literal[False] = ...,
+    every: int = ...,
+    monitor: None = ...,
+) -> list[TimedState]:
+    ...
+
+
+@overload
+def simulate(
+    throttle_signal: InputSignal,
+    brake_signal: InputSignal,
+    model: Autotrans,
+    columnar: Literal[True],
+    every: int = ...,
+    monitor: None = ...,
+) -> Trajectory:
+    ...
+
+
+@overload
+def simulate(
+    throttle_signal: InputSignal,
+    brake_signal: InputSignal,
+    model: Autotrans,
+    columnar: Literal[False] = ...,
+    every: int = ...,
+    *,
+    monitor: "Monitor",
+) -> tuple[list[TimedState], "MonitorResult"]:
+    ...
+
+
+@overload
+def simulate(
+    throttle_signal: InputSignal,
+    brake_signal: InputSignal,
+    model: Autotrans,
+    columnar: Literal[True],
+    every: int = ...,
+    *,
+    monitor: "Monitor",
+) -> tuple[Trajectory, "MonitorResult"]:
+    ...
+
+
+@overload
+def simulate(
+    throttle_signal: InputSignal,
+    brake_signal: InputSignal,
+    model: Autotrans,
+    columnar: bool = ...,
+    every: int = ...,
+    monitor: None = ...,
+    *,
+    sink: "TrajectorySink",
+) -> None:
+    ...
+
+
+def simulate(
+    throttle_signal: InputSignal,
+    brake_signal: InputSignal,
+    model: Autotrans,
+    columnar: bool = False,
+    every: int = 1,
+    monitor: Optional["Monitor"] = None,
+    sink: Optional["TrajectorySink"] = None,
+) -> Union[list[TimedState], Trajectory, tuple[Union[list[TimedState], Trajectory], "MonitorResult"], None]:
+    """Simulate the model over the given input signals.
+
+    Args:
+        throttle_signal: The throttle value for each step, or a `Signal` evaluated at every step
+        brake_signal: The brake value for each step, or a `Signal` evaluated at every step
+        model: The model to simulate
+        columnar: Write the states into a preallocated `Trajectory` instead of a list
+        every: The number of steps between recorded states
+        monitor: A monitor that observes the state before every step and stops the simulation once
+            its verdict is fixed
+        sink: Write the states into this sink in chunks while simulating instead of returning them
+
+    Returns:
+        The time and state of the model before every `every`-th step, together with the result of
+        the monitor when one is given, or None when a sink is given
+    """
+
+    assert every > 0
+
+    steps = input_steps(throttle_signal, brake_signal, model._step_size)
+    inputs = sample_inputs(throttle_signal, brake_signal, model._step_size)
+
+    if sink is not None:
+        assert monitor is None
+        _simulate_to_sink(inputs, steps, model, every, sink)
+        return None
+
+    if monitor is not None:
+        return _simulate_monitored(inputs, steps, model, columnar, every, monitor)
+
+    if columnar:
+        columns = Trajectory.empty(-(-steps // every))
+
+        for tick, (throttle_value, brake_value) in enumerate(inputs):
+            if tick % every == 0:
+                model._record(columns, tick // every)
+
+            model.step(throttle_value, brake_value)
 
-def simulate(throttle_signal: Seq[float], brake_signal: Seq[float], model: Autotrans) -> list[TimedState]:
-    assert len(throttle_signal) == len(brake_signal)
+        return columns
 
     trajectory: list[TimedState] = []
 
-    for (throttle_value, brake_value) in zip(throttle_signal, brake_signal):
-        timed_state = (model.time_ms, model.state)
-        trajectory.append(timed_state)
+    for tick, (throttle_value, brake_value) in enumerate(inputs):
+        if tick % every == 0:
+            trajectory.append((model.time_ms, model.state))
+
         model.step(throttle_value, brake_value)
 
     return trajectory
+
+
+def _simulate_to_sink(
+    inputs: Iterable[tuple[float, float]], steps: int, model: Autotrans, every: int, sink: "TrajectorySink"
+):
+    length = -(-steps // every)
+    chunk = Trajectory.empty(min(sink.chunk_size, length))
+    start = 0
+    index = 0
+
+    def flush(count: int):
+        columns = {name: getattr(chunk, name)[np.newaxis, :count] for name in STATE_COLUMNS}
+        sink.write(0, start, chunk.time_ms[:count], columns)
+
+    sink.open([model._parameters], length)
+
+    try:
+        for tick, (throttle_value, brake_value) in enumerate(inputs):
+            if tick % every == 0:
+                model._record(chunk, index)
+                index += 1
+
+                if index == len(chunk):
+                    flush(index)
+                    start += index
+                    index = 0
+
+            model.step(throttle_value, brake_value)
+
+        if index:
+            flush(index)
+    finally:
+        sink.close()
+
+
+def _simulate_monitored(
+    inputs: Iterable[tuple[float, float]],
+    steps: int,
+    model: Autotrans,
+    columnar: bool,
+    every: int,
+    monitor: "Monitor",
+) -> tuple[Union[list[TimedState], Trajectory], "MonitorResult"]:
+    trajectory: list[TimedState] = []
+    # The run may stop early, so the columns are sized for the whole input and trimmed afterwards
+    columns = Trajectory.empty(-(-steps // every)) if columnar else None
+    recorded = 0
+    stopped = False
+    monitor.reset()
+
+    for tick, (throttle_value, brake_value) in enumerate(inputs):
+        state = model.state
+
+        if tick % every == 0:
+            if columns is None:
+                trajectory.append((model.time_ms, state))
+            else:
+                model._record(columns, recorded)
+
+            recorded += 1
+
+        if monitor.update(model.time_ms, state) and monitor.stop_early:
+            stopped = True
+            break
+
+        model.step(throttle_value, brake_value)
+
+    result = monitor.finish(stopped)
+
+    return (trajectory if columns is None else columns[:recorded]), result
+
+
+class Model(Protocol):
+    """Interface of a model that can be simulated one step at a time."""
+
+    @property
+    def time_ms(self) -> int:
+        ...
+
+    @property
+    def state(self) -> AutotransState:
+        ...
+
+    def step(self, throttle: float, brake: float):
+        ...
+
+
+def simulate_iter(inputs: Iterable[tuple[float, float]], model: Model, every: int = 1) -> Iterator[TimedState]:
+    """Lazily simulate the model over a stream of inputs.
+
+    The inputs are consumed one step at a time and the state of the model before a step is only
+    produced for every `every`-th step, so the memory used does not grow with the number of steps.
+
+    Args:
+        inputs: The (throttle, brake) pair of each step
+        model: The model to simulate
+        every: The number of steps between produced states
+
+    Returns:
+        An iterator over the time and state of the model before every `every`-th step
+    """
+
+    assert every > 0
+
+    for tick, (throttle_value, brake_value) in enumerate(inputs):
+        if tick % every == 0:
+            yield model.time_ms, model.state
+
+        model.step(throttle_value, brake_value)
+
+
+def simulate_chunks(
+    inputs: Iterable[tuple[float, float]], model: Model, chunk_size: int, every: int = 1
+) -> Iterator[Trajectory]:
+    """Lazily simulate the model over a stream of inputs and group the states into trajectories.
+
+    Args:
+        inputs: The (throttle, brake) pair of each step
+        model: The model to simulate
+        chunk_size: The maximum number of states in each trajectory
+        every: The number of steps between recorded states
+
+    Returns:
+        An iterator over trajectories of at most `chunk_size` states
+    """
+
+    assert chunk_size > 0
+
+    timed_states = simulate_iter(inputs, model, every)
+
+    while True:
+        chunk = Trajectory.empty(chunk_size)
+        length = 0
+
+        for index, (time_ms, state) in enumerate(islice(timed_states, chunk_size)):
+            chunk.time_ms[index] = time_ms
+            chunk.impeller_torque[index] = state.impeller_torque
+            chunk.output_torque[index] = state.output_torque
+            chunk.vehicle_speed[index] = state.vehicle_speed
+            chunk.transmission_rpm[index] = state.transmission_rpm
+            chunk.engine_rpm[index] = state.engine_rpm
+            chunk.gear[index] = state.gear
+            length = index + 1
+
+        if length == 0:
+            return
+
+        yield chunk if length == chunk_size else chunk[:length]
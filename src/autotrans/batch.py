@@ -0,0 +1,291 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Union, overload
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .autotrans import AutotransParameters, Trajectory, STATE_COLUMNS, TRAJECTORY_DTYPE
+from .engine import ENGINE_TORQUE_MAP
+from .runge_kutta import DORMAND_PRINCE, runge_kutta_step
+from .shift_logic import BatchShiftLogic, Gear
+from .transmission import Transmission
+from .vehicle import _into_mph
+
+if TYPE_CHECKING:
+    from .sinks import TrajectorySink
+
+_GEAR_RATIOS = np.array([Transmission.GEAR_RATIOS[gear] for gear in Gear], dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class BatchTrajectory:
+    """Trajectories of N scenarios sampled on a common time grid.
+
+    Every state column has the shape (N, T), where T is the number of samples. Sample t holds the
+    state of the model before the inputs of tick t are applied, matching the output of `simulate`.
+    """
+
+    time_ms: NDArray[np.int64]
+    impeller_torque: NDArray[np.float64]
+    output_torque: NDArray[np.float64]
+    vehicle_speed: NDArray[np.float64]
+    transmission_rpm: NDArray[np.float64]
+    engine_rpm: NDArray[np.float64]
+    gear: NDArray[np.int8]
+
+    def __len__(self) -> int:
+        return self.engine_rpm.shape[0]
+
+    def __getitem__(self, index: int) -> Trajectory:
+        """The trajectory of a single scenario."""
+
+        columns = {name: getattr(self, name)[index] for name in STATE_COLUMNS}
+        return Trajectory(time_ms=self.time_ms, **columns)
+
+
+class BatchAutotrans:
+    """Vectorized autotrans model that advances N independent scenarios at once.
+
+    The model state is stored as arrays of shape (N,) and every subsystem update is performed with
+    a fixed number of NumPy operations per tick regardless of the number of scenarios. The update
+    order and equations are the same as `Autotrans`. The scenarios either share one set of
+    parameters or each have their own, in which case all of them must use the same step size.
+
+    Args:
+        parameters: The model parameters shared by all scenarios, or the parameters of each scenario
+        n: The number of scenarios to simulate, defaults to the number of parameters
+    """
+
+    def __init__(self, parameters: Union[AutotransParameters, Sequence[AutotransParameters]], n: Optional[int] = None):
+        if isinstance(parameters, AutotransParameters):
+            assert n is not None
+            parameters = [parameters]
+        else:
+            n = len(parameters) if n is None else n
+            assert len(parameters) == n
+
+        assert n > 0
+        assert all(p.step_size_ms == parameters[0].step_size_ms for p in parameters)
+        assert all(p.rates.single_rate for p in parameters)
+
+        def column(field: str, dtype: type = np.float64) -> NDArray:
+            group, name = field.split(".")
+            values = np.array([getattr(getattr(p, group), name) for p in parameters], dtype=dtype)
+            return np.broadcast_to(values, (n,)).copy()
+
+        self._n = n
+        self._time = 0
+        self._step_size = parameters[0].step_size_ms
+        self._time_step = parameters[0].step_size_ms / 1000
+
+        # Engine
+        self._engine_inertia = column("engine.engine_propeller_inertia")
+        self._engine_rpm = column("engine.initial_rpm")
+        self._last_throttle = np.zeros(n, dtype=np.float64)
+        self._last_impeller_torque = np.zeros(n, dtype=np.float64)
+        self._engine_fsal_stage: Optional[NDArray[np.float64]] = None
+
+        # Shift logic
+        self._shift_logic = BatchShiftLogic(
+            column("shift_logic.wait_ticks", np.int64), column("shift_logic.initial_gear", np.int64)
+        )
+
+        # Transmission
+        self._impeller_torque = np.zeros(n, dtype=np.float64)
+        self._output_torque = np.zeros(n, dtype=np.float64)
+
+        # Vehicle
+        self._drag_coefficient = column("vehicle.drag_coefficient")
+        self._final_drive_ratio = column("vehicle.final_drive_ratio")
+        self._vehicle_inertia = column("vehicle.inertia")
+        self._wheel_friction = column("vehicle.wheel_friction")
+        self._wheel_radius = column("vehicle.wheel_radius")
+        self._wheel_speed = column("vehicle.initial_speed") / self._wheel_radius
+
+    def _step_engine(self, throttle: NDArray, impeller_torque: NDArray):
+        last_throttle = self._last_throttle
+        last_impeller_torque = self._last_impeller_torque
+
+        def integration_fn(t: float, rpm: NDArray) -> NDArray:
+            fraction = t / self._time_step
+            engine_torque = ENGINE_TORQUE_MAP.lookup_many((1 - fraction) * last_throttle + fraction * throttle, rpm)
+            impeller_torque_t = (1 - fraction) * last_impeller_torque + fraction * impeller_torque
+            return (engine_torque - impeller_torque_t) / self._engine_inertia
+
+        # The inputs are continuous across steps, so the last stage of the previous step is reused
+        step = runge_kutta_step(
+            DORMAND_PRINCE, self._time_step, 0.0, self._engine_rpm, integration_fn, self._engine_fsal_stage
+        )
+        self._engine_rpm = step.y
+        self._engine_fsal_stage = step.fsal_stage
+        self._last_throttle = throttle
+        self._last_impeller_torque = impeller_torque
+
+    def _step_transmission(self):
+        gear_ratio = _GEAR_RATIOS[self.gear - Gear.FIRST]
+        speed_ratio = gear_ratio * self.transmission_rpm / self._engine_rpm
+        k_factor = Transmission.K_FACTOR_TABLE.lookup_many(speed_ratio)
+        torque_ratio = Transmission.TORQUE_RATIO_TABLE.lookup_many(speed_ratio)
+
+        self._impeller_torque = (self._engine_rpm / k_factor) ** 2
+        self._output_torque = gear_ratio * self._impeller_torque * torque_ratio
+
+    def _step_vehicle(self, brake: NDArray):
+        vehicle_speed = self.vehicle_speed
+        load = vehicle_speed**2 * self._drag_coefficient + self._wheel_friction
+        signed_load = (load + brake) * np.copysign(1.0, vehicle_speed)
+        vehicle_inertia = (self._output_torque * self._final_drive_ratio - signed_load) / self._vehicle_inertia
+
+        self._wheel_speed = self._wheel_speed + self._time_step * vehicle_inertia
+
+    def step(self, throttle: ArrayLike, brake: ArrayLike):
+        """Advance every scenario by one time step.
+
+        Args:
+            throttle: Throttle values in the range [0, 100], one per scenario
+            brake: Brake torque values, one per scenario
+        """
+
+        throttle = np.broadcast_to(np.asarray(throttle, dtype=np.float64), (self._n,))
+        brake = np.broadcast_to(np.asarray(brake, dtype=np.float64), (self._n,))
+
+        assert np.all((0.0 <= throttle) & (throttle <= 100.0))
+        assert np.all(brake >= 0.0)
+
+        self._step_engine(throttle, self._impeller_torque)
+        self._shift_logic.step(throttle, self.vehicle_speed)
+        self._step_transmission()
+        self._step_vehicle(brake)
+        self._time = self._time + self._step_size
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def time_ms(self) -> int:
+        return self._time
+
+    @property
+    def step_size_ms(self) -> int:
+        return self._step_size
+
+    @property
+    def impeller_torque(self) -> NDArray[np.float64]:
+        return self._impeller_torque
+
+    @property
+    def output_torque(self) -> NDArray[np.float64]:
+        return self._output_torque
+
+    @property
+    def vehicle_speed(self) -> NDArray[np.float64]:
+        return _into_mph(self._wheel_speed * 2 * np.pi * self._wheel_radius)
+
+    @property
+    def transmission_rpm(self) -> NDArray[np.float64]:
+        return self._final_drive_ratio * self._wheel_speed
+
+    @property
+    def engine_rpm(self) -> NDArray[np.float64]:
+        return self._engine_rpm
+
+    @property
+    def gear(self) -> NDArray[np.int64]:
+        return self._shift_logic.current_gear
+
+
+def _simulate_into(model: BatchAutotrans, throttle: NDArray, brake: NDArray, columns: dict[str, NDArray]):
+    """Simulate the model and write the state before each tick into preallocated (N, T) columns."""
+
+    for tick in range(throttle.shape[1]):
+        for name, column in columns.items():
+            column[:, tick] = getattr(model, name)
+
+        model.step(throttle[:, tick], brake[:, tick])
+
+
+def _simulate_to_sink(model: BatchAutotrans, throttle: NDArray, brake: NDArray, sink: "TrajectorySink", row: int = 0):
+    """Simulate the model in chunks of ticks and write each chunk of states into the sink."""
+
+    n, steps = throttle.shape
+    chunk_size = min(sink.chunk_size, steps)
+    buffers = {name: np.empty((n, chunk_size), dtype=TRAJECTORY_DTYPE[name]) for name in STATE_COLUMNS}
+
+    for start in range(0, steps, chunk_size):
+        stop = min(start + chunk_size, steps)
+        columns = {name: buffer[:, :stop - start] for name, buffer in buffers.items()}
+        _simulate_into(model, throttle[:, start:stop], brake[:, start:stop], columns)
+        sink.write(row, start, np.arange(start, stop, dtype=np.int64) * model.step_size_ms, columns)
+
+
+def scenario_parameters(
+    parameters: Union[AutotransParameters, Sequence[AutotransParameters]], n: int
+) -> list[AutotransParameters]:
+    """The parameters of each of the N scenarios, which may be shared by all of them."""
+
+    return [parameters] * n if isinstance(parameters, AutotransParameters) else list(parameters)
+
+
+@overload
+def simulate_batch(
+    throttle: ArrayLike,
+    brake: ArrayLike,
+    parameters: Union[AutotransParameters, Sequence[AutotransParameters]],
+    sink: None = ...,
+) -> BatchTrajectory:
+    ...
+
+
+@overload
+def simulate_batch(
+    throttle: ArrayLike,
+    brake: ArrayLike,
+    parameters: Union[AutotransParameters, Sequence[AutotransParameters]],
+    sink: "TrajectorySink",
+) -> None:
+    ...
+
+
+def simulate_batch(
+    throttle: ArrayLike,
+    brake: ArrayLike,
+    parameters: Union[AutotransParameters, Sequence[AutotransParameters]],
+    sink: Optional["TrajectorySink"] = None,
+) -> Optional[BatchTrajectory]:
+    """Simulate N scenarios of T ticks with a single vectorized model.
+
+    Args:
+        throttle: Throttle signals with the shape (N, T)
+        brake: Brake signals with the shape (N, T)
+        parameters: The model parameters shared by all scenarios, or the parameters of each scenario
+        sink: Write the states into this sink in chunks of ticks instead of returning them
+
+    Returns:
+        The trajectories of all scenarios, or None when a sink is given
+    """
+
+    throttle = np.asarray(throttle, dtype=np.float64)
+    brake = np.asarray(brake, dtype=np.float64)
+
+    assert throttle.ndim == 2
+    assert throttle.shape == brake.shape
+
+    n, steps = throttle.shape
+    model = BatchAutotrans(parameters, n)
+
+    if sink is not None:
+        sink.open(scenario_parameters(parameters, n), steps)
+
+        try:
+            _simulate_to_sink(model, throttle, brake, sink)
+        finally:
+            sink.close()
+
+        return None
+
+    columns = {name: np.empty((n, steps), dtype=TRAJECTORY_DTYPE[name]) for name in STATE_COLUMNS}
+    _simulate_into(model, throttle, brake, columns)
+    time_ms = np.arange(steps, dtype=np.int64) * model.step_size_ms
+
+    return BatchTrajectory(time_ms=time_ms, **columns)
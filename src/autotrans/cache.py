@@ -0,0 +1,164 @@
+import hashlib
+import sys
+from collections import OrderedDict
+from collections.abc import Sequence as Seq
+from dataclasses import dataclass
+from typing import Literal, Union, overload
+
+import numpy as np
+
+from .autotrans import Autotrans, AutotransParameters, AutotransSnapshot, TimedState, Trajectory, simulate
+from .integration import IntegratorFactory, ZeroOrderHoldIntegrator
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how much simulation work a `SimulationCache` avoided."""
+
+    hits: int = 0
+    misses: int = 0
+    steps_saved: int = 0
+    steps_simulated: int = 0
+    evictions: int = 0
+
+
+@dataclass(frozen=True)
+class _Checkpoint:
+    snapshot: AutotransSnapshot
+    segment: Trajectory
+    nbytes: int
+
+
+class SimulationCache:
+    """In-memory cache of simulations indexed by the prefixes of their inputs.
+
+    Every `checkpoint_interval` steps the cache stores a snapshot of the model together with the
+    states of the preceding segment. A checkpoint is keyed by a hash chain over all of the inputs
+    before it, so a later simulation whose inputs share a prefix with an earlier one resumes from
+    the deepest checkpoint of that prefix and only simulates the remaining steps. Checkpoints are
+    evicted in least-recently-used order once their total size exceeds `max_bytes`.
+
+    Args:
+        parameters: The parameters of the simulated model
+        checkpoint_interval: The number of steps between checkpoints
+        max_bytes: The approximate memory budget of the stored checkpoints
+        vehicle_integrator: The vehicle integrator of the simulated model
+    """
+
+    def __init__(
+        self,
+        parameters: AutotransParameters,
+        checkpoint_interval: int = 100,
+        max_bytes: int = 64 * 1024 * 1024,
+        vehicle_integrator: IntegratorFactory = ZeroOrderHoldIntegrator,
+    ):
+        assert checkpoint_interval > 0
+        assert max_bytes >= 0
+
+        self._parameters = parameters
+        self._vehicle_integrator = vehicle_integrator
+        self._interval = checkpoint_interval
+        self._max_bytes = max_bytes
+        self._checkpoints: OrderedDict[bytes, _Checkpoint] = OrderedDict()
+        self._nbytes = 0
+        self.stats = CacheStats()
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._checkpoints)
+
+    def clear(self):
+        self._checkpoints.clear()
+        self._nbytes = 0
+
+    def _keys(self, throttle_signal: Seq[float], brake_signal: Seq[float]) -> list[bytes]:
+        """Compute the key of every checkpoint covered by the inputs."""
+
+        keys = []
+        digest = b""
+
+        for stop in range(self._interval, len(throttle_signal) + 1, self._interval):
+            start = stop - self._interval
+            segment = np.array([throttle_signal[start:stop], brake_signal[start:stop]], dtype=np.float64)
+            digest = hashlib.blake2b(digest + segment.tobytes(), digest_size=16).digest()
+            keys.append(digest)
+
+        return keys
+
+    def _store(self, key: bytes, snapshot: AutotransSnapshot, segment: Trajectory):
+        checkpoint = _Checkpoint(snapshot, segment, segment.nbytes + sys.getsizeof(snapshot) + len(key))
+        self._checkpoints[key] = checkpoint
+        self._nbytes += checkpoint.nbytes
+
+    def _evict(self):
+        while self._nbytes > self._max_bytes and self._checkpoints:
+            _, evicted = self._checkpoints.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+            self.stats.evictions += 1
+
+    @overload
+    def simulate(
+        self, throttle_signal: Seq[float], brake_signal: Seq[float], columnar: Literal[False] = ...
+    ) -> list[TimedState]:
+        ...
+
+    @overload
+    def simulate(self, throttle_signal: Seq[float], brake_signal: Seq[float], columnar: Literal[True]) -> Trajectory:
+        ...
+
+    def simulate(
+        self, throttle_signal: Seq[float], brake_signal: Seq[float], columnar: bool = False
+    ) -> Union[list[TimedState], Trajectory]:
+        """Simulate a new model over the inputs, reusing the deepest cached prefix.
+
+        The result is the same as calling `simulate` with a freshly constructed model.
+        """
+
+        assert len(throttle_signal) == len(brake_signal)
+
+        keys = self._keys(throttle_signal, brake_signal)
+        segments = []
+
+        for key in keys:
+            checkpoint = self._checkpoints.get(key)
+
+            if checkpoint is None:
+                break
+
+            segments.append(checkpoint.segment)
+
+        depth = len(segments)
+        model = Autotrans(self._parameters, vehicle_integrator=self._vehicle_integrator)
+
+        if depth > 0:
+            model.restore(self._checkpoints[keys[depth - 1]].snapshot)
+            self.stats.hits += 1
+            self.stats.steps_saved += depth * self._interval
+        else:
+            self.stats.misses += 1
+
+        start = depth * self._interval
+
+        while start < len(throttle_signal):
+            stop = min(start + self._interval, len(throttle_signal))
+            segment = simulate(throttle_signal[start:stop], brake_signal[start:stop], model, columnar=True)
+            segments.append(segment)
+            self.stats.steps_simulated += stop - start
+
+            if stop - start == self._interval:
+                self._store(keys[stop // self._interval - 1], model.snapshot(), segment)
+
+            start = stop
+
+        # Touch the checkpoints from the deepest to the shallowest so that the shared prefixes are
+        # the last to be evicted
+        for key in reversed(keys):
+            self._checkpoints.move_to_end(key)
+
+        self._evict()
+        trajectory = Trajectory.concatenate(segments)
+
+        return trajectory if columnar else trajectory.states
@@ -1,7 +1,10 @@
+from bisect import bisect_right
+from typing import Any, Union
+
 import numpy as np
-import scipy.interpolate as interpolate
+from numpy.typing import ArrayLike, NDArray
 
-from .integration import Dp5Integrator
+from .integration import Dp5Integrator, IntegratorFactory
 
 THROTTLE_BREAKPOINTS = np.array([0, 20, 30, 40, 50, 60, 70, 80, 90, 100], dtype=np.float64)
 RPM_BREAKPOINTS = np.array([
@@ -31,25 +34,127 @@ ENGINE_TORQUE_TABLE_VALUES = np.array([
 ], dtype=np.float64)
 
 
+class EngineTorqueMap:
+    """Bilinear engine torque map over throttle and engine RPM.
+
+    The cell bounds and slopes of the table are computed once when the map is constructed. Inputs
+    outside of the table are clamped to the nearest breakpoint, which matches the behavior of a
+    `scipy.interpolate.RectBivariateSpline` with `kx=1` and `ky=1`.
+
+    Args:
+        throttle_breakpoints: Monotonically increasing throttle breakpoints
+        rpm_breakpoints: Monotonically increasing engine RPM breakpoints
+        values: Engine torque values with the shape (throttle breakpoints, rpm breakpoints)
+    """
+
+    def __init__(self, throttle_breakpoints: NDArray, rpm_breakpoints: NDArray, values: NDArray):
+        assert np.all(np.diff(throttle_breakpoints) > 0)
+        assert np.all(np.diff(rpm_breakpoints) > 0)
+        assert values.shape == (throttle_breakpoints.size, rpm_breakpoints.size)
+
+        self._throttle_breakpoints = np.asarray(throttle_breakpoints, dtype=np.float64)
+        self._rpm_breakpoints = np.asarray(rpm_breakpoints, dtype=np.float64)
+        self._values = np.asarray(values, dtype=np.float64)
+        self._throttle_widths = np.diff(self._throttle_breakpoints)
+        self._rpm_widths = np.diff(self._rpm_breakpoints)
+
+        # Plain python copies of the table avoid NumPy call overhead for scalar lookups
+        self._throttle_list = self._throttle_breakpoints.tolist()
+        self._rpm_list = self._rpm_breakpoints.tolist()
+        self._throttle_width_list = self._throttle_widths.tolist()
+        self._rpm_width_list = self._rpm_widths.tolist()
+        self._value_list = self._values.tolist()
+
+    def _cell(self, throttle: float, rpm: float) -> tuple[float, float, int, int, float, float]:
+        """The clamped inputs, the indices of their cell and their relative positions within it."""
+
+        xs = self._throttle_list
+        ys = self._rpm_list
+        x = min(max(throttle, xs[0]), xs[-1])
+        y = min(max(rpm, ys[0]), ys[-1])
+        i = min(bisect_right(xs, x) - 1, len(xs) - 2)
+        j = min(bisect_right(ys, y) - 1, len(ys) - 2)
+
+        return x, y, i, j, (x - xs[i]) / self._throttle_width_list[i], (y - ys[j]) / self._rpm_width_list[j]
+
+    def _lookup(self, throttle: float, rpm: float) -> float:
+        _, _, i, j, tx, ty = self._cell(throttle, rpm)
+        row_1 = self._value_list[i]
+        row_2 = self._value_list[i + 1]
+        f_y1 = row_1[j] + tx * (row_2[j] - row_1[j])
+        f_y2 = row_1[j + 1] + tx * (row_2[j + 1] - row_1[j + 1])
+
+        return f_y1 + ty * (f_y2 - f_y1)
+
+    def gradient(self, throttle: float, rpm: float) -> tuple[float, float]:
+        """The partial derivatives of the map with respect to the throttle and the RPM.
+
+        The map is piecewise bilinear, so the derivatives are those of the cell used by `_lookup`, and
+        they are zero along a dimension whose input is clamped to the table.
+        """
+
+        x, y, i, j, tx, ty = self._cell(throttle, rpm)
+        row_1 = self._value_list[i]
+        row_2 = self._value_list[i + 1]
+        d_y1 = row_2[j] - row_1[j]
+        d_y2 = row_2[j + 1] - row_1[j + 1]
+        f_y1 = row_1[j] + tx * d_y1
+        f_y2 = row_1[j + 1] + tx * d_y2
+        d_throttle = (d_y1 + ty * (d_y2 - d_y1)) / self._throttle_width_list[i] if x == throttle else 0.0
+        d_rpm = (f_y2 - f_y1) / self._rpm_width_list[j] if y == rpm else 0.0
+
+        return d_throttle, d_rpm
+
+    def lookup_many(self, throttle: ArrayLike, rpm: ArrayLike) -> NDArray[np.float64]:
+        """Evaluate the map for arrays of throttle and RPM values that broadcast together."""
+
+        xs = self._throttle_breakpoints
+        ys = self._rpm_breakpoints
+        x = np.clip(throttle, xs[0], xs[-1])
+        y = np.clip(rpm, ys[0], ys[-1])
+        i = np.minimum(np.searchsorted(xs, x, side="right") - 1, xs.size - 2)
+        j = np.minimum(np.searchsorted(ys, y, side="right") - 1, ys.size - 2)
+        tx = (x - xs[i]) / self._throttle_widths[i]
+        ty = (y - ys[j]) / self._rpm_widths[j]
+        f_y1 = self._values[i, j] + tx * (self._values[i + 1, j] - self._values[i, j])
+        f_y2 = self._values[i, j + 1] + tx * (self._values[i + 1, j + 1] - self._values[i, j + 1])
+
+        return f_y1 + ty * (f_y2 - f_y1)
+
+    def __call__(self, throttle: Union[float, ArrayLike], rpm: Union[float, ArrayLike]) -> Union[float, NDArray]:
+        if isinstance(throttle, float) and isinstance(rpm, float):
+            return self._lookup(throttle, rpm)
+
+        if np.ndim(throttle) == 0 and np.ndim(rpm) == 0:
+            return self._lookup(float(throttle), float(rpm))
+
+        return self.lookup_many(throttle, rpm)
+
+
+ENGINE_TORQUE_MAP = EngineTorqueMap(THROTTLE_BREAKPOINTS, RPM_BREAKPOINTS, ENGINE_TORQUE_TABLE_VALUES)
+
+
 class Engine:
-    def __init__(self, time_step_ms: int, engine_propeller_inertia: float, initial_rpm: float, initial_throttle: float, initial_impeller_torque: float):
+    def __init__(
+        self,
+        time_step_ms: int,
+        engine_propeller_inertia: float,
+        initial_rpm: float,
+        initial_throttle: float,
+        initial_impeller_torque: float,
+        integrator: IntegratorFactory = Dp5Integrator,
+    ):
         self._time_step = time_step_ms / 1000
-        self._integrator = Dp5Integrator(self._time_step)
+        self._integrator = integrator(self._time_step)
+        self._torque_map = ENGINE_TORQUE_MAP
         self._rpm = initial_rpm
         self._inertia = engine_propeller_inertia
         self._last_throttle = initial_throttle
         self._last_impeller_torque = initial_impeller_torque
 
     def engine_impeller_inertia(self, throttle: float, impeller_torque: float, rpm: float) -> float:
-        interpolator = interpolate.RectBivariateSpline(
-            THROTTLE_BREAKPOINTS,
-            RPM_BREAKPOINTS,
-            ENGINE_TORQUE_TABLE_VALUES,
-            kx=1,
-            ky=1
-        )
-        engine_torque = interpolator(throttle, rpm)
-        engine_impeller_inertia = (engine_torque.item() - impeller_torque) / self._inertia
+        engine_torque = self._torque_map(throttle, rpm)
+        engine_impeller_inertia = (engine_torque - impeller_torque) / self._inertia
 
         return engine_impeller_inertia
 
@@ -65,28 +170,47 @@ class Engine:
         """
         assert 0 <= throttle <= 100
 
-        throttle_interpolator = interpolate.interp1d(
-            x=(0, self._time_step),
-            y=(self._last_throttle, throttle),
-            kind="slinear",
-        )
-        torque_interpolator = interpolate.interp1d(
-            x=(0, self._time_step),
-            y=(self._last_impeller_torque, impeller_torque),
-            kind="slinear",
-        )
+        last_throttle = self._last_throttle
+        last_impeller_torque = self._last_impeller_torque
+        time_step = self._time_step
 
         def integration_fn(t: float, rpm: float) -> float:
+            # Interpolate as a weighted sum so that the inputs at the end of the step exactly equal
+            # the inputs at the start of the next step, which makes the step boundaries continuous
+            fraction = t / time_step
             return self.engine_impeller_inertia(
-                throttle_interpolator(t),
-                torque_interpolator(t),
+                (1 - fraction) * last_throttle + fraction * throttle,
+                (1 - fraction) * last_impeller_torque + fraction * impeller_torque,
                 rpm
             )
 
-        self._rpm = self._integrator.integrate(t0=0, y0=self._rpm, func=integration_fn)
+        self._rpm = self._integrator.integrate(t0=0, y0=self._rpm, func=integration_fn, continuous=True)
         self._last_throttle = throttle
         self._last_impeller_torque = impeller_torque
 
+    def snapshot(self) -> tuple[float, float, float, Any]:
+        """The engine RPM, the throttle and impeller torque of the last step and the integrator state."""
+
+        return self._rpm, self._last_throttle, self._last_impeller_torque, self._integrator.snapshot()
+
+    def reset(
+        self,
+        engine_propeller_inertia: float,
+        initial_rpm: float,
+        initial_throttle: float,
+        initial_impeller_torque: float,
+    ):
+        """Reinitialize the state in place, keeping the time step and the integrator."""
+
+        self._inertia = engine_propeller_inertia
+        self.restore(initial_rpm, initial_throttle, initial_impeller_torque)
+
+    def restore(self, rpm: float, last_throttle: float, last_impeller_torque: float, integrator_state: Any = None):
+        self._integrator.restore(integrator_state)
+        self._rpm = rpm
+        self._last_throttle = last_throttle
+        self._last_impeller_torque = last_impeller_torque
+
     @property
     def rpm(self) -> float:
         return self._rpm
@@ -0,0 +1,99 @@
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Optional
+
+from .integration import FixedStepIntegrator
+
+SUBSYSTEMS = ("engine", "shift_logic", "transmission", "vehicle")
+
+
+@dataclass
+class AutotransStats:
+    """Cumulative counters collected by an instrumented `Autotrans` model.
+
+    Attributes:
+        steps: The number of steps taken while instrumented
+        seconds: Wall time spent in each subsystem
+        rhs_evaluations: Right-hand side evaluations of the engine and vehicle integrators
+        lookups: Calls made to each lookup table
+        up_shifts: The number of gear changes to a higher gear
+        down_shifts: The number of gear changes to a lower gear
+    """
+
+    steps: int = 0
+    seconds: dict[str, float] = field(default_factory=lambda: dict.fromkeys(SUBSYSTEMS, 0.0))
+    rhs_evaluations: dict[str, int] = field(default_factory=lambda: {"engine": 0, "vehicle": 0})
+    lookups: dict[str, int] = field(default_factory=dict)
+    up_shifts: int = 0
+    down_shifts: int = 0
+
+    @property
+    def shift_events(self) -> int:
+        return self.up_shifts + self.down_shifts
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+StatsCallback = Callable[[AutotransStats], None]
+
+
+@dataclass
+class Instrumentation:
+    """Statistics of an instrumented model and the hook used to export them."""
+
+    stats: AutotransStats
+    callback: Optional[StatsCallback] = None
+    callback_every: int = 0
+
+    def step_finished(self):
+        self.stats.steps += 1
+
+        if self.callback is not None and self.callback_every > 0 and self.stats.steps % self.callback_every == 0:
+            self.callback(self.stats)
+
+
+class CountingIntegrator(FixedStepIntegrator):
+    """Integrator wrapper that counts the right-hand side evaluations of another integrator."""
+
+    def __init__(self, integrator: FixedStepIntegrator, stats: AutotransStats, name: str):
+        super().__init__(integrator._step_size)
+        self.integrator = integrator
+        self._stats = stats
+        self._name = name
+
+    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float], continuous: bool = False):
+        counts = self._stats.rhs_evaluations
+        name = self._name
+
+        def counted_fn(t: float, y: float) -> float:
+            counts[name] += 1
+            return func(t, y)
+
+        return self.integrator.integrate(t0, y0, counted_fn, continuous)
+
+    def reset(self):
+        self.integrator.reset()
+
+    def snapshot(self) -> Any:
+        return self.integrator.snapshot()
+
+    def restore(self, state: Any):
+        self.integrator.restore(state)
+
+
+class CountingLookup:
+    """Lookup table wrapper that counts the calls made to another table."""
+
+    def __init__(self, table: Any, stats: AutotransStats, name: str):
+        self.table = table
+        self._stats = stats
+        self._name = name
+        stats.lookups.setdefault(name, 0)
+
+    def __call__(self, *args):
+        self._stats.lookups[self._name] += 1
+        return self.table(*args)
+
+    def lookup(self, *args):
+        self._stats.lookups[self._name] += 1
+        return self.table.lookup(*args)
@@ -1,47 +1,237 @@
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from typing import Callable
+from typing import Any, Callable, Optional
 
 import numpy as np
 
+from .runge_kutta import BOGACKI_SHAMPINE, DORMAND_PRINCE, EULER, RK4, ButcherTableau, runge_kutta_step
+
 
 class FixedStepIntegrator(ABC):
     def __init__(self, step_size: float):
         self._step_size = step_size
 
     @abstractmethod
-    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float]):
+    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float], continuous: bool = False):
+        """Integrate the function over one step.
+
+        Args:
+            t0: The time at the start of the step
+            y0: The state at the start of the step
+            func: The derivative of the state
+            continuous: Whether `func(t0, y)` equals the function of the previous call evaluated at the
+                end of its step, which lets integrators reuse work from the previous step
+
+        Returns:
+            The state at the end of the step
+        """
+
         ...
 
+    def reset(self):
+        """Discard any information kept from previous steps."""
+
+    def snapshot(self) -> Any:
+        """The information kept from previous steps, or None if the integrator keeps none."""
+
+        return None
+
+    def restore(self, state: Any):
+        """Reinstate the information returned by `snapshot`, discarding it if the state is None."""
+
+        self.reset()
 
-class EulerIntegrator(FixedStepIntegrator):
-    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float]):
+
+IntegratorFactory = Callable[[float], FixedStepIntegrator]
+
+
+class RungeKuttaIntegrator(FixedStepIntegrator):
+    """Fixed-step explicit Runge-Kutta integrator defined by a Butcher tableau.
+
+    When the tableau evaluates its last stage at the solution (first same as last), the stage is
+    kept and used as the first stage of the next step if that step is continuous and starts from
+    the same state, which saves one function evaluation per step.
+    """
+
+    TABLEAU: ButcherTableau
+
+    def __init__(self, step_size: float):
+        super().__init__(step_size)
+        self._fsal: Optional[tuple[float, float]] = None
+
+    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float], continuous: bool = False):
+        fsal = self._fsal
+        k1 = fsal[1] if continuous and fsal is not None and fsal[0] == y0 else None
+        step = runge_kutta_step(self.TABLEAU, self._step_size, t0, y0, func, k1)
+        self._fsal = None if step.fsal_stage is None else (step.y, step.fsal_stage)
+
+        return step.y
+
+    def reset(self):
+        self._fsal = None
+
+    def snapshot(self) -> Optional[tuple[float, float]]:
+        return self._fsal
+
+    def restore(self, state: Optional[tuple[float, float]]):
+        self._fsal = state
+
+
+class EulerIntegrator(RungeKuttaIntegrator):
+    TABLEAU = EULER
+
+    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float], continuous: bool = False):
+        # The single stage is never reusable, so the step is taken without the generic tableau machinery
         return y0 + self._step_size * func(t0, y0)
 
 
-class Dp5Integrator(FixedStepIntegrator):
-    TABLEAU = [
-        [],
-        [1/5],
-        [3/40, 9/40],
-        [44/45, -56/15, 32/9],
-        [19372/6561, -25360/2187, 64448/6561, -212/729],
-        [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
-        [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
-    ]
-
-    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float]):
-        def _dot(v1: Sequence[float], v2: Sequence[float]) -> float:
-            return np.dot(v1, v2).item()
-
-        k1 = self._step_size * func(t0, y0)
-        k2 = self._step_size * func(t0 + self._step_size * 1 / 5, y0 + _dot([k1], self.TABLEAU[1]))
-        k3 = self._step_size * func(t0 + self._step_size * 3 / 10, y0 + _dot([k1, k2], self.TABLEAU[2]))
-        k4 = self._step_size * func(t0 + self._step_size * 4 / 5, y0 + _dot([k1, k2, k3], self.TABLEAU[3]))
-        k5 = self._step_size * func(t0 + self._step_size * 8 / 9, y0 + _dot([k1, k2, k3, k4], self.TABLEAU[4]))
-        k6 = self._step_size * func(t0 + self._step_size, y0 + _dot([k1, k2, k3, k4, k5], self.TABLEAU[5]))
-        k7 = self._step_size * func(t0 + self._step_size, y0 + _dot([k1, k2, k3, k4, k5, k6], self.TABLEAU[6]))
-        k = [k1, k2, k3, k4, k5, k6, k7]
-        b = [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0]  # 5-th order accurate solution
-
-        return y0 + _dot(k, b)
+class Rk4Integrator(RungeKuttaIntegrator):
+    TABLEAU = RK4
+
+
+class BogackiShampineIntegrator(RungeKuttaIntegrator):
+    TABLEAU = BOGACKI_SHAMPINE
+
+
+class Dp5Integrator(RungeKuttaIntegrator):
+    TABLEAU = DORMAND_PRINCE
+
+
+class AdaptiveRungeKuttaIntegrator(FixedStepIntegrator):
+    """Runge-Kutta integrator that controls its error with the embedded solution of the tableau.
+
+    Each call still integrates exactly one step of the model, but the step is covered by as many
+    internal substeps as are required to keep the local error estimate within the tolerances. The
+    last accepted substep length is kept between calls, so smooth stretches of a simulation settle
+    on a single substep per call while transients are refined automatically. The model inputs are
+    only continuous within a step, so substeps never cross the end of the step.
+
+    The integrator bounds the error and never evaluates the function less often than the fixed-step
+    integrator of the same tableau. It does not save evaluations: in `Autotrans` the impeller torque
+    that drives the engine is computed from the engine speed at every step, so the engine inputs
+    of later steps are not known in advance, not even when the throttle is. Engine rates above one
+    in `RateParameters` integrate over several steps instead.
+
+    Args:
+        step_size: The length of each step
+        rtol: The relative error tolerance of each substep
+        atol: The absolute error tolerance of each substep
+        max_substeps: The maximum number of accepted and rejected substeps per step
+    """
+
+    TABLEAU: ButcherTableau
+    SAFETY = 0.9
+    MIN_FACTOR = 0.2
+    MAX_FACTOR = 5.0
+
+    def __init__(self, step_size: float, rtol: float = 1e-6, atol: float = 1e-6, max_substeps: int = 10_000):
+        assert rtol > 0 or atol > 0
+        assert self.TABLEAU.b_error is not None and self.TABLEAU.fsal
+        super().__init__(step_size)
+        self._rtol = rtol
+        self._atol = atol
+        self._max_substeps = max_substeps
+        self._exponent = -1 / (self.TABLEAU.error_order + 1)
+        self._substep_size = step_size
+        self._fsal: Optional[tuple[float, float]] = None
+        self.substeps = 0
+        self.rejected = 0
+
+    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float], continuous: bool = False):
+        t_end = t0 + self._step_size
+        t = t0
+        y = y0
+        h = min(self._substep_size, self._step_size)
+        fsal = self._fsal
+        k1 = fsal[1] if continuous and fsal is not None and fsal[0] == y0 else func(t, y)
+
+        for _ in range(self._max_substeps):
+            remaining = t_end - t
+            last = h >= remaining * (1 - 1e-12)
+            h_used = remaining if last else h
+            step = runge_kutta_step(self.TABLEAU, h_used, t, y, func, k1, t1=t_end if last else None)
+            scale = self._atol + self._rtol * max(abs(y), abs(step.y))
+            error_ratio = abs(step.error) / scale
+
+            if error_ratio == 0:
+                factor = self.MAX_FACTOR
+            else:
+                factor = min(self.MAX_FACTOR, max(self.MIN_FACTOR, self.SAFETY * error_ratio ** self._exponent))
+
+            if error_ratio <= 1:
+                self.substeps += 1
+                t = t_end if last else t + h_used
+                y = step.y
+                k1 = step.fsal_stage
+
+                if last:
+                    # Keep the proposal of untruncated substeps only, a short final substep says nothing about the solution
+                    self._substep_size = h_used * factor if h_used == h else max(h, h_used * factor)
+                    self._fsal = (y, k1)
+                    return y
+
+                h = h_used * factor
+            else:
+                self.rejected += 1
+                h = h_used * min(1.0, factor)
+
+        raise RuntimeError(f"Step did not converge within {self._max_substeps} substeps")
+
+    def reset(self):
+        # The substep size proposal depends on the previous solution as well, so it starts over too
+        self._substep_size = self._step_size
+        self._fsal = None
+
+    def snapshot(self) -> tuple[float, Optional[tuple[float, float]]]:
+        return self._substep_size, self._fsal
+
+    def restore(self, state: Optional[tuple[float, Optional[tuple[float, float]]]]):
+        if state is None:
+            self.reset()
+        else:
+            self._substep_size, self._fsal = state
+
+
+class AdaptiveDp5Integrator(AdaptiveRungeKuttaIntegrator):
+    """Dormand-Prince 5(4) integrator with embedded error control, see `AdaptiveRungeKuttaIntegrator`."""
+
+    TABLEAU = DORMAND_PRINCE
+
+
+class ZeroOrderHoldIntegrator(EulerIntegrator):
+    """Exact integrator for a right-hand side that is held constant over the step.
+
+    The right-hand side is evaluated once at the start of the step, which is the Euler update and is
+    exact for models whose inputs are sampled with a zero-order hold.
+    """
+
+
+class SolveIvpIntegrator(FixedStepIntegrator):
+    """Integrate each step with `scipy.integrate.solve_ivp`, intended for validating other integrators.
+
+    SciPy is only imported when this integrator is constructed, so it is not loaded by the default
+    integrators.
+
+    Args:
+        step_size: The length of each step
+        method: The integration method used by solve_ivp
+        **options: Additional options passed to solve_ivp, such as rtol and atol
+    """
+
+    def __init__(self, step_size: float, method: str = "RK45", **options):
+        from scipy.integrate import solve_ivp
+
+        super().__init__(step_size)
+        self._solve_ivp = solve_ivp
+        self._method = method
+        self._options = options
+
+    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float], continuous: bool = False):
+        result = self._solve_ivp(
+            fun=lambda t, y: func(t, y.item()),
+            t_span=(t0, t0 + self._step_size),
+            y0=np.array([y0], dtype=np.float64),
+            method=self._method,
+            **self._options,
+        )
+
+        return result.y[-1, -1]
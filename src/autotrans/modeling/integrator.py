@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import Callable, Optional, TypeAlias
 
-import numpy as np
+from autotrans.integration import (
+    AdaptiveDp5Integrator,
+    BogackiShampineIntegrator,
+    Dp5Integrator,
+    EulerIntegrator,
+    FixedStepIntegrator,
+    Rk4Integrator,
+)
 
 FirstOrderOde = Callable[[float, float], float]
 
@@ -10,51 +17,52 @@ class Solver(ABC):
     """Generic interface for an ODE solver"""
 
     @abstractmethod
-    def step(self, func: FirstOrderOde, time: float, state: float) -> tuple[float, float]:
+    def step(self, func: FirstOrderOde, time: float, state: float, continuous: bool = False) -> tuple[float, float]:
         ...
 
 
-class EulerSolver(Solver):
-    def __init__(self, step_size: float):
+class RungeKuttaSolver(Solver):
+    """Solver that advances the time and takes each step with an integrator from `autotrans.integration`.
+
+    The step itself is computed by the integrator, so the solvers follow the same rules, including
+    the reuse of the last stage of first-same-as-last tableaux, which only happens when the caller
+    declares the step `continuous` with the previous one. Any keyword options are passed on to the
+    integrator.
+    """
+
+    INTEGRATOR: type[FixedStepIntegrator]
+
+    def __init__(self, step_size: float, **options):
         self.h = step_size
+        self._integrator = self.INTEGRATOR(step_size, **options)
 
-    def step(self, func: FirstOrderOde, time: float, state: float) -> tuple[float, float]:
-        new_state = state + self.h * func(time, state)
-        new_time = time + self.h
+    def step(self, func: FirstOrderOde, time: float, state: float, continuous: bool = False) -> tuple[float, float]:
+        return time + self.h, self._integrator.integrate(time, state, func, continuous)
 
-        return new_time, new_state
 
+class EulerSolver(RungeKuttaSolver):
+    INTEGRATOR = EulerIntegrator
 
-class DormundPrince5Solver(Solver):
-    TABLEAU = [
-        [],
-        [1/5],
-        [3/40, 9/40],
-        [44/45, -56/15, 32/9],
-        [19372/6561, -25360/2187, 64448/6561, -212/729],
-        [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
-        [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
-    ]
 
-    def __init__(self, step_size):
-        self.h = step_size
+class Rk4Solver(RungeKuttaSolver):
+    INTEGRATOR = Rk4Integrator
+
+
+class BogackiShampineSolver(RungeKuttaSolver):
+    INTEGRATOR = BogackiShampineIntegrator
 
-    def step(self, func: FirstOrderOde, time: float, state: float) -> tuple[float, float]:
-        k1 = func(time, state)
-        k2 = func(time + self.h * 1 / 5, state + self.h * np.dot([k1], self.TABLEAU[1]))
-        k3 = func(time + self.h * 3 / 10, state + self.h * np.dot(np.hstack([k1, k2]), self.TABLEAU[2]))
-        k4 = func(time + self.h * 4 / 5, state + self.h * np.dot(np.hstack([k1, k2, k3]), self.TABLEAU[3]))
-        k5 = func(time + self.h * 8 / 9, state + self.h * np.dot(np.hstack([k1, k2, k3, k4]), self.TABLEAU[4]))
-        k6 = func(time + self.h * 1, state + self.h * np.dot(np.hstack([k1, k2, k3, k4, k5]), self.TABLEAU[5]))
-        k7 = func(time + self.h * 1, state + self.h * np.dot(np.hstack([k1, k2, k3, k4, k5, k6]), self.TABLEAU[6]))
 
-        k = np.array([k1, k2, k3, k4, k5, k6, k7])
-        b = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])  # 5-th order accurate solution
-        # b = np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])  # 4-th order accurate solution
-        new_state = state + self.h * b.dot(k)
-        new_time = time + self.h
+class DormundPrince5Solver(RungeKuttaSolver):
+    INTEGRATOR = Dp5Integrator
 
-        return new_time, new_state[0]
+
+class AdaptiveDormundPrince5Solver(RungeKuttaSolver):
+    """Dormand-Prince 5(4) solver that covers each step with error-controlled substeps.
+
+    Accepts the `rtol`, `atol` and `max_substeps` options of `AdaptiveDp5Integrator`.
+    """
+
+    INTEGRATOR = AdaptiveDp5Integrator
 
 
 SaturationLimits: TypeAlias = tuple[Optional[float], Optional[float]]
@@ -73,8 +81,16 @@ class Integrator:
     def state(self):
         return self._state
 
-    def integrate(self, func: FirstOrderOde):
-        self._time, self._state = self._solver.step(func, self._time, self._state)
+    def integrate(self, func: FirstOrderOde, continuous: bool = False):
+        """Advance the block by one step of the solver.
+
+        Args:
+            func: The derivative of the state
+            continuous: Whether `func` continues the function of the previous call without any change of
+                its inputs, which lets the solver reuse work from the previous step
+        """
+
+        self._time, self._state = self._solver.step(func, self._time, self._state, continuous)
 
         if self._saturation_limits[0] is not None:
             self._state = max(self._state, self._saturation_limits[0])
@@ -1,9 +1,9 @@
+from bisect import bisect_right
 from dataclasses import dataclass
 from typing import TypeVar, Generic
 
 import numpy as np
-import scipy.interpolate as interpolate
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike, NDArray
 
 
 @dataclass
@@ -43,43 +43,31 @@ def _is_monotonic(seq: NDArray) -> bool:
 ValueT = TypeVar("ValueT", bound=np.generic)
 
 
-def _index_bounds(seq: NDArray[ValueT], value: ValueT) -> tuple[int, int]:
-    """Compute the index bounds for a value given the sequence.
+def _cell_index(seq: list[float], value: float) -> int:
+    """Compute the index of the table cell used to interpolate a value.
 
-    The purpose of this function is to produce indices that can be used to index the table of
-    values. This function assumes that the provided sequence is monotonic. Because this sequence is
-    assumed to be monotonic, the upper index can be assumed to be the next index after the last
-    index less than the value.
+    The cell with index i spans the breakpoints seq[i] and seq[i + 1]. This function assumes that
+    the provided sequence is monotonic so the cell can be found with a binary search. Values below
+    the first breakpoint or above the last breakpoint are assigned to the first or last cell so
+    that they are extrapolated linearly from it.
 
-    Example: seq=[1,3,5,7,9], value=4 ==> lower=1, upper=2 because seq[1] <= value <= seq[2]
+    Example: seq=[1,3,5,7,9], value=4 ==> 1 because seq[1] <= value <= seq[2]
 
     Args:
         seq: The sequence to search
-        value: The value to compute the index bounds for
+        value: The value to compute the cell index for
 
     Returns:
-        The indices of the elements in the sequence that bound the value
+        The index of the lower breakpoint of the cell
     """
 
-    lower_indices, = np.where(seq <= value)
-    if lower_indices.size == 0:
-        lower_bound = 0
-    else:
-        lower_bound = lower_indices[-1]
+    return min(max(bisect_right(seq, value) - 1, 0), len(seq) - 2)
 
-    upper_indices, = np.where(seq >= value)
-    if upper_indices.size == 0:
-        upper_bound = seq.size - 1
-    else:
-        upper_bound = upper_indices[0]
 
-    if lower_bound == upper_bound:
-        if upper_bound == seq.size - 1:
-            lower_bound = lower_bound - 1
-        else:
-            upper_bound = upper_bound + 1
+def _cell_indices(seq: NDArray, values: NDArray) -> NDArray[np.intp]:
+    """Vectorized version of `_cell_index` for an array of values."""
 
-    return lower_bound, upper_bound
+    return np.clip(np.searchsorted(seq, values, side="right") - 1, 0, seq.size - 2)
 
 
 Dim1T = TypeVar("Dim1T", bound=np.generic)
@@ -88,19 +76,42 @@ Dim1T = TypeVar("Dim1T", bound=np.generic)
 @dataclass
 class LookupTable1D(Generic[Dim1T]):
     _breakpoints: NDArray[Dim1T]
-    _values: NDArray[np.float]
+    _values: NDArray[np.float64]
+
+    def __post_init__(self):
+        assert _is_monotonic(self._breakpoints)
+        assert self._values.shape == self._breakpoints.shape
+
+        self._breakpoint_array = np.asarray(self._breakpoints, dtype=np.float64)
+        self._value_array = np.asarray(self._values, dtype=np.float64)
+        self._slope_array = np.diff(self._value_array) / np.diff(self._breakpoint_array)
+        self._breakpoint_list = self._breakpoint_array.tolist()
+        self._value_list = self._value_array.tolist()
+        self._slope_list = self._slope_array.tolist()
+        self._last_cell = self._breakpoint_array.size - 2
 
     def lookup(self, x: ValueT) -> float:
-        x_lower_index, x_upper_index = _index_bounds(self._breakpoints, x)
-        interpolator = interpolate.interp1d(
-            x=[self._breakpoints[x_lower_index], self._breakpoints[x_upper_index]],
-            y=[self._values[x_lower_index], self._values[x_upper_index]],
-            kind="linear",
-            fill_value="extrapolate"
-        )
-        result = interpolator(x)
+        x = float(x)
+        index = min(max(bisect_right(self._breakpoint_list, x) - 1, 0), self._last_cell)
+
+        return self._value_list[index] + self._slope_list[index] * (x - self._breakpoint_list[index])
+
+    def lookup_with_slope(self, x: ValueT) -> tuple[float, float]:
+        """Look up a value along with the slope of the cell it is interpolated from."""
+
+        x = float(x)
+        index = min(max(bisect_right(self._breakpoint_list, x) - 1, 0), self._last_cell)
+        slope = self._slope_list[index]
+
+        return self._value_list[index] + slope * (x - self._breakpoint_list[index]), slope
+
+    def lookup_many(self, x: ArrayLike) -> NDArray[np.float64]:
+        """Look up an array of values with a single set of NumPy operations."""
+
+        x = np.asarray(x, dtype=np.float64)
+        index = _cell_indices(self._breakpoint_array, x)
 
-        return result.item()
+        return self._value_array[index] + self._slope_array[index] * (x - self._breakpoint_array[index])
 
 
 Dim2T = TypeVar("Dim2T", bound=np.generic)
@@ -110,34 +121,46 @@ Dim2T = TypeVar("Dim2T", bound=np.generic)
 class LookupTable2D(Generic[Dim1T, Dim2T]):
     _x1_breakpoints: NDArray[Dim1T]
     _x2_breakpoints: NDArray[Dim2T]
-    _values: NDArray[np.float]
+    _values: NDArray[np.float64]
 
     def __post_init__(self):
         assert _is_monotonic(self._x1_breakpoints)
         assert _is_monotonic(self._x2_breakpoints)
         assert self._values.shape == (self._x1_breakpoints.size, self._x2_breakpoints.size)
 
-    def lookup(self, x1: Dim1T, x2: Dim2T):
-        x1_lower_index, x1_upper_index = _index_bounds(self._x1_breakpoints, x1)
-        x2_lower_index, x2_upper_index = _index_bounds(self._x2_breakpoints, x2)
-
-        x1_1 = self._x1_breakpoints[x1_lower_index]
-        x1_2 = self._x1_breakpoints[x1_upper_index]
-        x2_1 = self._x2_breakpoints[x2_lower_index]
-        x2_2 = self._x2_breakpoints[x2_upper_index]
-
-        interpolator = interpolate.interp2d(
-            x=[x1_1, x1_1, x1_2, x1_2],
-            y=[x2_1, x2_2, x2_1, x2_2],
-            z=[
-                self._values[x1_lower_index, x2_lower_index],
-                self._values[x1_lower_index, x2_upper_index],
-                self._values[x1_upper_index, x2_lower_index],
-                self._values[x1_upper_index, x2_upper_index],
-            ],
-            kind="linear",
-            fill_value="extrapolate",
-        )
-        result = interpolator(x1, x2)
-
-        return result[0]
+        self._x1_array = np.asarray(self._x1_breakpoints, dtype=np.float64)
+        self._x2_array = np.asarray(self._x2_breakpoints, dtype=np.float64)
+        self._value_array = np.asarray(self._values, dtype=np.float64)
+        self._x1_slope_array = np.diff(self._value_array, axis=0) / np.diff(self._x1_array)[:, np.newaxis]
+        self._x2_width_array = np.diff(self._x2_array)
+        self._x1_list = self._x1_array.tolist()
+        self._x2_list = self._x2_array.tolist()
+        self._value_list = self._value_array.tolist()
+        self._x1_slope_list = self._x1_slope_array.tolist()
+        self._x2_width_list = self._x2_width_array.tolist()
+
+    def lookup(self, x1: Dim1T, x2: Dim2T) -> float:
+        x1 = float(x1)
+        x2 = float(x2)
+        i = _cell_index(self._x1_list, x1)
+        j = _cell_index(self._x2_list, x2)
+        dx1 = x1 - self._x1_list[i]
+        values = self._value_list[i]
+        slopes = self._x1_slope_list[i]
+        f_x2_1 = values[j] + slopes[j] * dx1
+        f_x2_2 = values[j + 1] + slopes[j + 1] * dx1
+
+        return f_x2_1 + (x2 - self._x2_list[j]) / self._x2_width_list[j] * (f_x2_2 - f_x2_1)
+
+    def lookup_many(self, x1: ArrayLike, x2: ArrayLike) -> NDArray[np.float64]:
+        """Look up arrays of values that broadcast together with a single set of NumPy operations."""
+
+        x1 = np.asarray(x1, dtype=np.float64)
+        x2 = np.asarray(x2, dtype=np.float64)
+        i = _cell_indices(self._x1_array, x1)
+        j = _cell_indices(self._x2_array, x2)
+        dx1 = x1 - self._x1_array[i]
+        f_x2_1 = self._value_array[i, j] + self._x1_slope_array[i, j] * dx1
+        f_x2_2 = self._value_array[i, j + 1] + self._x1_slope_array[i, j + 1] * dx1
+
+        return f_x2_1 + (x2 - self._x2_array[j]) / self._x2_width_array[j] * (f_x2_2 - f_x2_1)
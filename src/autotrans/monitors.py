@@ -0,0 +1,267 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Literal, Optional, Union
+
+from .autotrans import AutotransState
+
+Sample = tuple[int, float]
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """Comparison of a field of `AutotransState` with a threshold, such as vehicle_speed < 120.
+
+    The robustness of the predicate is the signed distance of the field from the threshold, which
+    is positive when the comparison holds.
+    """
+
+    field: str
+    comparison: Literal["<", ">"]
+    threshold: float
+
+    def __post_init__(self):
+        assert self.comparison in ("<", ">")
+        assert self.field in AutotransState.__dataclass_fields__
+
+    def robustness(self, state: AutotransState) -> float:
+        value = float(getattr(state, self.field))
+        return self.threshold - value if self.comparison == "<" else value - self.threshold
+
+
+@dataclass(frozen=True)
+class Always:
+    """The formula holds at every time in the interval [start_ms, end_ms] relative to now.
+
+    An end of None extends the interval to the end of the simulation.
+    """
+
+    formula: "Formula"
+    start_ms: int = 0
+    end_ms: Optional[int] = None
+
+    def __post_init__(self):
+        assert 0 <= self.start_ms
+        assert self.end_ms is None or self.start_ms <= self.end_ms
+
+
+@dataclass(frozen=True)
+class Eventually:
+    """The formula holds at some time in the interval [start_ms, end_ms] relative to now.
+
+    An end of None extends the interval to the end of the simulation.
+    """
+
+    formula: "Formula"
+    start_ms: int = 0
+    end_ms: Optional[int] = None
+
+    def __post_init__(self):
+        assert 0 <= self.start_ms
+        assert self.end_ms is None or self.start_ms <= self.end_ms
+
+
+Formula = Union[Predicate, Always, Eventually]
+
+
+class _Evaluator(ABC):
+    """Incremental evaluation of the robustness of a formula at every sample time."""
+
+    @abstractmethod
+    def push(self, time_ms: int, state: AutotransState) -> list[Sample]:
+        """Add a state and return the robustness of the sample times that became known."""
+
+        ...
+
+    @abstractmethod
+    def finish(self) -> list[Sample]:
+        """Return the robustness of the remaining sample times using the states seen so far."""
+
+        ...
+
+
+class _PredicateEvaluator(_Evaluator):
+    def __init__(self, predicate: Predicate):
+        self._predicate = predicate
+
+    def push(self, time_ms: int, state: AutotransState) -> list[Sample]:
+        return [(time_ms, self._predicate.robustness(state))]
+
+    def finish(self) -> list[Sample]:
+        return []
+
+
+class _WindowEvaluator(_Evaluator):
+    """Robustness of a temporal operator computed with a sliding window minimum or maximum.
+
+    The window of every sample time moves forward monotonically, so the extremum of the window is
+    kept in a monotonic deque and every child sample is added and removed at most once.
+    """
+
+    def __init__(self, formula: Union[Always, Eventually]):
+        self._child = _evaluator(formula.formula)
+        self._start = formula.start_ms
+        self._end = formula.end_ms
+        self._sign = 1.0 if isinstance(formula, Always) else -1.0
+        self._pending: deque[int] = deque()
+        self._unused: deque[Sample] = deque()
+        self._window: deque[Sample] = deque()
+        self._latest: Optional[int] = None
+
+    def _emit(self, complete: bool) -> list[Sample]:
+        outputs = []
+
+        while self._pending:
+            time_ms = self._pending[0]
+
+            if not complete and (self._end is None or self._latest is None or self._latest < time_ms + self._end):
+                break
+
+            while self._unused and (self._end is None or self._unused[0][0] <= time_ms + self._end):
+                sample = self._unused.popleft()
+                value = self._sign * sample[1]
+
+                while self._window and self._sign * self._window[-1][1] >= value:
+                    self._window.pop()
+
+                self._window.append(sample)
+
+            while self._window and self._window[0][0] < time_ms + self._start:
+                self._window.popleft()
+
+            self._pending.popleft()
+            # An empty window at the end of a finite trace has no witness, like min or max over nothing
+            outputs.append((time_ms, self._window[0][1] if self._window else self._sign * float("inf")))
+
+        return outputs
+
+    def _add(self, samples: list[Sample]):
+        for time_ms, value in samples:
+            self._pending.append(time_ms)
+            self._unused.append((time_ms, value))
+            self._latest = time_ms
+
+    def push(self, time_ms: int, state: AutotransState) -> list[Sample]:
+        self._add(self._child.push(time_ms, state))
+        return self._emit(complete=False)
+
+    def finish(self) -> list[Sample]:
+        self._add(self._child.finish())
+        return self._emit(complete=True)
+
+
+def _evaluator(formula: Formula) -> _Evaluator:
+    if isinstance(formula, Predicate):
+        return _PredicateEvaluator(formula)
+
+    return _WindowEvaluator(formula)
+
+
+@dataclass(frozen=True)
+class MonitorResult:
+    """Outcome of monitoring a simulation.
+
+    Attributes:
+        verdict: Whether the formula is satisfied, which is the case when its robustness is positive
+        robustness: The robustness of the formula at time 0 over the simulated states. When the run
+            stopped early this is the value over the simulated prefix, which has the same sign as
+            the robustness of the full run
+        stop_step: The index of the state at which the verdict was fixed and the run stopped, or
+            None if the whole input was simulated
+    """
+
+    verdict: bool
+    robustness: float
+    stop_step: Optional[int]
+
+
+class Monitor:
+    """Online monitor of a formula at time 0 that detects when its verdict can no longer change.
+
+    For a top-level `Always` the verdict is fixed as soon as any state in its interval violates the
+    inner formula, and for a top-level `Eventually` as soon as any state satisfies it. Both are also
+    fixed once their interval has been observed completely. Nested operators are evaluated
+    incrementally over sliding windows, so the monitor keeps only the states inside the windows.
+
+    Args:
+        formula: The formula to monitor
+        stop_early: Whether `simulate` stops once the verdict is fixed
+    """
+
+    def __init__(self, formula: Formula, stop_early: bool = True):
+        self.formula = formula
+        self.stop_early = stop_early
+        self.reset()
+
+    def reset(self):
+        if isinstance(self.formula, Predicate):
+            self._child = _evaluator(self.formula)
+            self._sign = 1.0
+            self._start, self._end = 0, 0
+        else:
+            self._child = _evaluator(self.formula.formula)
+            self._sign = 1.0 if isinstance(self.formula, Always) else -1.0
+            self._start, self._end = self.formula.start_ms, self.formula.end_ms
+
+        self._robustness = self._sign * float("inf")
+        self._origin: Optional[int] = None
+        self._steps = 0
+        self._decided_at: Optional[int] = None
+        self._result: Optional[MonitorResult] = None
+
+    def _observe(self, samples: list[Sample]):
+        for time_ms, value in samples:
+            if time_ms >= self._start and (self._end is None or time_ms <= self._end):
+                self._robustness = min(self._robustness, value) if self._sign > 0 else max(self._robustness, value)
+
+            window_done = self._end is not None and time_ms >= self._end
+            witness = self._robustness <= 0 if self._sign > 0 else self._robustness > 0
+
+            if self._decided_at is None and (witness or window_done):
+                self._decided_at = self._steps
+
+    def update(self, time_ms: int, state: AutotransState) -> bool:
+        """Observe the next state.
+
+        The intervals of the formula are relative to the time of the first observed state.
+
+        Args:
+            time_ms: The time of the state
+            state: The state of the model
+
+        Returns:
+            Whether the verdict is fixed
+        """
+
+        if self._origin is None:
+            self._origin = time_ms
+
+        self._observe(self._child.push(time_ms - self._origin, state))
+        self._steps += 1
+
+        return self._decided_at is not None
+
+    @property
+    def decided(self) -> bool:
+        return self._decided_at is not None
+
+    def finish(self, stopped: bool) -> MonitorResult:
+        """Complete the evaluation after the last observed state and store the result.
+
+        Args:
+            stopped: Whether the simulation was stopped before the end of its input
+        """
+
+        if not stopped:
+            self._observe(self._child.finish())
+
+        stop_step = self._steps - 1 if stopped else None
+        self._result = MonitorResult(self._robustness > 0, self._robustness, stop_step)
+
+        return self._result
+
+    @property
+    def result(self) -> Optional[MonitorResult]:
+        """The result of the last monitored simulation."""
+
+        return self._result
@@ -0,0 +1,248 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections.abc import Sequence
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Optional, Union, overload
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .autotrans import AutotransParameters, STATE_COLUMNS, TRAJECTORY_DTYPE
+from .batch import BatchAutotrans, BatchTrajectory, _simulate_into, scenario_parameters
+
+if TYPE_CHECKING:
+    from .sinks import TrajectorySink
+
+
+@dataclass(frozen=True)
+class _SharedArray:
+    """Description of an array stored in a shared memory block, small enough to send to workers."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def create(cls, shape: tuple[int, ...], dtype: np.dtype) -> tuple["_SharedArray", shared_memory.SharedMemory]:
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        block = shared_memory.SharedMemory(create=True, size=size)
+
+        return cls(block.name, shape, np.dtype(dtype).str), block
+
+    def attach(self) -> shared_memory.SharedMemory:
+        return shared_memory.SharedMemory(name=self.name)
+
+    def view(self, block: shared_memory.SharedMemory) -> NDArray:
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=block.buf)
+
+
+def _simulate_rows(
+    parameters: Union[AutotransParameters, Sequence[AutotransParameters]],
+    inputs: dict[str, _SharedArray],
+    outputs: dict[str, _SharedArray],
+    start: int,
+    stop: int,
+    output_offset: int = 0,
+):
+    """Simulate the scenarios in rows [start, stop) of the shared inputs into the shared outputs.
+
+    The outputs may only hold some of the scenarios, their first row is scenario `output_offset`.
+    """
+
+    blocks = {name: shared.attach() for name, shared in {**inputs, **outputs}.items()}
+
+    try:
+        _simulate_into(
+            BatchAutotrans(parameters, stop - start),
+            inputs["throttle"].view(blocks["throttle"])[start:stop],
+            inputs["brake"].view(blocks["brake"])[start:stop],
+            {
+                name: shared.view(blocks[name])[start - output_offset:stop - output_offset]
+                for name, shared in outputs.items()
+            },
+        )
+    finally:
+        for block in blocks.values():
+            block.close()
+
+
+@overload
+def simulate_many(
+    throttle: ArrayLike,
+    brake: ArrayLike,
+    parameters: Union[AutotransParameters, Sequence[AutotransParameters]],
+    workers: Optional[int] = ...,
+    chunk_size: Optional[int] = ...,
+    sink: None = ...,
+) -> BatchTrajectory:
+    ...
+
+
+@overload
+def simulate_many(
+    throttle: ArrayLike,
+    brake: ArrayLike,
+    parameters: Union[AutotransParameters, Sequence[AutotransParameters]],
+    workers: Optional[int] = ...,
+    chunk_size: Optional[int] = ...,
+    *,
+    sink: "TrajectorySink",
+) -> None:
+    ...
+
+
+def simulate_many(
+    throttle: ArrayLike,
+    brake: ArrayLike,
+    parameters: Union[AutotransParameters, Sequence[AutotransParameters]],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    sink: Optional["TrajectorySink"] = None,
+) -> Optional[BatchTrajectory]:
+    """Simulate N scenarios of T ticks using a pool of worker processes.
+
+    The scenarios are split into chunks of rows that are simulated by the vectorized model in the
+    workers. The inputs and outputs are stored in shared memory, so only the parameters and the
+    names of the shared memory blocks are sent to the workers. Every scenario is simulated
+    independently, so the results do not depend on the number of workers or the chunk size.
+
+    Args:
+        throttle: Throttle signals with the shape (N, T)
+        brake: Brake signals with the shape (N, T)
+        parameters: The model parameters shared by all scenarios, or the parameters of each scenario
+        workers: The number of worker processes, defaults to the number of CPUs
+        chunk_size: The number of scenarios simulated by each task, defaults to four tasks per worker
+        sink: Write the trajectories of every task into this sink as soon as the task completes
+            instead of returning them. At most one task per worker is in flight, so only the outputs
+            of those tasks are held in memory
+
+    Returns:
+        The trajectories of all scenarios in input order, or None when a sink is given
+    """
+
+    throttle = np.asarray(throttle, dtype=np.float64)
+    brake = np.asarray(brake, dtype=np.float64)
+
+    assert throttle.ndim == 2
+    assert throttle.shape == brake.shape
+
+    n, steps = throttle.shape
+    shared_parameters = isinstance(parameters, AutotransParameters)
+    step_size_ms = parameters.step_size_ms if shared_parameters else parameters[0].step_size_ms
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(-(-n // (workers * 4)), 1)
+    blocks: list[shared_memory.SharedMemory] = []
+
+    def share(array_shape: tuple[int, ...], dtype: np.dtype) -> _SharedArray:
+        shared, block = _SharedArray.create(array_shape, dtype)
+        blocks.append(block)
+        return shared
+
+    try:
+        inputs = {"throttle": share(throttle.shape, throttle.dtype), "brake": share(brake.shape, brake.dtype)}
+        np.copyto(inputs["throttle"].view(blocks[0]), throttle)
+        np.copyto(inputs["brake"].view(blocks[1]), brake)
+
+        if sink is not None:
+            _simulate_tasks_to_sink(inputs, parameters, n, steps, step_size_ms, workers, chunk_size, sink)
+            return None
+
+        outputs = {name: share((n, steps), TRAJECTORY_DTYPE[name]) for name in STATE_COLUMNS}
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _simulate_rows,
+                    parameters if shared_parameters else parameters[start:start + chunk_size],
+                    inputs,
+                    outputs,
+                    start,
+                    min(start + chunk_size, n),
+                )
+                for start in range(0, n, chunk_size)
+            ]
+
+            for future in futures:
+                future.result()
+
+        columns = {name: shared.view(block).copy() for (name, shared), block in zip(outputs.items(), blocks[2:])}
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    time_ms = np.arange(steps, dtype=np.int64) * step_size_ms
+
+    return BatchTrajectory(time_ms=time_ms, **columns)
+
+
+def _simulate_tasks_to_sink(
+    inputs: dict[str, _SharedArray],
+    parameters: Union[AutotransParameters, Sequence[AutotransParameters]],
+    n: int,
+    steps: int,
+    step_size_ms: int,
+    workers: int,
+    chunk_size: int,
+    sink: "TrajectorySink",
+):
+    """Simulate the tasks with their own output blocks and write each one into the sink when it completes."""
+
+    time_ms = np.arange(steps, dtype=np.int64) * step_size_ms
+    shared_parameters = isinstance(parameters, AutotransParameters)
+    pending: deque[tuple[int, Future, dict[str, _SharedArray], list[shared_memory.SharedMemory]]] = deque()
+
+    def release(task_blocks: list[shared_memory.SharedMemory]):
+        for block in task_blocks:
+            block.close()
+            block.unlink()
+
+    def complete():
+        start, future, outputs, task_blocks = pending.popleft()
+
+        try:
+            future.result()
+            sink.write(start, 0, time_ms, {
+                name: shared.view(block) for (name, shared), block in zip(outputs.items(), task_blocks)
+            })
+        finally:
+            release(task_blocks)
+
+    sink.open(scenario_parameters(parameters, n), steps)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for start in range(0, n, chunk_size):
+                stop = min(start + chunk_size, n)
+                outputs: dict[str, _SharedArray] = {}
+                task_blocks = []
+
+                for name in STATE_COLUMNS:
+                    outputs[name], block = _SharedArray.create((stop - start, steps), TRAJECTORY_DTYPE[name])
+                    task_blocks.append(block)
+
+                future = executor.submit(
+                    _simulate_rows,
+                    parameters if shared_parameters else parameters[start:stop],
+                    inputs,
+                    outputs,
+                    start,
+                    stop,
+                    start,
+                )
+                pending.append((start, future, outputs, task_blocks))
+
+                if len(pending) >= workers:
+                    complete()
+
+            while pending:
+                complete()
+    finally:
+        while pending:
+            _, future, _, task_blocks = pending.popleft()
+            future.cancel()
+            release(task_blocks)
+
+        sink.close()
@@ -0,0 +1,151 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from .autotrans import Autotrans, AutotransParameters, RateParameters
+from .integration import Dp5Integrator, IntegratorFactory, ZeroOrderHoldIntegrator
+
+_GroupKey = tuple[int, RateParameters]
+
+
+def _group_key(parameters: AutotransParameters) -> _GroupKey:
+    return parameters.step_size_ms, parameters.rates
+
+
+@dataclass
+class PoolStats:
+    """Counters of the models handed out by a `ModelPool`.
+
+    Attributes:
+        created: The number of models constructed by the pool
+        reused: The number of acquisitions served by resetting an idle model
+    """
+
+    created: int = 0
+    reused: int = 0
+
+
+class ModelPool:
+    """Thread-safe pool of `Autotrans` models that are reset instead of constructed for every run.
+
+    Idle models are grouped by step size and rates, the only parameters that cannot be changed by
+    `Autotrans.reset`, and an acquired model is always in the initial state of the requested
+    parameters. A model idle under the same parameters is preferred, otherwise the most recently
+    released model of the group is reset to the requested parameters, so acquiring takes constant
+    time however many different parameters have been used.
+
+    Args:
+        max_idle: The maximum number of idle models kept for each step size and rates, the least
+            recently released models are dropped first
+        vehicle_integrator: The vehicle integrator of the constructed models
+        engine_integrator: The engine integrator of the constructed models
+    """
+
+    def __init__(
+        self,
+        max_idle: int = 8,
+        vehicle_integrator: IntegratorFactory = ZeroOrderHoldIntegrator,
+        engine_integrator: IntegratorFactory = Dp5Integrator,
+    ):
+        assert max_idle > 0
+
+        self._max_idle = max_idle
+        self._vehicle_integrator = vehicle_integrator
+        self._engine_integrator = engine_integrator
+        self._lock = threading.Lock()
+        # Idle models by group and then by parameters, ordered from the least to the most recently released
+        self._idle: dict[_GroupKey, OrderedDict[AutotransParameters, list[Autotrans]]] = {}
+        self._idle_counts: dict[_GroupKey, int] = {}
+        self.stats = PoolStats()
+
+    @property
+    def idle(self) -> int:
+        """The number of idle models in the pool."""
+
+        with self._lock:
+            return sum(self._idle_counts.values())
+
+    def _take_idle(self, parameters: AutotransParameters) -> Optional[Autotrans]:
+        key = _group_key(parameters)
+        group = self._idle.get(key)
+
+        if group is None:
+            return None
+
+        if parameters in group:
+            models = group[parameters]
+            model_parameters = parameters
+        else:
+            model_parameters, models = next(reversed(group.items()))
+
+        model = models.pop()
+
+        if not models:
+            del group[model_parameters]
+
+        if group:
+            self._idle_counts[key] -= 1
+        else:
+            del self._idle[key]
+            del self._idle_counts[key]
+
+        return model
+
+    def acquire(self, parameters: AutotransParameters) -> Autotrans:
+        """Take a model in the initial state of the parameters, which must be released after use."""
+
+        with self._lock:
+            model = self._take_idle(parameters)
+
+            if model is None:
+                self.stats.created += 1
+            else:
+                self.stats.reused += 1
+
+        if model is None:
+            return Autotrans(parameters, self._vehicle_integrator, self._engine_integrator)
+
+        model.reset(parameters)
+
+        return model
+
+    def release(self, model: Autotrans):
+        """Return a model to the pool, it must not be used afterwards."""
+
+        parameters = model.parameters
+        key = _group_key(parameters)
+
+        with self._lock:
+            group = self._idle.setdefault(key, OrderedDict())
+            group.setdefault(parameters, []).append(model)
+            group.move_to_end(parameters)
+            self._idle_counts[key] = self._idle_counts.get(key, 0) + 1
+
+            if self._idle_counts[key] > self._max_idle:
+                oldest_parameters, oldest = next(iter(group.items()))
+                oldest.pop(0)
+                self._idle_counts[key] -= 1
+
+                if not oldest:
+                    del group[oldest_parameters]
+
+    @contextmanager
+    def model(self, parameters: AutotransParameters) -> Iterator[Autotrans]:
+        """Acquire a model for the duration of a `with` block."""
+
+        model = self.acquire(parameters)
+
+        try:
+            yield model
+        finally:
+            self.release(model)
+
+    def clear(self):
+        """Drop all idle models."""
+
+        with self._lock:
+            self._idle.clear()
+            self._idle_counts.clear()
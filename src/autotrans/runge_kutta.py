@@ -0,0 +1,223 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Optional, TypeVar, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+StateT = TypeVar("StateT", float, NDArray[np.float64])
+
+
+@dataclass(frozen=True, eq=False)
+class ButcherTableau:
+    """Coefficients of an explicit Runge-Kutta method.
+
+    The coefficients are stored as NumPy arrays, and the non-zero coefficients of every stage are
+    also kept as tuples of Python floats so that steps skip the zero terms and scalar states are
+    advanced without creating any arrays.
+
+    Attributes:
+        a: The (s, s) strictly lower triangular matrix of stage coefficients
+        b: The weights of the stages in the solution
+        c: The nodes of the stages as fractions of the step
+        order: The order of the solution
+        b_error: The difference between the weights of the solution and an embedded solution
+        error_order: The order of the embedded solution
+    """
+
+    a: NDArray[np.float64]
+    b: NDArray[np.float64]
+    c: NDArray[np.float64]
+    order: int
+    b_error: Optional[NDArray[np.float64]] = None
+    error_order: Optional[int] = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Sequence[float]],
+        b: Sequence[float],
+        c: Sequence[float],
+        order: int,
+        b_embedded: Optional[Sequence[float]] = None,
+        error_order: Optional[int] = None,
+    ) -> "ButcherTableau":
+        """Create a tableau from the rows of the lower triangle of the stage coefficients.
+
+        Args:
+            rows: The coefficients of each stage, the first row is empty
+            b: The weights of the solution
+            c: The nodes of the stages, which must match the row sums
+            order: The order of the solution
+            b_embedded: The weights of the embedded solution used to estimate the error
+            error_order: The order of the embedded solution
+
+        Returns:
+            The tableau
+        """
+
+        stages = len(rows)
+        a = np.zeros((stages, stages), dtype=np.float64)
+
+        for i, row in enumerate(rows):
+            assert len(row) == i
+            a[i, :i] = row
+
+        b_array = np.asarray(b, dtype=np.float64)
+        c_array = np.asarray(c, dtype=np.float64)
+        b_error = None if b_embedded is None else b_array - np.asarray(b_embedded, dtype=np.float64)
+
+        assert np.allclose(a.sum(axis=1), c_array)
+        assert np.isclose(b_array.sum(), 1.0)
+
+        return cls(a=a, b=b_array, c=c_array, order=order, b_error=b_error, error_order=error_order)
+
+    @property
+    def stages(self) -> int:
+        return self.b.size
+
+    @cached_property
+    def fsal(self) -> bool:
+        """Whether the last stage is evaluated at the solution, so it is the first stage of the next step."""
+
+        return bool(self.c[-1] == 1.0 and np.array_equal(self.a[-1], self.b))
+
+    @cached_property
+    def _stage_terms(self) -> tuple[tuple[tuple[int, float], ...], ...]:
+        return tuple(_nonzero_terms(row[:i]) for i, row in enumerate(self.a))
+
+    @cached_property
+    def _solution_terms(self) -> tuple[tuple[int, float], ...]:
+        return _nonzero_terms(self.b)
+
+    @cached_property
+    def _error_terms(self) -> tuple[tuple[int, float], ...]:
+        return () if self.b_error is None else _nonzero_terms(self.b_error)
+
+    @cached_property
+    def _nodes(self) -> tuple[float, ...]:
+        return tuple(self.c.tolist())
+
+
+def _nonzero_terms(weights: NDArray[np.float64]) -> tuple[tuple[int, float], ...]:
+    return tuple((j, weight) for j, weight in enumerate(weights.tolist()) if weight != 0.0)
+
+
+def _combine(terms: tuple[tuple[int, float], ...], k: list[StateT]) -> StateT:
+    """Weighted sum of the stages, accumulated in the same order for every element of array states."""
+
+    total = 0.0
+
+    for j, weight in terms:
+        total = total + weight * k[j]
+
+    return total
+
+
+@dataclass(frozen=True)
+class RungeKuttaStep:
+    """Result of a single Runge-Kutta step.
+
+    Attributes:
+        y: The solution at the end of the step
+        fsal_stage: The derivative at the end of the step if the method evaluates it, otherwise None
+        error: The local error estimate if the tableau has an embedded solution, otherwise None
+    """
+
+    y: Union[float, NDArray[np.float64]]
+    fsal_stage: Union[float, NDArray[np.float64], None]
+    error: Union[float, NDArray[np.float64], None]
+
+
+def runge_kutta_step(
+    tableau: ButcherTableau,
+    step_size: float,
+    t0: float,
+    y0: StateT,
+    func: Callable[[float, StateT], StateT],
+    k1: Optional[StateT] = None,
+    t1: Optional[float] = None,
+) -> RungeKuttaStep:
+    """Take one explicit Runge-Kutta step.
+
+    Scalar states are advanced with Python float arithmetic and array states with elementwise NumPy
+    operations, so the same tableau integrates a single model or a batch of models and every element
+    of a batch is computed exactly like a scalar state.
+
+    Args:
+        tableau: The coefficients of the method
+        step_size: The length of the step
+        t0: The time at the start of the step
+        y0: The state at the start of the step
+        func: The derivative of the state
+        k1: The derivative at the start of the step if it is already known
+        t1: The time at the end of the step, used for the stages with a node of 1 so that they are
+            evaluated at exactly the same time as the start of the next step
+
+    Returns:
+        The solution, the reusable last stage and the error estimate of the step
+    """
+
+    h = step_size
+    t1 = t0 + h if t1 is None else t1
+
+    if isinstance(y0, float):
+        k = [func(t0, y0) if k1 is None else k1]
+    else:
+        y0 = np.asarray(y0, dtype=np.float64)
+        k = [np.asarray(func(t0, y0) if k1 is None else k1, dtype=np.float64)]
+
+    for node, terms in zip(tableau._nodes[1:], tableau._stage_terms[1:]):
+        k.append(func(t1 if node == 1.0 else t0 + node * h, y0 + h * _combine(terms, k)))
+
+    y = y0 + h * _combine(tableau._solution_terms, k)
+    error = h * _combine(tableau._error_terms, k) if tableau.b_error is not None else None
+
+    return RungeKuttaStep(y=y, fsal_stage=k[-1] if tableau.fsal else None, error=error)
+
+
+EULER = ButcherTableau.from_rows(rows=[[]], b=[1.0], c=[0.0], order=1)
+
+RK4 = ButcherTableau.from_rows(
+    rows=[
+        [],
+        [1/2],
+        [0, 1/2],
+        [0, 0, 1],
+    ],
+    b=[1/6, 1/3, 1/3, 1/6],
+    c=[0, 1/2, 1/2, 1],
+    order=4,
+)
+
+BOGACKI_SHAMPINE = ButcherTableau.from_rows(
+    rows=[
+        [],
+        [1/2],
+        [0, 3/4],
+        [2/9, 1/3, 4/9],
+    ],
+    b=[2/9, 1/3, 4/9, 0],
+    c=[0, 1/2, 3/4, 1],
+    order=3,
+    b_embedded=[7/24, 1/4, 1/3, 1/8],
+    error_order=2,
+)
+
+DORMAND_PRINCE = ButcherTableau.from_rows(
+    rows=[
+        [],
+        [1/5],
+        [3/40, 9/40],
+        [44/45, -56/15, 32/9],
+        [19372/6561, -25360/2187, 64448/6561, -212/729],
+        [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+        [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+    ],
+    b=[35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0],
+    c=[0, 1/5, 3/10, 4/5, 8/9, 1, 1],
+    order=5,
+    b_embedded=[5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40],
+    error_order=4,
+)
@@ -0,0 +1,233 @@
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .autotrans import Autotrans, AutotransParameters, Trajectory
+from .integration import Dp5Integrator, FixedStepIntegrator
+from .runge_kutta import DORMAND_PRINCE
+from .vehicle import _into_mph
+
+PARAMETER_FIELDS = (
+    "engine.engine_propeller_inertia",
+    "engine.initial_rpm",
+    "vehicle.drag_coefficient",
+    "vehicle.final_drive_ratio",
+    "vehicle.inertia",
+    "vehicle.initial_speed",
+    "vehicle.wheel_friction",
+    "vehicle.wheel_radius",
+)
+
+# Vehicle speed in mph per unit of wheel speed and wheel radius
+_SPEED_FACTOR = _into_mph(2 * math.pi)
+
+
+class _StageRecorder(FixedStepIntegrator):
+    """Dormand-Prince integrator that records the time and state of every stage of the last step."""
+
+    def __init__(self, step_size: float):
+        super().__init__(step_size)
+        self._integrator = Dp5Integrator(step_size)
+        self.stages: list[tuple[float, float]] = []
+
+    def integrate(self, t0: float, y0: float, func: Callable[[float, float], float], continuous: bool = False):
+        self.stages = []
+
+        def recording_fn(t: float, y: float) -> float:
+            self.stages.append((t, y))
+            return func(t, y)
+
+        # Every stage is evaluated so that it is recorded, the result is the same as with a reused stage
+        return self._integrator.integrate(t0, y0, recording_fn)
+
+
+@dataclass(frozen=True)
+class SensitivityResult:
+    """Trajectory of the model with the derivatives of its outputs with respect to the inputs.
+
+    The Jacobians have one row per state of the trajectory and the columns hold the derivatives with
+    respect to the throttle of every step, then the brake of every step, then every parameter.
+
+    Attributes:
+        trajectory: The states of the model before every step, as returned by `simulate`
+        parameters: The names of the parameters in the last columns of the Jacobians
+        engine_rpm: The derivatives of the engine RPM with the shape (T, 2T + P)
+        vehicle_speed: The derivatives of the vehicle speed with the shape (T, 2T + P)
+    """
+
+    trajectory: Trajectory
+    parameters: tuple[str, ...]
+    engine_rpm: NDArray[np.float64]
+    vehicle_speed: NDArray[np.float64]
+
+    def jacobian(self, output: str, wrt: str) -> NDArray[np.float64]:
+        """The derivatives of an output with respect to one input signal or parameter.
+
+        Args:
+            output: Either "engine_rpm" or "vehicle_speed"
+            wrt: Either "throttle", "brake" or the name of a parameter
+
+        Returns:
+            An array with the shape (T, T) for an input signal, where element [k, j] is the
+            derivative of state k with respect to the input of step j, or (T,) for a parameter
+        """
+
+        assert output in ("engine_rpm", "vehicle_speed")
+
+        jacobian = getattr(self, output)
+        steps = len(self.trajectory)
+
+        if wrt == "throttle":
+            return jacobian[:, :steps]
+
+        if wrt == "brake":
+            return jacobian[:, steps:2 * steps]
+
+        return jacobian[:, 2 * steps + self.parameters.index(wrt)]
+
+
+def simulate_sensitivities(
+    throttle_signal: Sequence[float],
+    brake_signal: Sequence[float],
+    parameters: AutotransParameters,
+    wrt: Sequence[str] = (),
+) -> SensitivityResult:
+    """Simulate the model and propagate forward sensitivities alongside the integration.
+
+    The tangent linear model differentiates every Dormand-Prince stage of the engine, the torque
+    converter and the vehicle update. The lookup tables are differentiated along the cell used for
+    each lookup, and inputs clamped to a table have no effect. The gear is discrete, so the
+    sensitivities only describe how the outputs change while every gear switch happens at the same
+    step, and they do not include the jumps of moving a switch to another step.
+
+    Args:
+        throttle_signal: The throttle value for each step
+        brake_signal: The brake value for each step
+        parameters: The model parameters, with the default single-rate configuration
+        wrt: The parameters to differentiate with respect to, any of `PARAMETER_FIELDS`
+
+    Returns:
+        The trajectory and the Jacobians of the engine RPM and vehicle speed
+    """
+
+    assert len(throttle_signal) == len(brake_signal)
+    assert parameters.rates.single_rate
+    assert all(name in PARAMETER_FIELDS for name in wrt)
+
+    steps = len(throttle_signal)
+    columns = 2 * steps + len(wrt)
+    model = Autotrans(parameters)
+    engine = model._engine
+    transmission = model._transmission
+    vehicle = model._vehicle
+    recorder = _StageRecorder(engine._time_step)
+    engine._integrator = recorder
+
+    def seed(name: str) -> NDArray[np.float64]:
+        tangent = np.zeros(columns)
+
+        if name in wrt:
+            tangent[2 * steps + wrt.index(name)] = 1.0
+
+        return tangent
+
+    d_inertia = seed("engine.engine_propeller_inertia")
+    d_drag = seed("vehicle.drag_coefficient")
+    d_final_drive_ratio = seed("vehicle.final_drive_ratio")
+    d_vehicle_inertia = seed("vehicle.inertia")
+    d_friction = seed("vehicle.wheel_friction")
+    d_radius = seed("vehicle.wheel_radius")
+
+    radius = parameters.vehicle.wheel_radius
+    d_rpm = seed("engine.initial_rpm")
+    d_wheel_speed = (seed("vehicle.initial_speed") - vehicle._wheel_speed * d_radius) / radius
+    d_last_throttle = np.zeros(columns)
+    d_last_impeller_torque = np.zeros(columns)
+    d_impeller_torque = np.zeros(columns)
+    d_output_torque = np.zeros(columns)
+
+    trajectory = Trajectory.empty(steps)
+    d_engine_rpm = np.empty((steps, columns))
+    d_vehicle_speed = np.empty((steps, columns))
+    stage_terms = DORMAND_PRINCE._stage_terms
+    solution_terms = DORMAND_PRINCE._solution_terms
+
+    for tick, (throttle, brake) in enumerate(zip(throttle_signal, brake_signal)):
+        model._record(trajectory, tick)
+        d_engine_rpm[tick] = d_rpm
+        d_vehicle_speed[tick] = _SPEED_FACTOR * (d_wheel_speed * radius + vehicle._wheel_speed * d_radius)
+
+        # Values before the step
+        time_step = engine._time_step
+        inertia = engine._inertia
+        last_throttle = engine._last_throttle
+        last_impeller_torque = engine._last_impeller_torque
+        impeller_torque = transmission.impeller_torque
+        wheel_speed = vehicle._wheel_speed
+        vehicle_speed = vehicle.speed
+
+        model.step(throttle, brake)
+
+        # Engine: differentiate every stage of the recorded Dormand-Prince step
+        d_throttle = np.zeros(columns)
+        d_throttle[tick] = 1.0
+        d_stages = []
+
+        for (t, y), terms in zip(recorder.stages, stage_terms):
+            fraction = t / time_step
+            stage_throttle = (1 - fraction) * last_throttle + fraction * throttle
+            stage_torque = (1 - fraction) * last_impeller_torque + fraction * impeller_torque
+            d_stage_throttle = (1 - fraction) * d_last_throttle + fraction * d_throttle
+            d_stage_torque = (1 - fraction) * d_last_impeller_torque + fraction * d_impeller_torque
+            d_y = d_rpm + time_step * sum(weight * d_stages[j] for j, weight in terms)
+            torque_d_throttle, torque_d_rpm = engine._torque_map.gradient(stage_throttle, y)
+            derivative = (engine._torque_map(stage_throttle, y) - stage_torque) / inertia
+            d_stages.append(
+                (torque_d_throttle * d_stage_throttle + torque_d_rpm * d_y - d_stage_torque) / inertia
+                - derivative * d_inertia / inertia
+            )
+
+        d_rpm = d_rpm + time_step * sum(weight * d_stages[j] for j, weight in solution_terms)
+        d_last_throttle = d_throttle
+        d_last_impeller_torque = d_impeller_torque
+
+        # Transmission: the gear is held fixed, so only the torque converter tables are differentiated
+        gear_ratio = transmission.GEAR_RATIOS[model._shift_logic.current_gear]
+        final_drive_ratio = vehicle._final_drive_ratio
+        transmission_rpm = final_drive_ratio * wheel_speed
+        d_transmission_rpm = d_final_drive_ratio * wheel_speed + final_drive_ratio * d_wheel_speed
+        rpm = engine.rpm
+        speed_ratio = gear_ratio * transmission_rpm / rpm
+        d_speed_ratio = (gear_ratio * d_transmission_rpm - speed_ratio * d_rpm) / rpm
+        k_factor, k_factor_slope = transmission.K_FACTOR_TABLE.lookup_with_slope(speed_ratio)
+        torque_ratio, torque_ratio_slope = transmission.TORQUE_RATIO_TABLE.lookup_with_slope(speed_ratio)
+        d_k_factor = k_factor_slope * d_speed_ratio
+        d_impeller_torque = 2 * (rpm / k_factor) * (d_rpm / k_factor - rpm * d_k_factor / k_factor**2)
+        d_output_torque = gear_ratio * (
+            d_impeller_torque * torque_ratio + transmission.impeller_torque * torque_ratio_slope * d_speed_ratio
+        )
+
+        # Vehicle: the load is held over the step and its sign is piecewise constant
+        d_brake = np.zeros(columns)
+        d_brake[steps + tick] = 1.0
+        sign = math.copysign(1.0, vehicle_speed)
+        d_vehicle_speed_before = _SPEED_FACTOR * (d_wheel_speed * radius + wheel_speed * d_radius)
+        load = (vehicle_speed**2 * vehicle._co_drag + vehicle._wheel_friction + brake) * sign
+        d_load = sign * (
+            2 * vehicle_speed * vehicle._co_drag * d_vehicle_speed_before
+            + vehicle_speed**2 * d_drag
+            + d_friction
+            + d_brake
+        )
+        drive = transmission.output_torque * final_drive_ratio
+        d_drive = d_output_torque * final_drive_ratio + transmission.output_torque * d_final_drive_ratio
+        vehicle_inertia = vehicle._inertia
+        d_wheel_speed = d_wheel_speed + vehicle._time_step * (
+            (d_drive - d_load) / vehicle_inertia - (drive - load) * d_vehicle_inertia / vehicle_inertia**2
+        )
+
+    return SensitivityResult(trajectory, tuple(wrt), d_engine_rpm, d_vehicle_speed)
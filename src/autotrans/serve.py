@@ -0,0 +1,427 @@
+import argparse
+import io
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .autotrans import (
+    Autotrans,
+    AutotransParameters,
+    DEFAULT_PARAMETERS,
+    EngineParameters,
+    RateParameters,
+    ShiftLogicParameters,
+    STATE_COLUMNS,
+    VehicleParameters,
+    simulate,
+)
+from .batch import simulate_batch
+from .shift_logic import Gear
+
+JSON_TYPE = "application/json"
+NPZ_TYPE = "application/x-npz"
+
+
+def parameters_from_dict(values: Mapping[str, Any]) -> AutotransParameters:
+    """Build the model parameters from a dictionary with the same nesting as `AutotransParameters`."""
+
+    shift_logic = values["shift_logic"]
+
+    return AutotransParameters(
+        step_size_ms=int(values["step_size_ms"]),
+        engine=EngineParameters(**values["engine"]),
+        shift_logic=ShiftLogicParameters(Gear(shift_logic["initial_gear"]), int(shift_logic["wait_ticks"])),
+        vehicle=VehicleParameters(**values["vehicle"]),
+        rates=RateParameters(**values.get("rates", {})),
+    )
+
+
+def _warm_up():
+    """Import and exercise the model once in every worker so that the first request is not slower."""
+
+    simulate_batch(np.full((1, 2), 50.0), np.zeros((1, 2)), DEFAULT_PARAMETERS)
+
+
+def _started():
+    """Task that does nothing, submitted to make the pool start its workers."""
+
+
+def _simulate_group(
+    parameters: Sequence[AutotransParameters],
+    throttle: NDArray[np.float64],
+    brake: NDArray[np.float64],
+    min_vectorized: int,
+) -> dict[str, NDArray]:
+    """Simulate a group of scenarios that share the step size and number of steps in a worker."""
+
+    # The vectorized model has a fixed cost per tick that only pays off for larger groups, and it is
+    # single rate, so other groups are simulated one scenario at a time
+    if len(parameters) >= min_vectorized and all(scenario.rates.single_rate for scenario in parameters):
+        trajectories = simulate_batch(throttle, brake, parameters)
+        return {name: getattr(trajectories, name) for name in ("time_ms", *STATE_COLUMNS)}
+
+    rows = [
+        simulate(row_throttle.tolist(), row_brake.tolist(), Autotrans(scenario), columnar=True)
+        for scenario, row_throttle, row_brake in zip(parameters, throttle, brake)
+    ]
+
+    return {
+        "time_ms": rows[0].time_ms,
+        **{name: np.stack([getattr(row, name) for row in rows]) for name in STATE_COLUMNS},
+    }
+
+
+@dataclass
+class _Request:
+    parameters: AutotransParameters
+    throttle: NDArray[np.float64]
+    brake: NDArray[np.float64]
+    future: Future = field(default_factory=Future)
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return self.parameters.step_size_ms, self.throttle.size
+
+
+class ServerStats:
+    """Thread-safe counters of the requests and batches handled by the server.
+
+    Args:
+        window: The number of most recent requests used for the latency percentiles
+    """
+
+    def __init__(self, window: int = 10000):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_scenarios = 0
+        self.steps = 0
+
+    def record_batch(self, scenarios: int, steps: int):
+        with self._lock:
+            self.batches += 1
+            self.batched_scenarios += scenarios
+            self.steps += scenarios * steps
+
+    def record_request(self, latency: float, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+            self._latencies.append(latency)
+
+    def as_dict(self) -> dict[str, Optional[float]]:
+        with self._lock:
+            uptime = time.perf_counter() - self._started
+            latencies = np.asarray(self._latencies) * 1000
+            # Percentiles are None until the first request completes
+            percentiles = np.percentile(latencies, [50, 90, 99]).tolist() if latencies.size else [None] * 3
+
+            return {
+                "uptime_s": uptime,
+                "requests": self.requests,
+                "errors": self.errors,
+                "batches": self.batches,
+                "mean_batch_size": self.batched_scenarios / self.batches if self.batches else 0.0,
+                "requests_per_s": self.requests / uptime,
+                "steps_per_s": self.steps / uptime,
+                "latency_p50_ms": percentiles[0],
+                "latency_p90_ms": percentiles[1],
+                "latency_p99_ms": percentiles[2],
+                "latency_max_ms": float(latencies.max()) if latencies.size else None,
+            }
+
+
+class MicroBatcher:
+    """Group concurrent requests into vectorized batches that are simulated by a process pool.
+
+    After the first request of a batch arrives the batcher waits up to `window_s` for more requests,
+    then simulates every group of requests with the same step size and number of steps as a single
+    task. Groups of at least `min_vectorized` scenarios are simulated by the vectorized model.
+
+    Args:
+        executor: The pool of worker processes
+        stats: The counters updated with every batch
+        window_s: The time to wait for more requests after the first one
+        max_batch: The maximum number of requests in a batch
+        min_vectorized: The smallest group that is simulated by the vectorized model
+    """
+
+    def __init__(
+        self,
+        executor: ProcessPoolExecutor,
+        stats: ServerStats,
+        window_s: float,
+        max_batch: int,
+        min_vectorized: int = 16,
+    ):
+        assert window_s >= 0
+        assert max_batch > 0
+
+        self._executor = executor
+        self._stats = stats
+        self._window_s = window_s
+        self._max_batch = max_batch
+        self._min_vectorized = min_vectorized
+        self._queue: queue.Queue[Optional[_Request]] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="autotrans-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, parameters: AutotransParameters, throttle: NDArray, brake: NDArray) -> Future:
+        """Queue a scenario and return a future of its trajectory columns."""
+
+        request = _Request(parameters, throttle, brake)
+        self._queue.put(request)
+
+        return request.future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first: _Request) -> tuple[list[_Request], bool]:
+        requests = [first]
+        deadline = time.perf_counter() + self._window_s
+
+        while len(requests) < self._max_batch:
+            try:
+                request = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                break
+
+            if request is None:
+                return requests, True
+
+            requests.append(request)
+
+        return requests, False
+
+    def _run(self):
+        closed = False
+
+        while not closed:
+            first = self._queue.get()
+
+            if first is None:
+                break
+
+            requests, closed = self._collect(first)
+            groups: dict[tuple[int, int], list[_Request]] = {}
+
+            for request in requests:
+                groups.setdefault(request.key, []).append(request)
+
+            for (_, steps), group in groups.items():
+                self._stats.record_batch(len(group), steps)
+                self._submit(group)
+
+    def _submit(self, group: list[_Request]):
+        # A broken pool or bad inputs must only fail this group, the batcher keeps serving later requests
+        try:
+            future = self._executor.submit(
+                _simulate_group,
+                [request.parameters for request in group],
+                np.stack([request.throttle for request in group]),
+                np.stack([request.brake for request in group]),
+                self._min_vectorized,
+            )
+        except Exception as error:
+            for request in group:
+                request.future.set_exception(error)
+            return
+
+        future.add_done_callback(lambda done: self._resolve(done, group))
+
+    def _resolve(self, done: Future, group: list[_Request]):
+        try:
+            columns = done.result()
+        except Exception as error:
+            if len(group) == 1:
+                group[0].future.set_exception(error)
+                return
+
+            # Simulate the scenarios of a failed group one at a time, so only the failing requests get the error
+            for request in group:
+                self._submit([request])
+
+            return
+
+        for index, request in enumerate(group):
+            request.future.set_result({
+                name: column if name == "time_ms" else column[index] for name, column in columns.items()
+            })
+
+
+class SimulationServer(ThreadingHTTPServer):
+    """HTTP server that simulates scenarios in a pool of warm worker processes.
+
+    `POST /simulate` accepts either a JSON object with the `throttle` and `brake` lists and the
+    nested `parameters`, or an .npz archive with `throttle` and `brake` arrays and a `parameters`
+    string holding the same JSON, with the content type `application/x-npz`. The response holds the
+    time and state columns in the same format. `GET /stats` reports the throughput and latency.
+
+    Args:
+        address: The host and port to listen on, port 0 picks a free port
+        workers: The number of worker processes, defaults to the number of CPUs
+        window_ms: The time the batcher waits for concurrent requests
+        max_batch: The maximum number of requests simulated as one batch
+        min_vectorized: The smallest batch that is simulated by the vectorized model, smaller
+            batches are faster to simulate one scenario at a time
+    """
+
+    daemon_threads = True
+    # Many clients connect at once, which overflows the default backlog of 5 connections
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 8765),
+        workers: Optional[int] = None,
+        window_ms: float = 5.0,
+        max_batch: int = 256,
+        min_vectorized: int = 16,
+    ):
+        super().__init__(address, _Handler)
+        workers = workers or os.cpu_count() or 1
+        self.stats = ServerStats()
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up)
+
+        # The initializer warms up every worker, these empty tasks only make the pool start all of
+        # them before the first request instead of on demand
+        for future in [self.executor.submit(_started) for _ in range(workers)]:
+            future.result()
+
+        self.batcher = MicroBatcher(self.executor, self.stats, window_ms / 1000, max_batch, min_vectorized)
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+        self.executor.shutdown()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: SimulationServer
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str = JSON_TYPE):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, value: Any):
+        self._send(status, json.dumps(value).encode())
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(HTTPStatus.OK, self.server.stats.as_dict())
+        elif self.path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/simulate":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown path {self.path}"})
+            return
+
+        start = time.perf_counter()
+        binary = self.headers.get("Content-Type", JSON_TYPE).startswith(NPZ_TYPE)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        try:
+            parameters, throttle, brake = _parse_request(body, binary)
+        except Exception as error:
+            # Any failure to decode the body, including a corrupt npz archive, is the client's error
+            self.server.stats.record_request(time.perf_counter() - start, error=True)
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"invalid request: {error!r}"})
+            return
+
+        try:
+            columns = self.server.batcher.submit(parameters, throttle, brake).result()
+        except Exception as error:
+            self.server.stats.record_request(time.perf_counter() - start, error=True)
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"simulation failed: {error!r}"})
+            return
+
+        if binary:
+            output = io.BytesIO()
+            np.savez(output, **columns)
+            self._send(HTTPStatus.OK, output.getvalue(), NPZ_TYPE)
+        else:
+            self._send_json(HTTPStatus.OK, {name: column.tolist() for name, column in columns.items()})
+
+        self.server.stats.record_request(time.perf_counter() - start)
+
+
+def _parse_request(body: bytes, binary: bool) -> tuple[AutotransParameters, NDArray, NDArray]:
+    if binary:
+        with np.load(io.BytesIO(body), allow_pickle=False) as archive:
+            throttle = archive["throttle"]
+            brake = archive["brake"]
+            parameters = json.loads(str(archive["parameters"]))
+    else:
+        request = json.loads(body)
+        throttle = request["throttle"]
+        brake = request["brake"]
+        parameters = request["parameters"]
+
+    throttle = np.asarray(throttle, dtype=np.float64)
+    brake = np.asarray(brake, dtype=np.float64)
+
+    # The request comes from an untrusted client, so it is validated even when assertions are disabled
+    if throttle.ndim != 1 or throttle.shape != brake.shape:
+        raise ValueError("throttle and brake must be lists of equal length")
+
+    if not np.all((0 <= throttle) & (throttle <= 100)):
+        raise ValueError("throttle must be in [0, 100]")
+
+    if not np.all(brake >= 0):
+        raise ValueError("brake must not be negative")
+
+    return parameters_from_dict(parameters), throttle, brake
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve autotrans simulations over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to the CPU count")
+    parser.add_argument("--window-ms", type=float, default=5.0, help="time to wait for requests to batch")
+    parser.add_argument("--max-batch", type=int, default=256, help="maximum number of requests in a batch")
+    parser.add_argument("--min-vectorized", type=int, default=16, help="smallest batch simulated by the vectorized model")
+    args = parser.parse_args(argv)
+
+    server = SimulationServer(
+        (args.host, args.port), args.workers, args.window_ms, args.max_batch, args.min_vectorized
+    )
+    host, port = server.server_address[:2]
+    print(f"serving autotrans on http://{host}:{port}", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
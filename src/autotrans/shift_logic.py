@@ -1,10 +1,9 @@
-from enum import Enum, IntEnum, auto, unique
-from typing import Protocol
+from enum import IntEnum, unique
 
 import numpy as np
-from transitions import Machine, EventData
+from numpy.typing import ArrayLike, NDArray
 
-from autotrans.modeling.lookup_table import LookupTable2D
+from autotrans.modeling.lookup_table import LookupTable1D, LookupTable2D
 
 GEAR_BREAKPOINTS = np.arange(1, 5)
 UP_SHIFT_THROTTLE_BREAKPOINTS = np.array([0, 25, 35, 50, 90, 100], dtype=np.float64)
@@ -25,6 +24,8 @@ DOWN_SHIFT_VALUES = np.array([
     [0, 30, 50, 80],
     [0, 30, 50, 80],
 ])
+UP_SHIFT_TABLE = LookupTable2D(UP_SHIFT_THROTTLE_BREAKPOINTS, GEAR_BREAKPOINTS, UP_SHIFT_VALUES)
+DOWN_SHIFT_TABLE = LookupTable2D(DOWN_SHIFT_THROTTLE_BREAKPOINTS, GEAR_BREAKPOINTS, DOWN_SHIFT_VALUES)
 
 
 @unique
@@ -36,165 +37,178 @@ class Gear(IntEnum):
 
 
 def up_shift_threshold(gear: Gear, throttle: float) -> float:
-    table = LookupTable2D(UP_SHIFT_THROTTLE_BREAKPOINTS, GEAR_BREAKPOINTS, UP_SHIFT_VALUES)
-    return table.lookup(throttle, gear)
+    return UP_SHIFT_TABLE.lookup(throttle, gear)
 
 
 def down_shift_threshold(gear: Gear, throttle: float) -> float:
-    table = LookupTable2D(DOWN_SHIFT_THROTTLE_BREAKPOINTS, GEAR_BREAKPOINTS, DOWN_SHIFT_VALUES)
-    return table.lookup(throttle, gear)
+    return DOWN_SHIFT_TABLE.lookup(throttle, gear)
 
 
-def should_shift_up(event: EventData) -> bool:
-    throttle = event.kwargs.get("throttle")
-    current_gear = event.kwargs.get("current_gear")
-    threshold = up_shift_threshold(current_gear, throttle)
+@unique
+class SelectionState(IntEnum):
+    STEADY_STATE = 0
+    UP_SHIFTING = 1
+    DOWN_SHIFTING = 2
 
-    return event.kwargs.get("vehicle_speed") >= threshold
 
+@unique
+class SpeedBand(IntEnum):
+    """Position of the vehicle speed relative to the shift thresholds of the current gear."""
+
+    NO_SHIFT = 0
+    SHIFT_UP = 1
+    SHIFT_DOWN = 2
+
+
+# Transition table indexed by [selection state][speed band][shift duration met]. Each entry is the
+# next selection state, a multiplier and an increment applied to the counter, and the gear change.
+# A multiplier of 0 resets the counter, an increment of 1 counts another tick spent shifting.
+TRANSITIONS = np.array([
+    [  # STEADY_STATE
+        [(SelectionState.STEADY_STATE, 1, 0, 0), (SelectionState.STEADY_STATE, 1, 0, 0)],
+        [(SelectionState.UP_SHIFTING, 1, 1, 0), (SelectionState.UP_SHIFTING, 1, 1, 0)],
+        [(SelectionState.DOWN_SHIFTING, 1, 1, 0), (SelectionState.DOWN_SHIFTING, 1, 1, 0)],
+    ],
+    [  # UP_SHIFTING
+        [(SelectionState.STEADY_STATE, 0, 0, 0), (SelectionState.STEADY_STATE, 0, 0, 0)],
+        [(SelectionState.UP_SHIFTING, 1, 1, 0), (SelectionState.STEADY_STATE, 0, 0, 1)],
+        [(SelectionState.UP_SHIFTING, 1, 0, 0), (SelectionState.UP_SHIFTING, 1, 0, 0)],
+    ],
+    [  # DOWN_SHIFTING
+        [(SelectionState.STEADY_STATE, 0, 0, 0), (SelectionState.STEADY_STATE, 0, 0, 0)],
+        [(SelectionState.DOWN_SHIFTING, 1, 0, 0), (SelectionState.DOWN_SHIFTING, 1, 0, 0)],
+        [(SelectionState.DOWN_SHIFTING, 1, 1, 0), (SelectionState.STEADY_STATE, 0, 0, -1)],
+    ],
+], dtype=np.int64)
+_TRANSITIONS = TRANSITIONS.tolist()
+
+# The gear is always one of the gear breakpoints, so the scalar state machine only needs to
+# interpolate over the throttle column of the current gear.
+_UP_SHIFT_TABLES = [None] + [
+    LookupTable1D(UP_SHIFT_THROTTLE_BREAKPOINTS, UP_SHIFT_VALUES[:, gear - 1]) for gear in Gear
+]
+_DOWN_SHIFT_TABLES = [None] + [
+    LookupTable1D(DOWN_SHIFT_THROTTLE_BREAKPOINTS, DOWN_SHIFT_VALUES[:, gear - 1]) for gear in Gear
+]
+
+_NO_SHIFT = int(SpeedBand.NO_SHIFT)
+_SHIFT_UP = int(SpeedBand.SHIFT_UP)
+_SHIFT_DOWN = int(SpeedBand.SHIFT_DOWN)
+
+
+def speed_band(vehicle_speed: float, lo_threshold: float, hi_threshold: float) -> int:
+    if lo_threshold < vehicle_speed < hi_threshold:
+        return _NO_SHIFT
+
+    if vehicle_speed >= hi_threshold:
+        return _SHIFT_UP
+
+    return _SHIFT_DOWN
 
-def should_shift_down(event: EventData) -> bool:
-    throttle = event.kwargs.get("throttle")
-    current_gear = event.kwargs.get("current_gear")
-    threshold = down_shift_threshold(current_gear, throttle)
 
-    return event.kwargs.get("vehicle_speed") <= threshold
+class ShiftLogic:
+    """Gear selection state machine of the autotrans model.
 
+    The selection state starts out steady. When the vehicle speed leaves the band between the
+    down-shift and up-shift thresholds of the current gear the state moves to up-shifting or
+    down-shifting, and the gear only changes once the speed has stayed outside of the band for more
+    than `wait_ticks` steps. Returning inside the band cancels the pending shift. Shifting up from
+    the fourth gear or down from the first gear leaves the gear unchanged.
 
-def should_not_shift(event: EventData) -> bool:
-    throttle = event.kwargs.get("throttle")
-    current_gear = event.kwargs.get("current_gear")
-    lo_threshold = down_shift_threshold(current_gear, throttle)
-    hi_threshold = up_shift_threshold(current_gear, throttle)
+    Args:
+        wait_ticks: The number of steps to wait before changing gears
+        initial_gear: The starting gear
+    """
 
-    return lo_threshold < event.kwargs.get("vehicle_speed") < hi_threshold
+    def __init__(self, wait_ticks: int, initial_gear: Gear):
+        self._wait_ticks = wait_ticks
+        self._up_shift_tables = _UP_SHIFT_TABLES
+        self._down_shift_tables = _DOWN_SHIFT_TABLES
+        self._gear = Gear(initial_gear)
+        self._selection_state = SelectionState.STEADY_STATE
+        self._counter = 0
 
+    @property
+    def current_gear(self) -> Gear:
+        return self._gear
 
-@unique
-class SelectionState(Enum):
-    STEADY_STATE = auto(),
-    UP_SHIFTING = auto(),
-    DOWN_SHIFTING = auto()
+    @property
+    def selection_state(self) -> SelectionState:
+        return SelectionState(self._selection_state)
 
+    @property
+    def counter(self) -> int:
+        return self._counter
 
-class StepMethod(Protocol):
-    def __call__(self, *, throttle: float, vehicle_speed: float, current_gear: Gear):
-        ...
+    def snapshot(self) -> tuple[Gear, SelectionState, int]:
+        """The current gear, selection state and shift counter."""
 
+        return self._gear, self.selection_state, self._counter
 
-class SelectionStateModel:
-    step: StepMethod
-    state: SelectionState
+    def reset(self, wait_ticks: int, initial_gear: Gear):
+        """Reinitialize the wait and the state in place."""
 
-    def __init__(self, wait_ticks: int):
-        self._counter = 0
         self._wait_ticks = wait_ticks
+        self.restore(initial_gear, SelectionState.STEADY_STATE, 0)
 
-    def reset_counter(self, *_):
-        self._counter = 0
-
-    def increment_counter(self, *_):
-        self._counter += 1
+    def restore(self, gear: Gear, selection_state: SelectionState, counter: int):
+        self._gear = Gear(gear)
+        self._selection_state = SelectionState(selection_state)
+        self._counter = counter
 
-    def shift_duration_met(self, *_) -> bool:
-        return self._counter >= self._wait_ticks
-
-    def shift_duration_not_met(self, *_) -> bool:
-        return self._counter < self._wait_ticks
-
-
-class ShiftLogic:
-    def __init__(self, wait_ticks: int, initial_gear: Gear):
-        gear_state_states = [gear for gear in Gear]
-        gear_state_transitions = [
-            {"trigger": "shift_up", "source": Gear.FIRST, "dest": Gear.SECOND},
-            {"trigger": "shift_up", "source": Gear.SECOND, "dest": Gear.THIRD},
-            {"trigger": "shift_up", "source": Gear.THIRD, "dest": Gear.FOURTH},
-            {"trigger": "shift_down", "source": Gear.FOURTH, "dest": Gear.THIRD},
-            {"trigger": "shift_down", "source": Gear.THIRD, "dest": Gear.SECOND},
-            {"trigger": "shift_down", "source": Gear.SECOND, "dest": Gear.FIRST},
-        ]
-        self._gear_state = Machine(
-            states=gear_state_states,
-            transitions=gear_state_transitions,
-            initial=initial_gear
-        )
+    def step(self, throttle: float, vehicle_speed: float):
+        gear = self._gear
+        lo_threshold = self._down_shift_tables[gear].lookup(throttle)
+        hi_threshold = self._up_shift_tables[gear].lookup(throttle)
+        band = speed_band(vehicle_speed, lo_threshold, hi_threshold)
+        transition = _TRANSITIONS[self._selection_state][band][self._counter >= self._wait_ticks]
+        self._selection_state, counter_scale, counter_increment, gear_change = transition
+        self._counter = self._counter * counter_scale + counter_increment
+
+        if gear_change != 0 and Gear.FIRST <= gear + gear_change <= Gear.FOURTH:
+            self._gear = Gear(gear + gear_change)
+
+
+class BatchShiftLogic:
+    """Vectorized `ShiftLogic` that updates the gears of N independent scenarios at once.
+
+    Args:
+        wait_ticks: The number of steps to wait before changing gears, one value per scenario
+        initial_gear: The starting gear, one value per scenario
+    """
+
+    def __init__(self, wait_ticks: ArrayLike, initial_gear: ArrayLike):
+        self._wait_ticks = np.array(wait_ticks, dtype=np.int64, ndmin=1)
+        self._gear = np.array(initial_gear, dtype=np.int64, ndmin=1)
+        self._wait_ticks, self._gear = np.broadcast_arrays(self._wait_ticks, self._gear)
+        self._wait_ticks = self._wait_ticks.copy()
+        self._gear = self._gear.copy()
+        self._selection_state = np.full(self._gear.shape, SelectionState.STEADY_STATE, dtype=np.int64)
+        self._counter = np.zeros(self._gear.shape, dtype=np.int64)
 
-        selection_state_model = SelectionStateModel(wait_ticks)
-        selection_state_states = [state for state in SelectionState]
-        selection_state_transitions = [
-            {
-                "trigger": "step",
-                "source": SelectionState.STEADY_STATE,
-                "dest": None,
-                "conditions": [should_not_shift],
-            },
-            {
-                "trigger": "step",
-                "source": SelectionState.STEADY_STATE,
-                "dest": SelectionState.UP_SHIFTING,
-                "conditions": [should_shift_up],
-                "after": [selection_state_model.increment_counter]
-            },
-            {
-                "trigger": "step",
-                "source": SelectionState.STEADY_STATE,
-                "dest": SelectionState.DOWN_SHIFTING,
-                "conditions": [should_shift_down],
-                "after": [selection_state_model.increment_counter]
-            },
-            {
-                "trigger": "step",
-                "source": [SelectionState.UP_SHIFTING, SelectionState.DOWN_SHIFTING],
-                "dest": SelectionState.STEADY_STATE,
-                "conditions": [should_not_shift],
-                "after": [selection_state_model.reset_counter]
-            },
-            {
-                "trigger": "step",
-                "source": SelectionState.UP_SHIFTING,
-                "dest": None,
-                "conditions": [should_shift_up, selection_state_model.shift_duration_not_met],
-                "after": [selection_state_model.increment_counter]
-            },
-            {
-                "trigger": "step",
-                "source": SelectionState.DOWN_SHIFTING,
-                "dest": None,
-                "conditions": [should_shift_down, selection_state_model.shift_duration_not_met],
-                "after": [selection_state_model.increment_counter],
-            },
-            {
-                "trigger": "step",
-                "source": SelectionState.UP_SHIFTING,
-                "dest": SelectionState.STEADY_STATE,
-                "conditions": [should_shift_up, selection_state_model.shift_duration_met],
-                "after": [self._gear_state.shift_up, selection_state_model.reset_counter]
-            },
-            {
-                "trigger": "step",
-                "source": SelectionState.DOWN_SHIFTING,
-                "dest": SelectionState.STEADY_STATE,
-                "conditions": [should_shift_down, selection_state_model.shift_duration_met],
-                "after": [self._gear_state.shift_down, selection_state_model.reset_counter]
-            }
-        ]
-        self._selection_state = selection_state_model
-        self._selection_state_machine = Machine(
-            model=selection_state_model,
-            states=selection_state_states,
-            transitions=selection_state_transitions,
-            initial=SelectionState.STEADY_STATE,
-            send_event=True
-        )
+    @property
+    def current_gear(self) -> NDArray[np.int64]:
+        return self._gear
 
     @property
-    def current_gear(self) -> Gear:
-        return self._gear_state.state
+    def selection_state(self) -> NDArray[np.int64]:
+        return self._selection_state
 
-    def step(self, throttle: float, vehicle_speed: float):
-        self._selection_state.step(
-            throttle=throttle,
-            vehicle_speed=vehicle_speed,
-            current_gear=self._gear_state.state
+    @property
+    def counter(self) -> NDArray[np.int64]:
+        return self._counter
+
+    def step(self, throttle: ArrayLike, vehicle_speed: ArrayLike):
+        lo_threshold = DOWN_SHIFT_TABLE.lookup_many(throttle, self._gear)
+        hi_threshold = UP_SHIFT_TABLE.lookup_many(throttle, self._gear)
+        band = np.where(
+            (lo_threshold < vehicle_speed) & (vehicle_speed < hi_threshold),
+            SpeedBand.NO_SHIFT,
+            np.where(vehicle_speed >= hi_threshold, SpeedBand.SHIFT_UP, SpeedBand.SHIFT_DOWN),
         )
+        duration_met = (self._counter >= self._wait_ticks).astype(np.int64)
+        transition = TRANSITIONS[self._selection_state, band, duration_met]
+
+        self._selection_state = transition[:, 0]
+        self._counter = self._counter * transition[:, 1] + transition[:, 2]
+        self._gear = np.clip(self._gear + transition[:, 3], Gear.FIRST, Gear.FOURTH)
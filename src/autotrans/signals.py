@@ -0,0 +1,249 @@
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+class Signal(ABC):
+    """Input signal of the model that is evaluated lazily at the time of every step."""
+
+    @property
+    @abstractmethod
+    def duration_ms(self) -> float:
+        """The length of the signal, the model is stepped at every multiple of its step size before it."""
+
+        ...
+
+    @abstractmethod
+    def at(self, time_ms: float) -> float:
+        """The value of the signal at the given time."""
+
+        ...
+
+    def steps(self, step_size_ms: float) -> int:
+        """The number of steps of the given size that start before the end of the signal."""
+
+        return math.ceil(self.duration_ms / step_size_ms)
+
+    def samples(self, step_size_ms: float) -> Iterator[float]:
+        """Lazily evaluate the signal at the start of every step.
+
+        Args:
+            step_size_ms: The step size of the model
+
+        Returns:
+            An iterator over the value of each step
+        """
+
+        for tick in range(self.steps(step_size_ms)):
+            yield self.at(tick * step_size_ms)
+
+
+def _control_points(times_ms: ArrayLike, values: ArrayLike) -> tuple[list[float], list[float]]:
+    times = np.asarray(times_ms, dtype=np.float64).ravel()
+    points = np.asarray(values, dtype=np.float64).ravel()
+
+    assert times.size > 0
+    assert times.shape == points.shape
+    assert np.all(np.diff(times) > 0)
+
+    return times.tolist(), points.tolist()
+
+
+@dataclass(frozen=True, eq=False)
+class PiecewiseConstant(Signal):
+    """Signal that holds each value from its control point until the next control point.
+
+    The first value is also used before the first control point.
+
+    Attributes:
+        times_ms: The increasing times at which the values start
+        values: The value of each segment
+        end_ms: The end of the signal, which must be after the last control point
+    """
+
+    times_ms: Sequence[float]
+    values: Sequence[float]
+    end_ms: float
+
+    def __post_init__(self):
+        times, values = _control_points(self.times_ms, self.values)
+
+        assert self.end_ms > times[-1]
+
+        object.__setattr__(self, "_times", times)
+        object.__setattr__(self, "_values", values)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms
+
+    def at(self, time_ms: float) -> float:
+        return self._values[max(bisect_right(self._times, time_ms) - 1, 0)]
+
+    def samples(self, step_size_ms: float) -> Iterator[float]:
+        # The step times increase, so the current segment only ever moves forward
+        times = self._times
+        segment = 0
+
+        for tick in range(self.steps(step_size_ms)):
+            time_ms = tick * step_size_ms
+
+            while segment + 1 < len(times) and times[segment + 1] <= time_ms:
+                segment += 1
+
+            yield self._values[segment]
+
+
+@dataclass(frozen=True, eq=False)
+class PiecewiseLinear(Signal):
+    """Signal that interpolates linearly between control points and holds the end values outside them.
+
+    Attributes:
+        times_ms: The increasing times of the control points
+        values: The value at each control point
+        end_ms: The end of the signal, the last control point if None
+    """
+
+    times_ms: Sequence[float]
+    values: Sequence[float]
+    end_ms: Optional[float] = None
+
+    def __post_init__(self):
+        times, values = _control_points(self.times_ms, self.values)
+
+        assert self.end_ms is None or self.end_ms > 0
+
+        object.__setattr__(self, "_times", times)
+        object.__setattr__(self, "_values", values)
+
+    @property
+    def duration_ms(self) -> float:
+        return self._times[-1] if self.end_ms is None else self.end_ms
+
+    def _interpolate(self, segment: int, time_ms: float) -> float:
+        times = self._times
+        values = self._values
+
+        if time_ms <= times[0]:
+            return values[0]
+
+        if segment + 1 >= len(times):
+            return values[-1]
+
+        fraction = (time_ms - times[segment]) / (times[segment + 1] - times[segment])
+
+        return values[segment] + fraction * (values[segment + 1] - values[segment])
+
+    def at(self, time_ms: float) -> float:
+        return self._interpolate(max(bisect_right(self._times, time_ms) - 1, 0), time_ms)
+
+    def samples(self, step_size_ms: float) -> Iterator[float]:
+        times = self._times
+        segment = 0
+
+        for tick in range(self.steps(step_size_ms)):
+            time_ms = tick * step_size_ms
+
+            while segment + 1 < len(times) and times[segment + 1] <= time_ms:
+                segment += 1
+
+            yield self._interpolate(segment, time_ms)
+
+
+@dataclass(frozen=True, eq=False)
+class ArraySignal(Signal):
+    """Signal backed by an array of values sampled with a fixed period and held between samples.
+
+    Attributes:
+        values: The samples of the signal
+        period_ms: The time between samples, the step size of the model when None
+    """
+
+    values: NDArray[np.float64]
+    period_ms: Optional[float] = None
+
+    def __post_init__(self):
+        values = np.asarray(self.values, dtype=np.float64)
+
+        assert values.ndim == 1
+        assert self.period_ms is None or self.period_ms > 0
+
+        object.__setattr__(self, "values", values)
+
+    @property
+    def duration_ms(self) -> float:
+        assert self.period_ms is not None, "the duration of the signal depends on the step size of the model"
+
+        return self.values.size * self.period_ms
+
+    def steps(self, step_size_ms: float) -> int:
+        if self.period_ms is None:
+            return self.values.size
+
+        return super().steps(step_size_ms)
+
+    def at(self, time_ms: float) -> float:
+        assert self.period_ms is not None
+
+        return float(self.values[min(int(time_ms // self.period_ms), self.values.size - 1)])
+
+    def samples(self, step_size_ms: float, chunk_size: int = 4096) -> Iterator[float]:
+        if self.period_ms is not None and self.period_ms != step_size_ms:
+            yield from super().samples(step_size_ms)
+            return
+
+        # Convert a slice at a time, which is much faster than indexing the array for every step
+        for start in range(0, self.values.size, chunk_size):
+            yield from self.values[start:start + chunk_size].tolist()
+
+
+InputSignal = Union[Sequence[float], Signal]
+
+
+def input_steps(throttle: InputSignal, brake: InputSignal, step_size_ms: float) -> int:
+    """The number of steps covered by a pair of input signals, which must be equal.
+
+    Args:
+        throttle: The throttle values or signal
+        brake: The brake values or signal
+        step_size_ms: The step size of the model
+
+    Returns:
+        The number of steps
+    """
+
+    steps = [
+        signal.steps(step_size_ms) if isinstance(signal, Signal) else len(signal) for signal in (throttle, brake)
+    ]
+
+    assert steps[0] == steps[1]
+
+    return steps[0]
+
+
+def sample_inputs(throttle: InputSignal, brake: InputSignal, step_size_ms: float) -> Iterator[tuple[float, float]]:
+    """Lazily pair the throttle and brake values of every step.
+
+    Sequences are used as the values of consecutive steps and signals are evaluated at the start of
+    every step, so the result can be passed to `simulate_iter` or `simulate_chunks`.
+
+    Args:
+        throttle: The throttle values or signal
+        brake: The brake values or signal
+        step_size_ms: The step size of the model
+
+    Returns:
+        An iterator over the (throttle, brake) pair of every step
+    """
+
+    input_steps(throttle, brake, step_size_ms)
+
+    return zip(*(
+        signal.samples(step_size_ms) if isinstance(signal, Signal) else iter(signal) for signal in (throttle, brake)
+    ))
@@ -0,0 +1,238 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from dataclasses import fields, is_dataclass
+from typing import Any, Optional, Union
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from numpy.typing import NDArray
+
+from .autotrans import AutotransParameters, STATE_COLUMNS, TRAJECTORY_DTYPE, Trajectory
+from .batch import BatchTrajectory
+
+PathLike = Union[str, os.PathLike]
+
+
+def parameter_attributes(parameters: AutotransParameters) -> dict[str, Union[int, float]]:
+    """Flatten the parameters into scalar values named by group and field, such as "engine.initial_rpm"."""
+
+    attributes: dict[str, Union[int, float]] = {}
+
+    def add(prefix: str, value: Any):
+        if is_dataclass(value):
+            for field in fields(value):
+                add(f"{prefix}.{field.name}" if prefix else field.name, getattr(value, field.name))
+        else:
+            # The gear is an IntEnum, which is stored as its integer value
+            attributes[prefix] = int(value) if isinstance(value, int) else float(value)
+
+    add("", parameters)
+
+    return attributes
+
+
+class TrajectorySink(ABC):
+    """Destination that stores trajectories in chunks while they are simulated.
+
+    A simulation opens the sink with the parameters of every scenario and the number of recorded
+    states, writes consecutive chunks of states and closes the sink at the end, so the complete
+    trajectories never have to be held in memory.
+
+    Args:
+        chunk_size: The number of states of a scenario that are buffered before they are written
+    """
+
+    def __init__(self, chunk_size: int = 4096):
+        assert chunk_size > 0
+
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    def open(self, parameters: Sequence[AutotransParameters], steps: int):
+        """Prepare the storage of the trajectories.
+
+        Args:
+            parameters: The parameters of each scenario
+            steps: The number of states recorded for every scenario
+        """
+
+        ...
+
+    @abstractmethod
+    def write(self, row: int, start: int, time_ms: NDArray[np.int64], columns: Mapping[str, NDArray]):
+        """Store a chunk of states of consecutive scenarios.
+
+        Args:
+            row: The index of the first scenario of the chunk
+            start: The index of the first state of the chunk
+            time_ms: The times of the states with the shape (K,)
+            columns: The state columns with the shape (R, K) for R scenarios
+        """
+
+        ...
+
+    @abstractmethod
+    def close(self):
+        """Flush the stored states and release the storage."""
+
+        ...
+
+
+def hdf5_group_name(index: int) -> str:
+    return f"scenario_{index:06d}"
+
+
+class HDF5Sink(TrajectorySink):
+    """Write trajectories into chunked and compressed datasets of an HDF5 file.
+
+    Every scenario is stored in its own group with one dataset per state column, and its parameters
+    are stored as attributes of the group. h5py is only imported when the sink is created.
+
+    Args:
+        path: The file to create, an existing file is overwritten
+        chunk_size: The number of states per write and per chunk of the datasets
+        compression: The compression filter of the datasets, or None
+        compression_opts: The options of the compression filter
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        chunk_size: int = 4096,
+        compression: Optional[str] = "gzip",
+        compression_opts: Optional[int] = 4,
+    ):
+        import h5py
+
+        super().__init__(chunk_size)
+        self._h5py = h5py
+        self.path = path
+        self._compression = compression
+        self._compression_opts = compression_opts if compression is not None else None
+        self._file = None
+        self._groups: list[Any] = []
+
+    def open(self, parameters: Sequence[AutotransParameters], steps: int):
+        self._file = self._h5py.File(self.path, "w")
+        self._file.attrs["scenarios"] = len(parameters)
+        self._groups = []
+
+        for index, scenario_parameters in enumerate(parameters):
+            group = self._file.create_group(hdf5_group_name(index))
+            group.attrs.update(parameter_attributes(scenario_parameters))
+
+            for name in TRAJECTORY_DTYPE.names:
+                group.create_dataset(
+                    name,
+                    shape=(steps,),
+                    dtype=TRAJECTORY_DTYPE[name],
+                    chunks=(max(min(self.chunk_size, steps), 1),),
+                    compression=self._compression,
+                    compression_opts=self._compression_opts,
+                )
+
+            self._groups.append(group)
+
+    def write(self, row: int, start: int, time_ms: NDArray[np.int64], columns: Mapping[str, NDArray]):
+        stop = start + time_ms.shape[0]
+
+        for offset in range(next(iter(columns.values())).shape[0]):
+            group = self._groups[row + offset]
+            group["time_ms"][start:stop] = time_ms
+
+            for name, column in columns.items():
+                group[name][start:stop] = column[offset]
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._groups = []
+
+
+def load_hdf5(path: PathLike, scenario: int = 0) -> tuple[Trajectory, dict[str, Union[int, float]]]:
+    """Read the trajectory and the parameters of a scenario written by an `HDF5Sink`.
+
+    Args:
+        path: The HDF5 file
+        scenario: The index of the scenario
+
+    Returns:
+        The trajectory and the flattened parameters of the scenario
+    """
+
+    import h5py
+
+    with h5py.File(path, "r") as file:
+        group = file[hdf5_group_name(scenario)]
+        trajectory = Trajectory(**{name: group[name][()] for name in TRAJECTORY_DTYPE.names})
+
+        return trajectory, {name: value.item() for name, value in group.attrs.items()}
+
+
+class NpySink(TrajectorySink):
+    """Write trajectories into memory-mapped .npy files in a directory.
+
+    Every state column is stored in its own file with the shape (N, T), so the output can be
+    reopened with `load_npy` without copying. The parameters of the scenarios are stored in
+    `parameters.json`.
+
+    Args:
+        directory: The directory of the files, which is created if it does not exist
+        chunk_size: The number of states of a scenario that are buffered before they are written
+    """
+
+    def __init__(self, directory: PathLike, chunk_size: int = 4096):
+        super().__init__(chunk_size)
+        self.directory = directory
+        self._arrays: dict[str, NDArray] = {}
+
+    def open(self, parameters: Sequence[AutotransParameters], steps: int):
+        os.makedirs(self.directory, exist_ok=True)
+
+        with open(os.path.join(self.directory, "parameters.json"), "w") as parameters_file:
+            json.dump([parameter_attributes(scenario_parameters) for scenario_parameters in parameters], parameters_file)
+
+        self._arrays = {
+            "time_ms": open_memmap(self._path("time_ms"), mode="w+", dtype=TRAJECTORY_DTYPE["time_ms"], shape=(steps,))
+        }
+
+        for name in STATE_COLUMNS:
+            shape = (len(parameters), steps)
+            self._arrays[name] = open_memmap(self._path(name), mode="w+", dtype=TRAJECTORY_DTYPE[name], shape=shape)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def write(self, row: int, start: int, time_ms: NDArray[np.int64], columns: Mapping[str, NDArray]):
+        stop = start + time_ms.shape[0]
+        self._arrays["time_ms"][start:stop] = time_ms
+
+        for name, column in columns.items():
+            self._arrays[name][row:row + column.shape[0], start:stop] = column
+
+    def close(self):
+        for array in self._arrays.values():
+            array.flush()
+
+        self._arrays = {}
+
+
+def load_npy(directory: PathLike) -> tuple[BatchTrajectory, list[dict[str, Union[int, float]]]]:
+    """Memory map the trajectories written by an `NpySink` without reading them into memory.
+
+    Args:
+        directory: The directory of the files
+
+    Returns:
+        The read-only trajectories of all scenarios and the flattened parameters of each scenario
+    """
+
+    columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in TRAJECTORY_DTYPE.names}
+
+    with open(os.path.join(directory, "parameters.json")) as parameters_file:
+        parameters = json.load(parameters_file)
+
+    return BatchTrajectory(**columns), parameters
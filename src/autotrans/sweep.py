@@ -0,0 +1,123 @@
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, fields, replace
+from itertools import product
+from typing import Any, Literal
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .autotrans import AutotransParameters, Trajectory
+from .batch import BatchTrajectory, simulate_batch
+
+SweepPoint = tuple[Any, ...]
+
+_GROUPS = ("engine", "shift_logic", "vehicle")
+
+
+def _field_names() -> set[str]:
+    return {
+        f"{group.name}.{field.name}"
+        for group in fields(AutotransParameters)
+        if group.name in _GROUPS
+        for field in fields(group.type)
+    }
+
+
+def _with_values(base: AutotransParameters, names: tuple[str, ...], point: SweepPoint) -> AutotransParameters:
+    changes: dict[str, dict[str, Any]] = {}
+
+    for name, value in zip(names, point):
+        group, field_name = name.split(".")
+        changes.setdefault(group, {})[field_name] = value
+
+    return replace(base, **{group: replace(getattr(base, group), **values) for group, values in changes.items()})
+
+
+@dataclass(frozen=True, eq=False)
+class SweepResult:
+    """Trajectories of a parameter sweep, indexed by the swept parameter values.
+
+    Attributes:
+        names: The swept parameter fields, such as "vehicle.drag_coefficient"
+        points: The parameter values of each scenario, in the order of `names`
+        parameters: The complete model parameters of each scenario
+        trajectories: The trajectories of all scenarios, in the order of `points`
+    """
+
+    names: tuple[str, ...]
+    points: list[SweepPoint]
+    parameters: list[AutotransParameters]
+    trajectories: BatchTrajectory
+
+    def __post_init__(self):
+        object.__setattr__(self, "_index", {point: index for index, point in enumerate(self.points)})
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def index(self, point: Any) -> int:
+        """The scenario index of a parameter point, a single parameter may be given without a tuple."""
+
+        if not isinstance(point, tuple):
+            point = (point,)
+
+        return self._index[point]
+
+    def __getitem__(self, point: Any) -> Trajectory:
+        return self.trajectories[self.index(point)]
+
+    def __contains__(self, point: Any) -> bool:
+        return (point if isinstance(point, tuple) else (point,)) in self._index
+
+    def items(self) -> Iterator[tuple[SweepPoint, Trajectory]]:
+        for index, point in enumerate(self.points):
+            yield point, self.trajectories[index]
+
+
+def sweep(
+    throttle: ArrayLike,
+    brake: ArrayLike,
+    base: AutotransParameters,
+    values: Mapping[str, ArrayLike],
+    mode: Literal["product", "zip"] = "product",
+) -> SweepResult:
+    """Simulate the model for many parameter values in a single vectorized run.
+
+    Every swept field is named by its group and field, for example "engine.initial_rpm",
+    "shift_logic.wait_ticks" or "vehicle.drag_coefficient". The fields that are not swept keep the
+    values of the base parameters.
+
+    Args:
+        throttle: The throttle signal shared by all scenarios with the shape (T,), or one signal per
+            scenario with the shape (N, T)
+        brake: The brake signal, with the same shape rules as the throttle
+        base: The parameters of the fields that are not swept
+        values: The values of each swept field
+        mode: Simulate the Cartesian product of the values, or zip values of equal length together
+
+    Returns:
+        The trajectories indexed by the tuple of swept values, in the order of `values`
+    """
+
+    assert mode in ("product", "zip")
+    assert values
+
+    names = tuple(values)
+
+    assert set(names) <= _field_names()
+
+    columns = [np.asarray(column).ravel().tolist() for column in values.values()]
+
+    if mode == "zip":
+        assert all(len(column) == len(columns[0]) for column in columns)
+        points = list(zip(*columns))
+    else:
+        points = list(product(*columns))
+
+    parameters = [_with_values(base, names, point) for point in points]
+    throttle = np.asarray(throttle, dtype=np.float64)
+    brake = np.asarray(brake, dtype=np.float64)
+    throttle = np.broadcast_to(throttle, (len(points), throttle.shape[-1]))
+    brake = np.broadcast_to(brake, throttle.shape)
+
+    return SweepResult(names, points, parameters, simulate_batch(throttle, brake, parameters))
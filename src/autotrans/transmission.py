@@ -110,6 +110,15 @@ class Transmission:
         self._impeller_torque, turbine_torque = self._torque_converter(engine_rpm, internal_rpm)
         self._output_torque = self._transmission_ratio(turbine_torque, gear)
 
+    def snapshot(self) -> tuple[float, float]:
+        """The impeller and output torques of the last step."""
+
+        return self._impeller_torque, self._output_torque
+
+    def restore(self, impeller_torque: float, output_torque: float):
+        self._impeller_torque = impeller_torque
+        self._output_torque = output_torque
+
     @property
     def impeller_torque(self) -> float:
         return self._impeller_torque
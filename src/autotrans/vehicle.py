@@ -1,7 +1,7 @@
 import math
+from typing import Any
 
-import numpy as np
-from scipy import integrate
+from .integration import IntegratorFactory, ZeroOrderHoldIntegrator
 
 
 def _into_mph(feet_per_min: float) -> float:
@@ -9,6 +9,14 @@ def _into_mph(feet_per_min: float) -> float:
 
 
 class Vehicle:
+    """Vehicle dynamics driven by the transmission output torque.
+
+    The load on the vehicle is computed from the speed at the start of each step and held constant
+    over the step, so the default integrator updates the wheel speed in closed form. Any fixed-step
+    integrator can be used instead, for example `Dp5Integrator` or `SolveIvpIntegrator` for
+    validation.
+    """
+
     def __init__(
         self,
         t_step_ms: int,
@@ -17,7 +25,8 @@ class Vehicle:
         co_drag: float,
         wheel_radius: float,
         inertia: float,
-        initial_speed: float
+        initial_speed: float,
+        integrator: IntegratorFactory = ZeroOrderHoldIntegrator,
     ):
         # Parameters
         self._time_step = t_step_ms / 1000
@@ -26,6 +35,7 @@ class Vehicle:
         self._co_drag = co_drag
         self._wheel_radius = wheel_radius
         self._inertia = inertia
+        self._integrator = integrator(self._time_step)
 
         # State variables
         self._wheel_speed = initial_speed / wheel_radius
@@ -45,13 +55,36 @@ class Vehicle:
 
         drive_ratio = output_torque * self._final_drive_ratio
         vehicle_inertia = (drive_ratio - self._signed_load) / self._inertia
-        integration = integrate.solve_ivp(
-            fun=lambda t, o: vehicle_inertia,
-            t_span=(0, self._time_step),
-            y0=np.array([self._wheel_speed], dtype=np.float64)
-        )
+        self._wheel_speed = self._integrator.integrate(t0=0, y0=self._wheel_speed, func=lambda t, o: vehicle_inertia)
+
+    def snapshot(self) -> tuple[float, Any]:
+        """The wheel speed of the vehicle and the integrator state."""
+
+        return self._wheel_speed, self._integrator.snapshot()
+
+    def reset(
+        self,
+        final_drive_ratio: float,
+        wheel_friction: float,
+        co_drag: float,
+        wheel_radius: float,
+        inertia: float,
+        initial_speed: float,
+    ):
+        """Reinitialize the parameters and state in place, keeping the time step and the integrator."""
+
+        self._final_drive_ratio = final_drive_ratio
+        self._wheel_friction = wheel_friction
+        self._co_drag = co_drag
+        self._wheel_radius = wheel_radius
+        self._inertia = inertia
+        self._integrator.reset()
+        self._wheel_speed = initial_speed / wheel_radius
+        self._signed_load = 0.0
 
-        self._wheel_speed = integration["y"][-1, -1]
+    def restore(self, wheel_speed: float, integrator_state: Any = None):
+        self._integrator.restore(integrator_state)
+        self._wheel_speed = wheel_speed
 
     @property
     def transmission_rpm(self) -> float:
@@ -3,7 +3,14 @@ import os.path as path
 import h5py
 import pytest
 
+from autotrans.autotrans import AutotransParameters, DEFAULT_PARAMETERS
+
 
 @pytest.fixture(scope="session")
 def test_data() -> h5py.File:
     return h5py.File(path.join(path.dirname(__file__), "test_data.h5"))
+
+
+@pytest.fixture(scope="session")
+def parameters() -> AutotransParameters:
+    return DEFAULT_PARAMETERS
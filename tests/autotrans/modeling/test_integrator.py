@@ -1,2 +1,69 @@
+import pytest
+
+from autotrans.modeling.integrator import (
+    AdaptiveDormundPrince5Solver,
+    DormundPrince5Solver,
+    EulerSolver,
+    Integrator,
+)
+
+
 def test_integrator():
-    pass
+    calls = []
+
+    def func(t: float, y: float) -> float:
+        calls.append(t)
+        return 1.0 - y
+
+    integrator = Integrator(t0=0.0, y0=0.0, solver=DormundPrince5Solver(0.1))
+
+    for _ in range(10):
+        integrator.integrate(func, continuous=True)
+
+    assert integrator.state == pytest.approx(0.6321205588, abs=1e-8)
+    assert len(calls) == 61
+
+
+def test_integrator_changed_inputs():
+    inputs = {"target": 1.0}
+    calls = []
+
+    def func(t: float, y: float) -> float:
+        calls.append(t)
+        return inputs["target"] - y
+
+    integrator = Integrator(t0=0.0, y0=0.0, solver=DormundPrince5Solver(0.1))
+    reference = Integrator(t0=0.0, y0=0.0, solver=DormundPrince5Solver(0.1))
+
+    # The same function object with new inputs must not reuse the last stage of the previous step
+    for step in range(10):
+        inputs["target"] = float(step)
+        integrator.integrate(func)
+        reference.integrate(lambda t, y, target=float(step): target - y)
+
+    assert integrator.state == reference.state
+    assert len(calls) == 70
+
+
+def test_adaptive_integrator():
+    def func(t: float, y: float) -> float:
+        return -50.0 * y
+
+    integrator = Integrator(t0=0.0, y0=1.0, solver=AdaptiveDormundPrince5Solver(0.1, rtol=1e-9, atol=1e-12))
+    fixed = Integrator(t0=0.0, y0=1.0, solver=DormundPrince5Solver(0.1))
+
+    for _ in range(2):
+        integrator.integrate(func, continuous=True)
+        fixed.integrate(func, continuous=True)
+
+    assert integrator.state == pytest.approx(4.539992976e-5, rel=1e-6)
+    assert fixed.state != pytest.approx(4.539992976e-5, rel=1e-2)
+
+
+def test_integrator_saturation():
+    integrator = Integrator(t0=0.0, y0=0.0, solver=EulerSolver(0.5), saturation_limits=(None, 0.7))
+
+    for _ in range(4):
+        integrator.integrate(lambda t, y: 1.0 - y)
+
+    assert integrator.state == 0.7
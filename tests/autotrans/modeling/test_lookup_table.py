@@ -1,8 +1,27 @@
-from autotrans.modeling.lookup_table import LookupTable2D
+import numpy as np
+
+from autotrans.modeling.lookup_table import LookupTable1D, LookupTable2D
 from autotrans.engine import THROTTLE_BREAKPOINTS, RPM_BREAKPOINTS, ENGINE_TORQUE_TABLE_VALUES
 from pytest import approx
 
 
+def test_lookup_table_1d():
+    table = LookupTable1D(np.array([0.0, 1.0, 3.0]), np.array([0.0, 2.0, 3.0]))
+
+    assert table.lookup(0.5) == approx(1.0)
+    assert table.lookup(1.0) == approx(2.0)
+    assert table.lookup(2.0) == approx(2.5)
+    assert table.lookup(-1.0) == approx(-2.0)
+    assert table.lookup(5.0) == approx(4.0)
+
+
+def test_lookup_table_1d_many():
+    table = LookupTable1D(np.array([0.0, 1.0, 3.0]), np.array([0.0, 2.0, 3.0]))
+    x = np.linspace(-2, 5, 29)
+
+    assert table.lookup_many(x) == approx([table.lookup(value) for value in x])
+
+
 def test_lookup_table_2d():
     table = LookupTable2D(THROTTLE_BREAKPOINTS, RPM_BREAKPOINTS, ENGINE_TORQUE_TABLE_VALUES)
 
@@ -10,3 +29,11 @@ def test_lookup_table_2d():
     assert table.lookup(59.9463, 1383.2808) == approx(291.3155, abs=0.01)
     assert table.lookup(59.8926, 1685.3620) == approx(293.7103, abs=0.01)
     assert table.lookup(59.8389, 1907.2317) == approx(295.7509, abs=0.01)
+
+
+def test_lookup_table_2d_many():
+    table = LookupTable2D(THROTTLE_BREAKPOINTS, RPM_BREAKPOINTS, ENGINE_TORQUE_TABLE_VALUES)
+    throttle = np.linspace(-10, 110, 41)
+    rpm = np.linspace(600, 5000, 41)
+
+    assert table.lookup_many(throttle, rpm) == approx([table.lookup(x1, x2) for x1, x2 in zip(throttle, rpm)])
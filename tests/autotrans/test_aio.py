@@ -0,0 +1,117 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from autotrans.aio import simulate_async
+from autotrans.autotrans import Autotrans, AutotransParameters, simulate
+from autotrans.signals import PiecewiseLinear
+
+
+@pytest.fixture
+def inputs() -> tuple[list[float], list[float]]:
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(30, 100, size=300).tolist()
+    brake = np.where(rng.uniform(size=300) > 0.9, 50.0, 0.0).tolist()
+
+    return throttle, brake
+
+
+def test_simulate_async(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    expected = simulate(throttle, brake, Autotrans(parameters), columnar=True, every=4)
+    model = Autotrans(parameters)
+    trajectory = asyncio.run(simulate_async(throttle, brake, model, chunk_size=50, every=4))
+
+    assert np.array_equal(trajectory.time_ms, expected.time_ms)
+    assert np.array_equal(trajectory.engine_rpm, expected.engine_rpm)
+    assert model.time_ms == 300 * parameters.step_size_ms
+
+
+def test_astep_many_process(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle = PiecewiseLinear([0, 4000, 12000], [30.0, 100.0, 60.0])
+    brake = [0.0] * 300
+    expected_model = Autotrans(parameters)
+    expected = simulate(throttle, brake, expected_model, columnar=True)
+    model = Autotrans(parameters)
+
+    async def run():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            return await model.astep_many(throttle, brake, executor, chunk_size=128)
+
+    trajectory = asyncio.run(run())
+
+    assert np.array_equal(trajectory.vehicle_speed, expected.vehicle_speed)
+    assert model.snapshot() == expected_model.snapshot()
+
+
+def test_cancel_and_timeout(parameters: AutotransParameters):
+    throttle = [60.0] * 100_000
+    brake = [0.0] * 100_000
+    model = Autotrans(parameters)
+
+    async def cancel() -> int:
+        task = asyncio.create_task(simulate_async(throttle, brake, model, chunk_size=1000))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        time_ms = model.time_ms
+        await asyncio.sleep(0.05)
+
+        # The model is no longer stepped once the cancellation has been raised
+        assert model.time_ms == time_ms
+
+        return time_ms
+
+    time_ms = asyncio.run(cancel())
+
+    # The chunk that was running when the task was cancelled still completes
+    assert 0 < time_ms < 100_000 * parameters.step_size_ms
+    assert time_ms % (1000 * parameters.step_size_ms) == 0
+
+    async def timeout() -> int:
+        timed_out = Autotrans(parameters)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await simulate_async(throttle, brake, timed_out, chunk_size=1000, timeout=0.05)
+
+        return timed_out.time_ms
+
+    assert asyncio.run(timeout()) % (1000 * parameters.step_size_ms) == 0
+
+
+def test_event_loop_latency(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    expected = simulate(throttle, brake, Autotrans(parameters), columnar=True)
+    lags = []
+
+    async def run():
+        semaphore = asyncio.Semaphore(16)
+        done = asyncio.Event()
+
+        async def ticker():
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - start)
+
+        ticks = asyncio.create_task(ticker())
+        trajectories = await asyncio.gather(*(
+            simulate_async(throttle, brake, Autotrans(parameters), chunk_size=25, semaphore=semaphore)
+            for _ in range(200)
+        ))
+        done.set()
+        await ticks
+
+        return trajectories
+
+    trajectories = asyncio.run(run())
+
+    assert all(np.array_equal(trajectory.engine_rpm, expected.engine_rpm) for trajectory in trajectories)
+    assert len(lags) > 10
+    assert max(lags) < 0.5
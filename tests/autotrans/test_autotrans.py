@@ -0,0 +1,183 @@
+from dataclasses import replace
+from functools import partial
+
+import numpy as np
+import pytest
+
+from autotrans.autotrans import (
+    Autotrans,
+    AutotransParameters,
+    RateParameters,
+    ShiftLogicParameters,
+    Trajectory,
+    simulate,
+    simulate_chunks,
+    simulate_iter,
+)
+from autotrans.integration import AdaptiveDp5Integrator
+
+
+@pytest.fixture
+def inputs() -> tuple[list[float], list[float]]:
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(0, 100, size=200).tolist()
+    brake = np.where(np.arange(200) > 150, 100.0, 0.0).tolist()
+
+    return throttle, brake
+
+
+def test_simulate_columnar(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    trajectory = simulate(throttle, brake, Autotrans(parameters))
+    columns = simulate(throttle, brake, Autotrans(parameters), columnar=True)
+
+    assert isinstance(columns, Trajectory)
+    assert len(columns) == len(trajectory)
+    assert columns.states == trajectory
+    assert list(columns) == trajectory
+    assert columns[-1] == trajectory[-1]
+    assert columns[10:20].states == trajectory[10:20]
+    assert columns.gear.dtype == np.int8
+
+    records = columns.to_records()
+
+    assert list(records["engine_rpm"]) == [state.engine_rpm for _, state in trajectory]
+    assert list(records["time_ms"]) == [time for time, _ in trajectory]
+
+
+def test_simulate_iter(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    trajectory = simulate(throttle, brake, Autotrans(parameters))
+    timed_states = simulate_iter((pair for pair in zip(throttle, brake)), Autotrans(parameters), every=7)
+
+    assert list(timed_states) == trajectory[::7]
+
+
+def test_simulate_chunks(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    trajectory = simulate(throttle, brake, Autotrans(parameters))
+    chunks = list(simulate_chunks(zip(throttle, brake), Autotrans(parameters), chunk_size=8, every=3))
+
+    assert [len(chunk) for chunk in chunks] == [8] * 8 + [3]
+    assert [timed_state for chunk in chunks for timed_state in chunk] == trajectory[::3]
+
+
+def test_snapshot_restore(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    trajectory = simulate(throttle, brake, Autotrans(parameters))
+    model = Autotrans(parameters)
+    simulate(throttle[:120], brake[:120], model)
+    snapshot = model.snapshot()
+    simulate(throttle[120:160], [0.0] * 40, model)
+    model.restore(snapshot)
+
+    assert model.snapshot() == snapshot
+    assert simulate(throttle[120:], brake[120:], model) == trajectory[120:]
+
+
+def test_snapshot_restore_adaptive(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    integrator = partial(AdaptiveDp5Integrator, rtol=1e-8, atol=1e-8)
+    trajectory = simulate(throttle, brake, Autotrans(parameters, engine_integrator=integrator))
+    model = Autotrans(parameters, engine_integrator=integrator)
+    simulate(throttle[:120], brake[:120], model)
+    snapshot = model.snapshot()
+    simulate(throttle[120:160], [0.0] * 40, model)
+    model.restore(snapshot)
+
+    assert model.snapshot() == snapshot
+    assert simulate(throttle[120:], brake[120:], model) == trajectory[120:]
+
+
+def test_fork(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    trajectory = simulate(throttle, brake, Autotrans(parameters))
+    model = Autotrans(parameters)
+    simulate(throttle[:120], brake[:120], model)
+    fork = model.fork()
+    simulate(throttle[120:160], [0.0] * 40, model)
+
+    assert simulate(throttle[120:], brake[120:], fork) == trajectory[120:]
+
+
+def test_instrumentation(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    trajectory = simulate(throttle, brake, Autotrans(parameters))
+    model = Autotrans(parameters)
+    exported = []
+    stats = model.enable_instrumentation(callback=lambda s: exported.append(s.steps), callback_every=50)
+
+    assert simulate(throttle, brake, model) == trajectory
+    assert model.stats is stats
+    assert stats.steps == len(throttle)
+    assert exported == [50, 100, 150, 200]
+    assert stats.rhs_evaluations == {"engine": 6 * len(throttle) + 1, "vehicle": len(throttle)}
+    assert stats.lookups["engine_torque"] == 6 * len(throttle) + 1
+    assert stats.lookups["k_factor"] == len(throttle)
+    assert stats.shift_events == sum(a.gear != b.gear for (_, a), (_, b) in zip(trajectory, trajectory[1:]))
+    assert all(seconds > 0 for seconds in stats.seconds.values())
+
+    model.disable_instrumentation()
+
+    assert model.stats is None
+    simulate(throttle, brake, model)
+
+    assert stats.steps == len(throttle)
+
+
+def test_instrumented_fork(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    trajectory = simulate(throttle, brake, Autotrans(parameters))
+    model = Autotrans(parameters)
+    stats = model.enable_instrumentation()
+    simulate(throttle[:120], brake[:120], model)
+    fork = model.fork()
+    simulate(throttle[120:160], [0.0] * 40, model)
+
+    assert fork.stats is not stats
+    assert fork.stats.steps == 0
+    assert simulate(throttle[120:], brake[120:], fork) == trajectory[120:]
+    assert fork.stats.steps == len(throttle) - 120
+    assert stats.steps == 160
+    assert stats.rhs_evaluations["vehicle"] == 160
+
+    fork.disable_instrumentation()
+
+    assert model.stats is stats
+    simulate(throttle[:10], brake[:10], model)
+
+    assert stats.steps == 170
+
+
+def test_simulate_every(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    trajectory = simulate(throttle, brake, Autotrans(parameters))
+
+    assert simulate(throttle, brake, Autotrans(parameters), every=3) == trajectory[::3]
+    assert list(simulate(throttle, brake, Autotrans(parameters), columnar=True, every=3)) == trajectory[::3]
+
+
+def test_multirate(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    trajectory = simulate(throttle[3::4], brake[3::4], Autotrans(parameters), columnar=True)
+    multirate = replace(
+        parameters,
+        step_size_ms=10,
+        shift_logic=ShiftLogicParameters(parameters.shift_logic.initial_gear, wait_ticks=8),
+        rates=RateParameters(engine=4, shift_logic=4, transmission=4, vehicle=4),
+    )
+    states = simulate(throttle, brake, Autotrans(multirate), columnar=True, every=4)
+
+    assert np.array_equal(states.to_records(), trajectory.to_records())
+
+
+def test_multirate_hold(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    model = Autotrans(replace(parameters, rates=RateParameters(shift_logic=5, vehicle=5)))
+    trajectory = simulate(throttle, brake, model, columnar=True)
+
+    held = np.arange(1, len(trajectory)) % 5 != 0
+
+    assert np.all(np.diff(trajectory.vehicle_speed)[held] == 0)
+    assert np.all(np.diff(trajectory.gear)[held] == 0)
+    assert np.any(np.diff(trajectory.gear) != 0)
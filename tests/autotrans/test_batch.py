@@ -0,0 +1,57 @@
+import h5py
+import numpy as np
+import pytest
+
+from autotrans.autotrans import Autotrans, AutotransParameters, simulate
+from autotrans.batch import BatchAutotrans, simulate_batch
+
+STEPS = 300
+FIELDS = ["impeller_torque", "output_torque", "vehicle_speed", "transmission_rpm", "engine_rpm", "gear"]
+
+
+@pytest.fixture
+def inputs(test_data: h5py.File) -> tuple[np.ndarray, np.ndarray]:
+    throttle = np.asarray(test_data["throttle"][:STEPS])
+    ticks = np.arange(STEPS)
+    throttle_signals = np.stack([throttle, throttle / 2, throttle[::-1]])
+    brake_signals = np.stack([
+        np.zeros(STEPS),
+        np.where(ticks > 100, 150.0, 0.0),
+        np.where((ticks > 100) & (ticks < 200), 400.0, 0.0),
+    ])
+
+    return throttle_signals, brake_signals
+
+
+def test_simulate_batch(inputs: tuple[np.ndarray, np.ndarray], parameters: AutotransParameters):
+    throttle_signals, brake_signals = inputs
+    batch = simulate_batch(throttle_signals, brake_signals, parameters)
+
+    assert len(batch) == 3
+    assert list(batch.time_ms) == [40 * tick for tick in range(STEPS)]
+
+    for index in range(len(batch)):
+        trajectory = simulate(list(throttle_signals[index]), list(brake_signals[index]), Autotrans(parameters))
+
+        for field in FIELDS:
+            expected = [getattr(state, field) for _, state in trajectory]
+            assert list(getattr(batch, field)[index]) == pytest.approx(expected, abs=1.0e-3)
+
+
+def test_batch_step_broadcasts_inputs(parameters: AutotransParameters):
+    model = BatchAutotrans(parameters, 4)
+    model.step(60.0, 0.0)
+
+    assert model.time_ms == 40
+    assert model.engine_rpm.shape == (4,)
+    assert np.all(model.engine_rpm == model.engine_rpm[0])
+
+
+def test_batch_trajectory_scenario(inputs: tuple[np.ndarray, np.ndarray], parameters: AutotransParameters):
+    throttle_signals, brake_signals = inputs
+    batch = simulate_batch(throttle_signals, brake_signals, parameters)
+    trajectory = batch[1]
+
+    assert len(trajectory) == STEPS
+    assert list(trajectory.engine_rpm) == list(batch.engine_rpm[1])
+    assert trajectory[5][1].gear == batch.gear[1, 5]
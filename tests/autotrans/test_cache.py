@@ -0,0 +1,39 @@
+import numpy as np
+
+from autotrans.autotrans import Autotrans, AutotransParameters, simulate
+from autotrans.cache import SimulationCache
+
+
+def test_simulation_cache(parameters: AutotransParameters):
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(0, 100, size=120).tolist()
+    brake = [0.0] * 120
+    variant = throttle[:75] + rng.uniform(0, 100, size=45).tolist()
+    cache = SimulationCache(parameters, checkpoint_interval=20)
+
+    assert cache.simulate(throttle, brake) == simulate(throttle, brake, Autotrans(parameters))
+    assert cache.stats.misses == 1
+    assert len(cache) == 6
+
+    assert cache.simulate(variant, brake) == simulate(variant, brake, Autotrans(parameters))
+    assert cache.stats.hits == 1
+    assert cache.stats.steps_saved == 60
+    assert cache.stats.steps_simulated == 120 + 60
+
+    columns = cache.simulate(throttle[:50], brake[:50], columnar=True)
+
+    assert columns.states == simulate(throttle[:50], brake[:50], Autotrans(parameters))
+    assert cache.stats.steps_saved == 60 + 40
+
+
+def test_simulation_cache_eviction(parameters: AutotransParameters):
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(0, 100, size=100).tolist()
+    brake = [0.0] * 100
+    cache = SimulationCache(parameters, checkpoint_interval=10, max_bytes=3000)
+    cache.simulate(throttle, brake)
+
+    assert cache.nbytes <= 3000
+    assert cache.stats.evictions == 10 - len(cache)
+    assert cache.simulate(throttle, brake) == simulate(throttle, brake, Autotrans(parameters))
+    assert cache.stats.hits == 1
@@ -1,7 +1,10 @@
 import h5py
+import numpy as np
+import scipy.interpolate as interpolate
 import pytest
 
 import autotrans.engine as engine
+from autotrans.integration import AdaptiveDp5Integrator, Dp5Integrator, SolveIvpIntegrator
 
 INERTIA = 0.021991488283555904
 
@@ -46,3 +49,62 @@ def test_engine_rpm(test_data: h5py.File):
         model.step(throttle, impeller_torque)
 
     assert outputs == list(engine_rpm)
+
+
+def test_engine_torque_map():
+    spline = interpolate.RectBivariateSpline(
+        engine.THROTTLE_BREAKPOINTS,
+        engine.RPM_BREAKPOINTS,
+        engine.ENGINE_TORQUE_TABLE_VALUES,
+        kx=1,
+        ky=1
+    )
+    throttle = np.linspace(-10, 110, 37)
+    rpm = np.linspace(500, 5200, 37)
+    expected = spline(throttle, rpm, grid=False)
+
+    assert engine.ENGINE_TORQUE_MAP(throttle, rpm) == pytest.approx(expected, abs=1e-9)
+    assert [engine.ENGINE_TORQUE_MAP(x, y) for x, y in zip(throttle, rpm)] == pytest.approx(expected, abs=1e-9)
+
+
+def test_engine_adaptive_integrator(test_data: h5py.File):
+    throttle_trace = test_data["throttle"]
+    impeller_torque_trace = test_data["impeller_torque"]
+
+    def engine_rpm(integrator) -> list[float]:
+        model = engine.Engine(
+            time_step_ms=40,
+            engine_propeller_inertia=INERTIA,
+            initial_rpm=1000.0,
+            initial_throttle=throttle_trace[0],
+            initial_impeller_torque=impeller_torque_trace[0],
+            integrator=integrator,
+        )
+        outputs = []
+
+        for throttle, impeller_torque in zip(throttle_trace[1:300], impeller_torque_trace[1:300]):
+            model.step(throttle, impeller_torque)
+            outputs.append(model.rpm)
+
+        return outputs
+
+    expected = engine_rpm(lambda step: SolveIvpIntegrator(step, rtol=1e-10, atol=1e-10, first_step=step / 4))
+    adaptive = AdaptiveDp5Integrator(0.04, rtol=1e-8, atol=1e-8)
+
+    fixed_error = np.max(np.abs(np.subtract(engine_rpm(Dp5Integrator), expected)))
+    adaptive_error = np.max(np.abs(np.subtract(engine_rpm(lambda step: adaptive), expected)))
+
+    assert adaptive_error < 0.01
+    assert adaptive_error < fixed_error
+    assert adaptive.substeps > 299
+
+
+def test_adaptive_integrator_substeps():
+    integrator = AdaptiveDp5Integrator(0.5, rtol=1e-9, atol=1e-12)
+    y = 1.0
+
+    for tick in range(4):
+        y = integrator.integrate(t0=0.5 * tick, y0=y, func=lambda t, y: -20.0 * y)
+
+    assert y == pytest.approx(np.exp(-40.0), rel=1e-6)
+    assert integrator.substeps > 4
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+SCRIPT = """
+import sys
+
+import autotrans
+from autotrans.autotrans import Autotrans, DEFAULT_PARAMETERS
+
+autotrans.simulate([50.0] * 10, [0.0] * 10, Autotrans(DEFAULT_PARAMETERS))
+autotrans.simulate_batch([[50.0] * 10], [[0.0] * 10], DEFAULT_PARAMETERS)
+print(" ".join(sorted({name.split(".")[0] for name in sys.modules})))
+print("concurrent.futures.process" in sys.modules)
+"""
+
+
+def test_import_is_lazy():
+    result = subprocess.run([sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True)
+    modules, process_pool = result.stdout.splitlines()
+
+    assert "scipy" not in modules.split()
+    assert "transitions" not in modules.split()
+    assert process_pool == "False"
+
+
+def test_batch_and_sweep_are_lazy():
+    script = """
+import sys
+
+import autotrans
+
+print("autotrans.batch" in sys.modules, "autotrans.sweep" in sys.modules)
+from autotrans import sweep
+print(callable(sweep), autotrans.sweep is sweep)
+"""
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+    assert result.stdout.split() == ["False", "False", "True", "True"]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from autotrans.autotrans import Autotrans, AutotransParameters, simulate
+from autotrans.monitors import Always, Eventually, Monitor, Predicate
+
+STEPS = 250
+
+
+@pytest.fixture
+def inputs() -> tuple[list[float], list[float]]:
+    throttle = np.linspace(40.0, 100.0, STEPS).tolist()
+    return throttle, [0.0] * STEPS
+
+
+def _robustness(trajectory, predicate: Predicate) -> np.ndarray:
+    return np.array([predicate.robustness(state) for _, state in trajectory])
+
+
+def test_always_stops_at_violation(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    full = simulate(throttle, brake, Autotrans(parameters))
+    predicate = Predicate("engine_rpm", "<", 2400.0)
+    violation = int(np.argmax(_robustness(full, predicate) <= 0))
+    monitor = Monitor(Always(predicate))
+    trajectory, result = simulate(throttle, brake, Autotrans(parameters), monitor=monitor)
+
+    assert 0 < violation < STEPS - 1
+    assert result is monitor.result
+    assert result.verdict is False
+    assert result.stop_step == violation
+    assert trajectory == full[:violation + 1]
+    assert result.robustness == _robustness(full, predicate)[violation]
+
+
+def test_eventually_interval(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    full = simulate(throttle, brake, Autotrans(parameters))
+    speed = Predicate("vehicle_speed", ">", 1000.0)
+    robustness = _robustness(full, speed)
+    monitor = Monitor(Eventually(speed, 2000, 4000))
+    trajectory, result = simulate(throttle, brake, Autotrans(parameters), columnar=True, monitor=monitor)
+
+    assert result.verdict is False
+    assert result.stop_step == 100
+    assert len(trajectory) == 101
+    assert trajectory.states == full[:101]
+    assert result.robustness == robustness[50:101].max()
+
+
+def test_nested_sliding_window(inputs: tuple[list[float], list[float]], parameters: AutotransParameters):
+    throttle, brake = inputs
+    full = simulate(throttle, brake, Autotrans(parameters))
+    rpm = Predicate("engine_rpm", ">", 2500.0)
+    robustness = _robustness(full, rpm)
+    monitor = Monitor(Always(Eventually(rpm, 0, 400)), stop_early=False)
+    trajectory, result = simulate(throttle, brake, Autotrans(parameters), monitor=monitor)
+    expected = min(robustness[tick:tick + 11].max() for tick in range(STEPS))
+
+    assert trajectory == full
+    assert result.stop_step is None
+    assert result.robustness == expected
+    assert result.verdict is bool(expected > 0)
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from autotrans.autotrans import AutotransParameters, STATE_COLUMNS
+from autotrans.batch import simulate_batch
+from autotrans.parallel import simulate_many
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, None), (2, 3), (3, 1)])
+def test_simulate_many(parameters: AutotransParameters, workers: int, chunk_size: int):
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(0, 100, size=(7, 50))
+    brake = np.where(rng.uniform(size=(7, 50)) > 0.8, 100.0, 0.0)
+    expected = simulate_batch(throttle, brake, parameters)
+    result = simulate_many(throttle, brake, parameters, workers=workers, chunk_size=chunk_size)
+
+    assert list(result.time_ms) == list(expected.time_ms)
+
+    for name in STATE_COLUMNS:
+        assert np.array_equal(getattr(result, name), getattr(expected, name))
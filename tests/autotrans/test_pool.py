@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from autotrans.autotrans import Autotrans, AutotransParameters, RateParameters, STATE_COLUMNS, Trajectory, simulate
+from autotrans.pool import ModelPool
+from autotrans.shift_logic import Gear
+
+THROTTLE = [80.0] * 150 + [20.0] * 50
+BRAKE = [0.0] * 180 + [100.0] * 20
+
+
+def assert_same(result: Trajectory, expected: Trajectory):
+    assert np.array_equal(result.time_ms, expected.time_ms)
+
+    for name in STATE_COLUMNS:
+        assert np.array_equal(getattr(result, name), getattr(expected, name))
+
+
+def run(model: Autotrans) -> Trajectory:
+    return simulate(THROTTLE, BRAKE, model, columnar=True)
+
+
+@pytest.fixture
+def other(parameters: AutotransParameters) -> AutotransParameters:
+    return replace(
+        parameters,
+        engine=replace(parameters.engine, initial_rpm=1500.0),
+        shift_logic=replace(parameters.shift_logic, initial_gear=Gear.SECOND, wait_ticks=5),
+        vehicle=replace(parameters.vehicle, initial_speed=20.0, inertia=15.0),
+    )
+
+
+def test_reset(parameters: AutotransParameters):
+    model = Autotrans(parameters)
+    expected = run(model)
+    model.reset()
+
+    assert_same(run(model), expected)
+
+
+def test_reset_parameters(parameters: AutotransParameters, other: AutotransParameters):
+    model = Autotrans(parameters)
+    run(model)
+    model.reset(other)
+
+    assert model.parameters == other
+    assert_same(run(model), run(Autotrans(other)))
+
+
+def test_reset_step_size(parameters: AutotransParameters):
+    multirate = replace(parameters, step_size_ms=20, rates=RateParameters(shift_logic=2, vehicle=2))
+    model = Autotrans(parameters)
+    run(model)
+    model.reset(multirate)
+
+    assert_same(run(model), run(Autotrans(multirate)))
+
+
+def test_pool_reuses_models(parameters: AutotransParameters, other: AutotransParameters):
+    pool = ModelPool()
+
+    with pool.model(parameters) as model:
+        run(model)
+
+    with pool.model(other) as reused:
+        assert reused is model
+        assert_same(run(reused), run(Autotrans(other)))
+
+    assert pool.stats.created == 1
+    assert pool.stats.reused == 1
+
+
+def test_pool_threads(parameters: AutotransParameters, other: AutotransParameters):
+    # Both parameters share a group, which keeps one idle model for each of the threads
+    pool = ModelPool(max_idle=4)
+    expected = {parameters: run(Autotrans(parameters)), other: run(Autotrans(other))}
+
+    def task(index: int) -> bool:
+        model_parameters = parameters if index % 2 == 0 else other
+
+        with pool.model(model_parameters) as model:
+            result = run(model)
+
+        return all(np.array_equal(getattr(result, name), getattr(expected[model_parameters], name)) for name in STATE_COLUMNS)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert all(executor.map(task, range(40)))
+
+    assert pool.stats.created + pool.stats.reused == 40
+    assert pool.stats.created <= 4
+
+
+def test_pool_distinct_parameters(parameters: AutotransParameters):
+    pool = ModelPool(max_idle=2)
+
+    for index in range(100):
+        with pool.model(replace(parameters, engine=replace(parameters.engine, initial_rpm=1000.0 + index))):
+            pass
+
+    assert pool.stats.created == 1
+    assert pool.idle == 1
+
+    models = [pool.acquire(parameters) for _ in range(3)]
+
+    for model in models:
+        pool.release(model)
+
+    assert pool.idle == 2
+    assert pool.acquire(parameters) is models[-1]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from autotrans.integration import BogackiShampineIntegrator, Dp5Integrator, EulerIntegrator, Rk4Integrator
+from autotrans.runge_kutta import BOGACKI_SHAMPINE, DORMAND_PRINCE, EULER, RK4, ButcherTableau, runge_kutta_step
+
+
+def _decay(t: float, y):
+    return -2.0 * y + np.sin(t)
+
+
+def _exact(t: float) -> float:
+    return (1.0 + 0.2) * np.exp(-2.0 * t) + (2.0 * np.sin(t) - np.cos(t)) / 5
+
+
+def _solve(tableau: ButcherTableau, steps: int) -> float:
+    h = 1.0 / steps
+    y = 1.0
+
+    for i in range(steps):
+        y = runge_kutta_step(tableau, h, i * h, y, _decay).y
+
+    return y
+
+
+@pytest.mark.parametrize("tableau", [EULER, RK4, BOGACKI_SHAMPINE, DORMAND_PRINCE])
+def test_order(tableau: ButcherTableau):
+    coarse = abs(_solve(tableau, 10) - _exact(1.0))
+    fine = abs(_solve(tableau, 20) - _exact(1.0))
+
+    assert np.log2(coarse / fine) == pytest.approx(tableau.order, abs=0.3)
+
+
+@pytest.mark.parametrize("tableau", [RK4, DORMAND_PRINCE])
+def test_array_state(tableau: ButcherTableau):
+    y0 = np.array([1.0, -3.0, 250.0])
+    result = runge_kutta_step(tableau, 0.04, 0.5, y0, _decay)
+
+    assert list(result.y) == [runge_kutta_step(tableau, 0.04, 0.5, y, _decay).y for y in y0.tolist()]
+
+
+@pytest.mark.parametrize(
+    "integrator_type, evaluations",
+    [(EulerIntegrator, 10), (Rk4Integrator, 40), (BogackiShampineIntegrator, 31), (Dp5Integrator, 61)],
+)
+def test_fsal(integrator_type, evaluations: int):
+    calls = []
+
+    def func(t: float, y: float) -> float:
+        calls.append(t)
+        return _decay(t, y)
+
+    integrator = integrator_type(0.1)
+    y = 1.0
+
+    for i in range(10):
+        y = integrator.integrate(t0=0.1 * i, y0=y, func=func, continuous=True)
+
+    assert len(calls) == evaluations
+    assert y == _solve(integrator_type.TABLEAU, 10)
+
+    integrator.reset()
+    integrator.integrate(t0=1.0, y0=y, func=func, continuous=True)
+
+    assert len(calls) == evaluations + integrator_type.TABLEAU.stages
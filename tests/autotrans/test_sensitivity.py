@@ -0,0 +1,89 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from autotrans.autotrans import Autotrans, AutotransParameters, simulate
+from autotrans.sensitivity import PARAMETER_FIELDS, simulate_sensitivities
+
+STEPS = 60
+
+
+@pytest.fixture
+def moving_parameters(parameters: AutotransParameters) -> AutotransParameters:
+    # The load changes sign at zero speed, so the vehicle starts moving to keep the outputs smooth
+    return replace(parameters, vehicle=replace(parameters.vehicle, initial_speed=10.0))
+
+
+@pytest.fixture
+def inputs() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(1)
+    throttle = rng.uniform(40, 80, size=STEPS)
+    brake = np.where(np.arange(STEPS) > 40, 20.0, 5.0)
+
+    return throttle, brake
+
+
+def _with_value(parameters: AutotransParameters, group: str, field: str, value: float) -> AutotransParameters:
+    return replace(parameters, **{group: replace(getattr(parameters, group), **{field: value})})
+
+
+def _outputs(throttle: np.ndarray, brake: np.ndarray, parameters: AutotransParameters) -> np.ndarray:
+    trajectory = simulate(throttle.tolist(), brake.tolist(), Autotrans(parameters), columnar=True)
+    return np.stack([trajectory.engine_rpm, trajectory.vehicle_speed])
+
+
+def test_sensitivity_trajectory(inputs: tuple[np.ndarray, np.ndarray], moving_parameters: AutotransParameters):
+    throttle, brake = inputs
+    result = simulate_sensitivities(throttle, brake, moving_parameters)
+    expected = simulate(throttle.tolist(), brake.tolist(), Autotrans(moving_parameters), columnar=True)
+
+    assert np.array_equal(result.trajectory.engine_rpm, expected.engine_rpm)
+    assert np.array_equal(result.trajectory.gear, expected.gear)
+    assert result.engine_rpm.shape == (STEPS, 2 * STEPS)
+
+    # The outputs before a step do not depend on its inputs
+    assert np.all(np.triu(result.jacobian("engine_rpm", "throttle")) == 0)
+    assert np.all(np.triu(result.jacobian("vehicle_speed", "brake")) == 0)
+
+
+@pytest.mark.parametrize("signal", ["throttle", "brake"])
+def test_input_sensitivities(
+    inputs: tuple[np.ndarray, np.ndarray], moving_parameters: AutotransParameters, signal: str
+):
+    throttle, brake = inputs
+    result = simulate_sensitivities(throttle, brake, moving_parameters)
+    eps = 1e-4
+
+    for step in (0, 20, 45):
+        perturbed = {"throttle": throttle, "brake": brake}
+        plus = {name: values.copy() for name, values in perturbed.items()}
+        minus = {name: values.copy() for name, values in perturbed.items()}
+        plus[signal][step] += eps
+        minus[signal][step] -= eps
+        difference = (
+            _outputs(plus["throttle"], plus["brake"], moving_parameters)
+            - _outputs(minus["throttle"], minus["brake"], moving_parameters)
+        ) / (2 * eps)
+
+        assert np.allclose(result.jacobian("engine_rpm", signal)[:, step], difference[0], rtol=1e-5, atol=1e-7)
+        assert np.allclose(result.jacobian("vehicle_speed", signal)[:, step], difference[1], rtol=1e-5, atol=1e-7)
+
+
+def test_parameter_sensitivities(inputs: tuple[np.ndarray, np.ndarray], moving_parameters: AutotransParameters):
+    throttle, brake = inputs
+    result = simulate_sensitivities(throttle, brake, moving_parameters, wrt=PARAMETER_FIELDS)
+
+    assert result.engine_rpm.shape == (STEPS, 2 * STEPS + len(PARAMETER_FIELDS))
+
+    for name in PARAMETER_FIELDS:
+        group, field = name.split(".")
+        value = getattr(getattr(moving_parameters, group), field)
+        eps = 1e-6 * max(abs(value), 1.0)
+        difference = (
+            _outputs(throttle, brake, _with_value(moving_parameters, group, field, value + eps))
+            - _outputs(throttle, brake, _with_value(moving_parameters, group, field, value - eps))
+        ) / (2 * eps)
+
+        assert np.allclose(result.jacobian("engine_rpm", name), difference[0], rtol=1e-5, atol=1e-6)
+        assert np.allclose(result.jacobian("vehicle_speed", name), difference[1], rtol=1e-5, atol=1e-6)
@@ -0,0 +1,165 @@
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, replace
+
+import numpy as np
+import pytest
+
+from autotrans.autotrans import AutotransParameters, RateParameters, STATE_COLUMNS
+from autotrans.batch import simulate_batch
+from autotrans.serve import NPZ_TYPE, MicroBatcher, ServerStats, SimulationServer, parameters_from_dict
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = SimulationServer(("127.0.0.1", 0), workers=1, window_ms=20.0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server: SimulationServer, path: str) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{path}"
+
+
+def _post(server: SimulationServer, body: bytes, content_type: str) -> bytes:
+    request = urllib.request.Request(_url(server, "/simulate"), data=body, headers={"Content-Type": content_type})
+
+    with urllib.request.urlopen(request) as response:
+        return response.read()
+
+
+def test_parameters_from_dict(parameters: AutotransParameters):
+    multirate = replace(parameters, rates=RateParameters(vehicle=2))
+
+    assert parameters_from_dict(asdict(parameters)) == parameters
+    assert parameters_from_dict(json.loads(json.dumps(asdict(multirate)))) == multirate
+
+
+def test_simulate_requests(server: SimulationServer, parameters: AutotransParameters):
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(30, 100, size=(8, 120))
+    brake = np.where(rng.uniform(size=(8, 120)) > 0.9, 50.0, 0.0)
+    scenarios = [replace(parameters, engine=replace(parameters.engine, initial_rpm=800.0 + 50 * i)) for i in range(8)]
+    expected = simulate_batch(throttle, brake, scenarios)
+
+    def request(index: int) -> dict[str, np.ndarray]:
+        if index % 2:
+            output = io.BytesIO()
+            np.savez(
+                output,
+                throttle=throttle[index],
+                brake=brake[index],
+                parameters=json.dumps(asdict(scenarios[index])),
+            )
+
+            with np.load(io.BytesIO(_post(server, output.getvalue(), NPZ_TYPE))) as archive:
+                return dict(archive)
+
+        body = {
+            "throttle": throttle[index].tolist(),
+            "brake": brake[index].tolist(),
+            "parameters": asdict(scenarios[index]),
+        }
+        return json.loads(_post(server, json.dumps(body).encode(), "application/json"))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(request, range(8)))
+
+    # Small batches are simulated one scenario at a time, which may round differently from the vectorized model
+    for index, result in enumerate(results):
+        assert np.array_equal(result["time_ms"], expected.time_ms)
+
+        for name in STATE_COLUMNS:
+            assert np.allclose(result[name], getattr(expected, name)[index], rtol=1e-12, atol=0)
+
+    with urllib.request.urlopen(_url(server, "/stats")) as response:
+        stats = json.loads(response.read())
+
+    assert stats["requests"] >= 8
+    assert stats["batches"] < stats["requests"]
+    assert stats["latency_p50_ms"] > 0
+
+
+def test_invalid_request(server: SimulationServer, parameters: AutotransParameters):
+    body = {"throttle": [120.0], "brake": [0.0], "parameters": asdict(parameters)}
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _post(server, json.dumps(body).encode(), "application/json")
+
+    assert error.value.code == 400
+
+
+@pytest.mark.parametrize(
+    ("throttle", "brake", "message"),
+    [
+        ([150.0] * 10, [0.0] * 10, "throttle must be in [0, 100]"),
+        ([50.0] * 10, [-1.0] * 10, "brake must not be negative"),
+        ([50.0] * 10, [0.0] * 9, "throttle and brake must be lists of equal length"),
+    ],
+)
+def test_out_of_range_inputs(
+    server: SimulationServer, parameters: AutotransParameters, throttle: list[float], brake: list[float], message: str
+):
+    body = {"throttle": throttle, "brake": brake, "parameters": asdict(parameters)}
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _post(server, json.dumps(body).encode(), "application/json")
+
+    assert error.value.code == 400
+    # Raised as a ValueError, so the check does not depend on assertions being enabled
+    assert json.loads(error.value.read())["error"] == f"invalid request: ValueError({message!r})"
+
+
+def test_malformed_npz(server: SimulationServer):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _post(server, b"not an npz archive", NPZ_TYPE)
+
+    assert error.value.code == 400
+
+
+def test_invalid_parameters(server: SimulationServer, parameters: AutotransParameters):
+    values = asdict(parameters)
+    values["vehicle"]["wheel_radius"] = 0.0
+    body = {"throttle": [50.0] * 10, "brake": [0.0] * 10, "parameters": values}
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _post(server, json.dumps(body).encode(), "application/json")
+
+    assert error.value.code == 400
+
+
+def test_failing_scenario_is_isolated(server: SimulationServer, parameters: AutotransParameters):
+    # The drag of this speed overflows during the simulation, which the parameter validation cannot see
+    failing = replace(parameters, vehicle=replace(parameters.vehicle, initial_speed=1e200))
+    throttle = np.full(20, 50.0)
+    brake = np.zeros(20)
+    valid = server.batcher.submit(parameters, throttle, brake)
+    invalid = server.batcher.submit(failing, throttle, brake)
+
+    assert np.array_equal(valid.result(timeout=30)["time_ms"], np.arange(20) * parameters.step_size_ms)
+
+    with pytest.raises(OverflowError):
+        invalid.result(timeout=30)
+
+
+def test_batcher_survives_submit_errors(parameters: AutotransParameters):
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+    batcher = MicroBatcher(executor, ServerStats(), window_s=0.0, max_batch=8)
+
+    try:
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                batcher.submit(parameters, np.full(5, 50.0), np.zeros(5)).result(timeout=5)
+    finally:
+        batcher.close()
@@ -1,7 +1,8 @@
 import h5py
+import numpy as np
 import pytest
 
-from autotrans.shift_logic import ShiftLogic, Gear, up_shift_threshold, down_shift_threshold
+from autotrans.shift_logic import BatchShiftLogic, ShiftLogic, Gear, up_shift_threshold, down_shift_threshold
 
 
 def test_upshift_threshold():
@@ -35,3 +36,29 @@ def test_shift_logic(test_data: h5py.File):
     outputs.append(model.current_gear)
 
     assert outputs == list(gear_trace)
+
+
+def test_batch_shift_logic(test_data: h5py.File):
+    throttle_trace = np.asarray(test_data["throttle"][0:750])
+    vehicle_speed_trace = np.asarray(test_data["vehicle_speed"][0:750])
+    scales = np.array([1.0, 0.5, 0.8])
+    model = BatchShiftLogic(wait_ticks=[2, 2, 0], initial_gear=[Gear.FIRST, Gear.FIRST, Gear.SECOND])
+    scalar_models = [ShiftLogic(2, Gear.FIRST), ShiftLogic(2, Gear.FIRST), ShiftLogic(0, Gear.SECOND)]
+
+    for throttle, vehicle_speed in zip(throttle_trace, vehicle_speed_trace):
+        model.step(np.full(3, throttle), vehicle_speed * scales)
+
+        for scalar_model, scale in zip(scalar_models, scales):
+            scalar_model.step(throttle, vehicle_speed * scale)
+
+        assert list(model.current_gear) == [scalar_model.current_gear for scalar_model in scalar_models]
+        assert list(model.counter) == [scalar_model.counter for scalar_model in scalar_models]
+
+
+def test_shift_logic_gear_limits():
+    model = ShiftLogic(wait_ticks=0, initial_gear=Gear.FIRST)
+
+    for _ in range(5):
+        model.step(throttle=50.0, vehicle_speed=0.0)
+
+    assert model.current_gear == Gear.FIRST
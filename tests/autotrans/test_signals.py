@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from autotrans.autotrans import Autotrans, AutotransParameters, simulate, simulate_chunks
+from autotrans.signals import ArraySignal, PiecewiseConstant, PiecewiseLinear, sample_inputs
+
+
+def test_piecewise_constant():
+    signal = PiecewiseConstant([0, 100, 250], [10.0, 50.0, 30.0], end_ms=400)
+
+    assert signal.steps(40) == 10
+    assert list(signal.samples(40)) == [10.0, 10.0, 10.0, 50.0, 50.0, 50.0, 50.0, 30.0, 30.0, 30.0]
+    assert [signal.at(t) for t in (-5, 99.9, 100, 399)] == [10.0, 10.0, 50.0, 30.0]
+
+
+def test_piecewise_linear():
+    signal = PiecewiseLinear([100, 200, 400], [0.0, 100.0, 50.0])
+    times = np.arange(signal.steps(40)) * 40
+
+    assert signal.steps(40) == 10
+    assert list(signal.samples(40)) == pytest.approx(np.interp(times, [100, 200, 400], [0.0, 100.0, 50.0]))
+    assert signal.at(1000) == 50.0
+    assert PiecewiseLinear([0, 100], [0.0, 1.0], end_ms=1000).steps(40) == 25
+
+
+def test_array_signal():
+    values = np.arange(5, dtype=np.float64)
+
+    assert list(ArraySignal(values).samples(40)) == values.tolist()
+    assert list(ArraySignal(values, period_ms=80).samples(40)) == np.repeat(values, 2).tolist()
+    assert list(ArraySignal(values).samples(40, chunk_size=2)) == values.tolist()
+
+
+def test_simulate_signals(parameters: AutotransParameters):
+    throttle = PiecewiseLinear([0, 2000, 6000, 10000], [20.0, 100.0, 60.0, 40.0])
+    brake = PiecewiseConstant([0, 8000], [0.0, 80.0], end_ms=10000)
+    times = np.arange(250) * parameters.step_size_ms
+    dense_throttle = [throttle.at(t) for t in times]
+    dense_brake = [brake.at(t) for t in times]
+
+    expected = simulate(dense_throttle, dense_brake, Autotrans(parameters), columnar=True)
+    trajectory = simulate(throttle, brake, Autotrans(parameters), columnar=True)
+
+    assert len(trajectory) == 250
+    assert np.array_equal(trajectory.engine_rpm, expected.engine_rpm)
+    assert np.array_equal(trajectory.vehicle_speed, expected.vehicle_speed)
+
+    mixed = simulate(ArraySignal(np.asarray(dense_throttle)), dense_brake, Autotrans(parameters))
+    assert [state.engine_rpm for _, state in mixed] == expected.engine_rpm.tolist()
+
+    inputs = sample_inputs(throttle, brake, parameters.step_size_ms)
+    chunks = list(simulate_chunks(inputs, Autotrans(parameters), chunk_size=100))
+    assert np.array_equal(np.concatenate([chunk.engine_rpm for chunk in chunks]), expected.engine_rpm)
+
+
+def test_signal_lengths(parameters: AutotransParameters):
+    with pytest.raises(AssertionError):
+        simulate(PiecewiseConstant([0], [50.0], end_ms=400), [0.0] * 5, Autotrans(parameters))
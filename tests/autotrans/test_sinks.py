@@ -0,0 +1,78 @@
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from autotrans.autotrans import Autotrans, AutotransParameters, STATE_COLUMNS, simulate
+from autotrans.batch import simulate_batch
+from autotrans.parallel import simulate_many
+from autotrans.sinks import HDF5Sink, NpySink, load_hdf5, load_npy
+
+
+@pytest.fixture
+def inputs() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(30, 100, size=(4, 130))
+    brake = np.where(rng.uniform(size=(4, 130)) > 0.9, 50.0, 0.0)
+
+    return throttle, brake
+
+
+def test_simulate_hdf5(tmp_path: Path, inputs: tuple[np.ndarray, np.ndarray], parameters: AutotransParameters):
+    throttle, brake = inputs
+    expected = simulate(throttle[0].tolist(), brake[0].tolist(), Autotrans(parameters), columnar=True, every=3)
+    result = simulate(
+        throttle[0].tolist(),
+        brake[0].tolist(),
+        Autotrans(parameters),
+        every=3,
+        sink=HDF5Sink(tmp_path / "run.h5", chunk_size=16),
+    )
+    trajectory, attributes = load_hdf5(tmp_path / "run.h5")
+
+    assert result is None
+    assert np.array_equal(trajectory.time_ms, expected.time_ms)
+
+    for name in STATE_COLUMNS:
+        assert np.array_equal(getattr(trajectory, name), getattr(expected, name))
+
+    assert attributes["vehicle.drag_coefficient"] == parameters.vehicle.drag_coefficient
+    assert attributes["shift_logic.initial_gear"] == int(parameters.shift_logic.initial_gear)
+
+
+def test_batch_npy(tmp_path: Path, inputs: tuple[np.ndarray, np.ndarray], parameters: AutotransParameters):
+    throttle, brake = inputs
+    scenarios = [
+        replace(parameters, engine=replace(parameters.engine, initial_rpm=rpm)) for rpm in (800, 900, 1000, 1100)
+    ]
+    expected = simulate_batch(throttle, brake, scenarios)
+    simulate_batch(throttle, brake, scenarios, sink=NpySink(tmp_path / "run", chunk_size=50))
+    trajectories, attributes = load_npy(tmp_path / "run")
+
+    assert isinstance(trajectories.engine_rpm, np.memmap)
+    assert np.array_equal(trajectories.time_ms, expected.time_ms)
+
+    for name in STATE_COLUMNS:
+        assert np.array_equal(getattr(trajectories, name), getattr(expected, name))
+
+    assert [scenario["engine.initial_rpm"] for scenario in attributes] == [800, 900, 1000, 1100]
+
+
+@pytest.mark.parametrize("sink_type", ["hdf5", "npy"])
+def test_simulate_many_sink(
+    tmp_path: Path, inputs: tuple[np.ndarray, np.ndarray], parameters: AutotransParameters, sink_type: str
+):
+    throttle, brake = inputs
+    expected = simulate_batch(throttle, brake, parameters)
+    sink = HDF5Sink(tmp_path / "run.h5") if sink_type == "hdf5" else NpySink(tmp_path / "run")
+    simulate_many(throttle, brake, parameters, workers=2, chunk_size=1, sink=sink)
+
+    for index in range(len(expected)):
+        if sink_type == "hdf5":
+            trajectory, _ = load_hdf5(tmp_path / "run.h5", index)
+        else:
+            trajectory = load_npy(tmp_path / "run")[0][index]
+
+        assert np.array_equal(trajectory.engine_rpm, expected.engine_rpm[index])
+        assert np.array_equal(trajectory.gear, expected.gear[index])
@@ -0,0 +1,54 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from autotrans.autotrans import Autotrans, AutotransParameters, simulate
+from autotrans.sweep import sweep
+
+STEPS = 150
+
+
+@pytest.fixture
+def inputs() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    throttle = rng.uniform(20, 100, size=STEPS)
+    brake = np.where(np.arange(STEPS) > 120, 50.0, 0.0)
+
+    return throttle, brake
+
+
+def test_sweep_product(inputs: tuple[np.ndarray, np.ndarray], parameters: AutotransParameters):
+    throttle, brake = inputs
+    result = sweep(
+        throttle,
+        brake,
+        parameters,
+        {"vehicle.drag_coefficient": [0.01, 0.02, 0.04], "shift_logic.wait_ticks": np.array([1, 3])},
+    )
+
+    assert len(result) == 6
+    assert result.names == ("vehicle.drag_coefficient", "shift_logic.wait_ticks")
+    assert (0.04, 3) in result
+
+    vehicle = replace(parameters.vehicle, drag_coefficient=0.04)
+    shift_logic = replace(parameters.shift_logic, wait_ticks=3)
+    point_parameters = replace(parameters, vehicle=vehicle, shift_logic=shift_logic)
+    expected = simulate(throttle.tolist(), brake.tolist(), Autotrans(point_parameters), columnar=True)
+    trajectory = result[0.04, 3]
+
+    assert result.parameters[result.index((0.04, 3))] == point_parameters
+    assert list(trajectory.gear) == list(expected.gear)
+    assert trajectory.vehicle_speed == pytest.approx(expected.vehicle_speed, abs=1e-3)
+
+
+def test_sweep_zip(inputs: tuple[np.ndarray, np.ndarray], parameters: AutotransParameters):
+    throttle, brake = inputs
+    values = {"engine.initial_rpm": [800.0, 1000.0, 1200.0], "vehicle.inertia": [10.0, 12.0941, 14.0]}
+    result = sweep(np.stack([throttle] * 3), np.stack([brake] * 3), parameters, values, mode="zip")
+
+    assert result.points == [(800.0, 10.0), (1000.0, 12.0941), (1200.0, 14.0)]
+    assert [trajectory.engine_rpm[0] for _, trajectory in result.items()] == [800.0, 1000.0, 1200.0]
+    single = sweep(throttle, brake, parameters, {"vehicle.inertia": 12.0941})
+
+    assert np.array_equal(result[1000.0, 12.0941].engine_rpm, single[12.0941].engine_rpm)
@@ -1,6 +1,7 @@
 import h5py
 import pytest
 
+from autotrans.integration import Dp5Integrator, EulerIntegrator, IntegratorFactory, SolveIvpIntegrator
 from autotrans.vehicle import Vehicle
 
 
@@ -43,3 +44,26 @@ def test_vehicle_output_speed(test_data: h5py.File, vehicle_model: Vehicle):
         vehicle_model.step(output_torque, brake_torque)
 
     assert output_mph == list(vehicle_speed_trace)
+
+
+@pytest.mark.parametrize("integrator", [EulerIntegrator, Dp5Integrator, SolveIvpIntegrator])
+def test_vehicle_integrators(test_data: h5py.File, integrator: IntegratorFactory):
+    brake_torque_trace = test_data["brake_torque"][:100]
+    output_torque_trace = test_data["output_torque"][:100]
+    parameters = dict(
+        t_step_ms=40,
+        final_drive_ratio=3.23,
+        wheel_friction=40,
+        co_drag=0.02,
+        wheel_radius=1,
+        inertia=12.0941,
+        initial_speed=0,
+    )
+    reference = Vehicle(**parameters)
+    model = Vehicle(**parameters, integrator=integrator)
+
+    for output_torque, brake_torque in zip(output_torque_trace, brake_torque_trace):
+        reference.step(output_torque, brake_torque)
+        model.step(output_torque, brake_torque)
+
+        assert model.speed == pytest.approx(reference.speed, abs=1.0e-6)